@@ -0,0 +1,79 @@
+import asyncio
+from typing import Awaitable
+from typing import Callable
+from typing import Generic
+from typing import List
+from typing import Optional
+from typing import TypeVar
+
+from opentelemetry import metrics
+
+T = TypeVar("T")
+BatchFetcher = Callable[[int], Awaitable[List[T]]]
+
+meter = metrics.get_meter(__name__)
+batch_sizes = meter.create_histogram(
+    "app.batcher.batch_size",
+    description="Callers served by a single coalesced upstream call",
+    explicit_bucket_boundaries_advisory=[1, 2, 5, 10, 20, 50, 100],
+)
+
+
+class MicroBatcher(Generic[T]):
+    """Coalesces concurrent single-item requests into one bulk call.
+
+    Callers arriving within ``max_wait`` seconds of the first one (or until ``max_batch_size`` callers) share a
+    single ``fetch(len(batch))`` call, each caller receives one item of the result. If the call fails, every caller
+    of the batch gets the exception. The fetch function of the first caller serves the whole batch.
+    """
+
+    def __init__(self, name: str, max_wait: float = 0.005, max_batch_size: int = 50) -> None:
+        self.name = name
+        self.max_wait = max_wait
+        self.max_batch_size = max_batch_size
+        self._waiters: List[asyncio.Future] = []
+        self._fetch: Optional[BatchFetcher] = None
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+
+    async def submit(self, fetch: BatchFetcher) -> T:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if not self._waiters:
+            self._fetch = fetch
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+        self._waiters.append(future)
+        if len(self._waiters) >= self.max_batch_size:
+            self._flush()
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        waiters, fetch = self._waiters, self._fetch
+        self._waiters, self._fetch = [], None
+        # keep a reference, the event loop only holds weak references to tasks
+        task = asyncio.ensure_future(self._run(fetch, waiters))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, fetch: BatchFetcher, waiters: List[asyncio.Future]) -> None:
+        waiters = [waiter for waiter in waiters if not waiter.done()]
+        if not waiters:
+            return
+        batch_sizes.record(len(waiters), {"batcher.name": self.name})
+        try:
+            results = await fetch(len(waiters))
+        except Exception as error:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(error)
+            return
+
+        for waiter, result in zip(waiters, results):
+            if not waiter.done():
+                waiter.set_result(result)
+        for waiter in waiters[len(results) :]:
+            if not waiter.done():
+                waiter.set_exception(RuntimeError(f"{self.name}: upstream returned fewer items than requested"))
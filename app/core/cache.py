@@ -1,22 +1,19 @@
 from typing import Any
+from typing import AsyncIterator
+from typing import Dict
+from typing import List
 from typing import Optional
 from typing import Set
+from typing import Tuple
 from typing import Union
 
 from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+from redis.commands.core import AsyncScript
 
 from app.core.settings import settings
 
 
-def cache_key_builder(prefix: str, param: str):
-    def builder(func, *args, **kwargs):
-        if param in kwargs["kwargs"]:
-            return f"{prefix}:{kwargs['kwargs'][param]}"
-        raise ValueError(f"Expected '{param}' in kwargs")
-
-    return builder
-
-
 class CacheManagerError(Exception):
     """Exception raised when CacheManager is not properly initialized."""
 
@@ -26,9 +23,21 @@ class CacheManagerError(Exception):
 class CacheManager:
     def __init__(self) -> None:
         self._redis_connection: Optional[Redis] = None
+        self._scripts: Dict[str, AsyncScript] = {}
 
     def init(self, redis_url: str = settings.REDIS_URL) -> None:
         self._redis_connection = Redis.from_url(redis_url)
+        self._scripts = {}
+
+    @property
+    def initialized(self) -> bool:
+        return self._redis_connection is not None
+
+    async def close(self) -> None:
+        if self._redis_connection is not None:
+            await self._redis_connection.close()
+            self._redis_connection = None
+            self._scripts = {}
 
     def _ensure_connection(self) -> Redis:
         """Ensure Redis connection is initialized."""
@@ -55,6 +64,26 @@ class CacheManager:
             px=pexpire,
         )
 
+    async def mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Get Values from Keys"""
+        return await self._ensure_connection().mget(keys)
+
+    async def set_many(self, items: List[Tuple[str, Union[str, bytes], int]]) -> None:
+        """Set (Key, Value, Expire) Items in one Round Trip"""
+        async with self._ensure_connection().pipeline(transaction=False) as pipe:
+            for key, value, expire in items:
+                pipe.set(key, value, ex=expire)
+            await pipe.execute()
+
+    async def delete_and_incr(self, delete: List[str], incr: List[str]) -> None:
+        """Delete Keys and Increase Int Keys in one Transaction"""
+        async with self._ensure_connection().pipeline(transaction=True) as pipe:
+            for key in delete:
+                pipe.delete(key)
+            for key in incr:
+                pipe.incr(key)
+            await pipe.execute()
+
     async def pttl(self, key: str) -> int:
         """Get PTTL from a Key"""
         return int(await self._ensure_connection().pttl(key))
@@ -99,5 +128,40 @@ class CacheManager:
         """Checks if a Key exists"""
         return await self._ensure_connection().exists(key)
 
+    async def lpop(self, key: str) -> Optional[bytes]:
+        """Pops the First Element of a List"""
+        return await self._ensure_connection().lpop(key)
+
+    async def rpush(self, key: str, *values: Any) -> int:
+        """Appends Elements to a List"""
+        return await self._ensure_connection().rpush(key, *values)
+
+    async def llen(self, key: str) -> int:
+        """Gets the Length of a List"""
+        return int(await self._ensure_connection().llen(key))
+
+    async def ltrim(self, key: str, start: int, end: int) -> bool:
+        """Trims a List to the given Range"""
+        return bool(await self._ensure_connection().ltrim(key, start, end))
+
+    async def run_script(self, script: str, keys: List[str], args: List[Any]) -> Any:
+        """Runs a Lua Script by its SHA, loading it on the first call"""
+        if script not in self._scripts:
+            self._scripts[script] = self._ensure_connection().register_script(script)
+        return await self._scripts[script](keys=keys, args=args)
+
+    async def publish(self, channel: str, message: Any) -> int:
+        """Publishes a Message to a Channel"""
+        return await self._ensure_connection().publish(channel, message)
+
+    def pubsub(self) -> PubSub:
+        """Creates a PubSub, holding its own Connection"""
+        return self._ensure_connection().pubsub()
+
+    async def scan_keys(self, pattern: str, count: int = 1000) -> AsyncIterator[bytes]:
+        """Iterates over the Keys matching a Pattern"""
+        async for key in self._ensure_connection().scan_iter(match=pattern, count=count):
+            yield key
+
 
 cache_manager: CacheManager = CacheManager()
@@ -0,0 +1,88 @@
+from typing import List
+from typing import Union
+from uuid import UUID
+
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+from opentelemetry import metrics
+
+from app.core.cache import cache_manager
+from app.core.cache import CacheManager
+from app.core.list_cache import list_cache
+from app.core.negative_cache import negative_cache
+from app.core.settings import settings
+from app.core.telemetry import logger
+
+meter = metrics.get_meter(__name__)
+cache_invalidation_failures = meter.create_counter(
+    "app.cache.invalidation_failures",
+    description="Writes whose cached reads could not be invalidated and are served until they expire",
+)
+
+
+class CacheKeys:
+    """Keys of the cached by-id reads, shared by the ``@cache`` routes that store them and the services that
+    invalidate them.
+
+    A write invalidates, in one Redis transaction, the by-id entries of the ids it touched, their not-found entries
+    and the list pages of its namespace. Namespaces are resources (the model name), not services, so a user written
+    by any service drops the entries the user routes read. Without a Redis backend (e.g. the in-memory one of the
+    tests), the by-id entries are cleared on the backend and the rest follows the fail-open rule of each cache.
+    """
+
+    def __init__(self, cache: CacheManager, prefix: str = settings.CACHE_PREFIX) -> None:
+        self._cache = cache
+        self.prefix = prefix
+
+    def by_id(self, namespace: str, id: Union[UUID, int, str]) -> str:
+        # "8F1C..." and UUID("8f1c...") name the same entry
+        if isinstance(id, str):
+            try:
+                id = UUID(id)
+            except ValueError:
+                pass
+        return f"{self.prefix}:{namespace}:{id}"
+
+    def key_builder(self, namespace: str, param: str):
+        """fastapi-cache key builder storing a route's response under ``by_id(namespace, <param value>)``"""
+
+        def builder(func, *args, **kwargs):
+            if param in kwargs["kwargs"]:
+                return self.by_id(namespace, kwargs["kwargs"][param])
+            raise ValueError(f"Expected '{param}' in kwargs")
+
+        return builder
+
+    async def invalidate(self, namespace: str, *ids: Union[UUID, int]) -> None:
+        """Drops the cached reads a write of ``ids`` outdated, to be awaited once the write is committed"""
+        by_id = [self.by_id(namespace, id) for id in ids]
+        for id in ids:
+            negative_cache.forget(namespace, id)
+
+        backend = FastAPICache.get_backend()
+        redis_keys: List[str] = []
+        try:
+            if isinstance(backend, RedisBackend):
+                redis_keys.extend(by_id)
+            else:
+                for key in by_id:
+                    if await backend.get(key) is not None:
+                        await backend.clear(key=key)
+
+            if not self._cache.initialized:
+                if redis_keys:
+                    await backend.redis.delete(*redis_keys)
+                return
+            redis_keys.extend(negative_cache.key(namespace, id) for id in ids)
+            await self._cache.delete_and_incr(redis_keys, [list_cache.generation_key(namespace)])
+        except Exception:
+            cache_invalidation_failures.add(1, {"namespace": namespace})
+            logger.error(
+                "Failed to invalidate the cached %s reads of %s, they are served until they expire",
+                namespace,
+                ", ".join(map(str, ids)) or "the list pages",
+                exc_info=True,
+            )
+
+
+cache_keys = CacheKeys(cache_manager)
@@ -0,0 +1,96 @@
+"""Response compression, with the compressed bytes of known body versions kept in a per-worker LRU.
+
+The encoded variants are deliberately not stored next to the cached entry in Redis: the middleware never sees the
+fastapi-cache key, and reading them back would add a network round trip per response where gzip/br of a cached
+body costs a few microseconds. A ``(path, ETag)`` key names one immutable body, so the LRU needs no invalidation,
+stale versions just age out. The cost is that every worker compresses each version once, within
+``COMPRESSION_CACHE_SIZE`` entries of memory per worker.
+"""
+
+import gzip
+from collections import OrderedDict
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import Optional
+from typing import Tuple
+
+from opentelemetry import metrics
+
+from app.core.settings import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+meter = metrics.get_meter(__name__)
+compression_cache_hits = meter.create_counter(
+    "app.compression.cache_hits",
+    description="Responses sent with body bytes compressed by an earlier request",
+)
+
+
+def brotli_available() -> bool:
+    return brotli is not None
+
+
+class Compressor:
+    """Response body encoders, br (when the brotli package is installed) then gzip by preference.
+
+    Bodies of a known version (e.g. a path and its ETag) are compressed once per encoding and kept in a per-worker
+    LRU of at most ``cache_size`` entries, so serving that version again costs a dict lookup.
+    """
+
+    def __init__(
+        self,
+        gzip_level: int = settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality: int = settings.COMPRESSION_BROTLI_QUALITY,
+        cache_size: int = settings.COMPRESSION_CACHE_SIZE,
+    ) -> None:
+        self.encoders: Dict[str, Callable[[bytes], bytes]] = {}
+        if brotli is not None:
+            self.encoders["br"] = lambda body: brotli.compress(body, quality=brotli_quality)
+        # mtime=0 keeps the output identical for identical bodies
+        self.encoders["gzip"] = lambda body: gzip.compress(body, compresslevel=gzip_level, mtime=0)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[Hashable, str], bytes]" = OrderedDict()
+
+    def negotiate(self, accept_encoding: str) -> Optional[str]:
+        """Preferred supported encoding of an ``Accept-Encoding`` header, None to send the body as is"""
+        qualities: Dict[str, float] = {}
+        for item in accept_encoding.split(","):
+            coding, _, parameters = item.partition(";")
+            coding = coding.strip().lower()
+            if not coding:
+                continue
+            name, _, value = parameters.partition("=")
+            try:
+                qualities[coding] = float(value) if name.strip().lower() == "q" else 1.0
+            except ValueError:
+                qualities[coding] = 0.0
+
+        default = qualities.get("*", 0.0)
+        best, best_quality = None, 0.0
+        for encoding in self.encoders:
+            quality = qualities.get(encoding, default)
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def compress(self, body: bytes, encoding: str, version: Optional[Hashable] = None) -> bytes:
+        if version is None:
+            return self.encoders[encoding](body)
+
+        key = (version, encoding)
+        compressed = self._cache.get(key)
+        if compressed is not None:
+            self._cache.move_to_end(key)
+            compression_cache_hits.add(1, {"http.response.content_encoding": encoding})
+            return compressed
+
+        compressed = self.encoders[encoding](body)
+        self._cache[key] = compressed
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return compressed
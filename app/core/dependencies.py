@@ -1,7 +1,10 @@
 from typing import Annotated
+from typing import Optional
 
+import httpx
 from fastapi import Depends
-from jose import jwt
+from fastapi import Request
+from fastapi.security.utils import get_authorization_scheme_param
 from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
@@ -9,13 +12,23 @@ from app.core.cache import cache_manager
 from app.core.database import get_db
 from app.core.database import sessionmanager
 from app.core.exceptions import http_errors
+from app.core.http_client import get_http_client
+from app.core.http_client import get_optional_http_client
+from app.core.middleware import client_ip
+from app.core.password_pool import password_pool
+from app.core.permissions import AuthPolicies
+from app.core.permissions import permissions
 from app.core.security import JWTBearer
+from app.core.security import verify_client_credentials
 from app.core.settings import settings
+from app.core.token_version import token_versions
 from app.models import User
 from app.repository.user_repository import UserRepository
+from app.schemas.adapters import verified_payload_adapter
 from app.schemas.auth_schema import Payload
 from app.schemas.base_schema import FindBase
 from app.services.auth_service import AuthService
+from app.services.password_service import PasswordService
 from app.services.user_service import UserService
 
 
@@ -25,13 +38,14 @@ async def get_user_service(session: Session = Depends(sessionmanager.session)) -
 
 
 async def get_current_user(
+    request: Request,
     token: str = Depends(JWTBearer()),
     service: UserService = Depends(get_user_service),
 ) -> User:
+    # JWTBearer already verified the token, reuse its claims instead of decoding it again
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=settings.ALGORITHM)
-        token_data = Payload(**payload)
-    except (jwt.JWTError, ValidationError):
+        token_data = verified_payload_adapter.validate_python(request.state.token_claims)
+    except ValidationError:
         raise http_errors.auth_error(detail="Could not validate credentials")
     current_user: User = await service.get_by_id(token_data.id)  # type: ignore
     if not current_user:
@@ -39,6 +53,19 @@ async def get_current_user(
     return current_user
 
 
+async def get_current_claims(request: Request, token: str = Depends(JWTBearer())) -> Payload:
+    """Token claims of the caller, checked against the user's token version instead of loading the user"""
+    try:
+        claims = verified_payload_adapter.validate_python(request.state.token_claims)
+    except ValidationError:
+        raise http_errors.auth_error(detail="Could not validate credentials")
+    if not claims.is_active:
+        raise http_errors.auth_error("Inactive user")
+    if not await token_versions.is_current(claims.id, claims.token_version):
+        raise http_errors.auth_error(detail="Authentication failed: token is outdated, refresh it")
+    return claims
+
+
 async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     if not current_user.is_active:
         raise http_errors.auth_error("Inactive user")
@@ -50,9 +77,51 @@ async def get_auth_service(session: Session = Depends(sessionmanager.session)):
     return AuthService(user_repository=user_repository, cache=cache_manager)
 
 
+async def get_password_service(
+    http_client: Optional[httpx.AsyncClient] = Depends(get_optional_http_client),
+) -> PasswordService:
+    # the local engine never calls the password API, only the other engines need the shared client
+    if http_client is None and settings.PASSWORD_ENGINE != "local":
+        http_client = await get_http_client()
+    return PasswordService(http_client, pool=password_pool)
+
+
+async def get_introspection_caller(request: Request) -> str:
+    """Caller allowed to introspect tokens (RFC 7662 section 2.1): an INTROSPECTION_CLIENTS client over HTTP Basic,
+    or an admin bearer token. Returns the client id or user id, for the logs"""
+    scheme, credentials = get_authorization_scheme_param(request.headers.get("authorization"))
+    if scheme.lower() == "basic":
+        client_id = verify_client_credentials(credentials, settings.INTROSPECTION_CLIENTS)
+        if client_id is None:
+            raise http_errors.invalid_credentials(
+                detail="Invalid client credentials", headers={"WWW-Authenticate": "Basic"}
+            )
+        return f"client:{client_id}"
+    if scheme.lower() != "bearer":
+        raise http_errors.invalid_credentials(
+            detail="Token introspection requires client credentials or an admin token",
+            headers={"WWW-Authenticate": "Basic, Bearer"},
+        )
+
+    claims = await get_current_claims(request, await JWTBearer()(request))
+    if not permissions.check(AuthPolicies.INTROSPECT, claims):
+        raise http_errors.auth_error("Not enough permissions")
+    return f"user:{claims.id}"
+
+
+async def get_client_ip(request: Request) -> str:
+    return client_ip(request)
+
+
 FindQueryParameters = Annotated[FindBase, Depends()]
 SessionDependency = Annotated[Session, Depends(get_db)]
 UserServiceDependency = Annotated[UserService, Depends(get_user_service)]
 CurrentUserDependency = Annotated[User, Depends(get_current_user)]
+CurrentClaimsDependency = Annotated[Payload, Depends(get_current_claims)]
 AuthServiceDependency = Annotated[AuthService, Depends(get_auth_service)]
 CurrentActiveUserDependency = Annotated[User, Depends(get_current_active_user)]
+HttpClientDependency = Annotated[httpx.AsyncClient, Depends(get_http_client)]
+PasswordServiceDependency = Annotated[PasswordService, Depends(get_password_service)]
+ClientIpDependency = Annotated[str, Depends(get_client_ip)]
+IntrospectionCallerDependency = Annotated[str, Depends(get_introspection_caller)]
+TokenDependency = Annotated[str, Depends(JWTBearer())]
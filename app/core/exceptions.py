@@ -1,3 +1,4 @@
+import logging
 from typing import Any
 from typing import Dict
 from typing import Optional
@@ -5,7 +6,14 @@ from typing import Optional
 from fastapi import HTTPException
 from fastapi import status
 
-from app.core.telemetry import logger
+from app.core.settings import settings
+from app.core.telemetry import LogRateLimitFilter
+
+logger = logging.getLogger(__name__)
+# a burst of 4xx (scanners, brute force) would otherwise log one warning per request
+logger.addFilter(
+    LogRateLimitFilter("exception_type", rate=settings.HTTP_ERRORS_LOG_RATE, burst=settings.HTTP_ERRORS_LOG_BURST)
+)
 
 
 class AppExceptions:
@@ -70,5 +78,27 @@ class AppExceptions:
         )
         return HTTPException(status.HTTP_401_UNAUTHORIZED, detail, headers)
 
+    def service_unavailable(
+        self,
+        detail: Any = None,
+        headers: Optional[Dict[str, Any]] = None,
+    ) -> HTTPException:
+        logger.warning(
+            detail,
+            extra={"exception_type": "ServiceUnavailable"},
+        )
+        return HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, detail, headers)
+
+    def too_many_requests(
+        self,
+        detail: Any = None,
+        headers: Optional[Dict[str, Any]] = None,
+    ) -> HTTPException:
+        logger.warning(
+            detail,
+            extra={"exception_type": "TooManyRequests"},
+        )
+        return HTTPException(status.HTTP_429_TOO_MANY_REQUESTS, detail, headers)
+
 
 http_errors = AppExceptions()
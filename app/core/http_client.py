@@ -1,4 +1,131 @@
+import time
+from typing import Optional
+
 import httpx
+from opentelemetry import metrics
+
+from app.core.settings import Settings
+from app.core.settings import settings
+from app.core.telemetry import logger
+
+meter = metrics.get_meter(__name__)
+
+pool_acquire_duration = meter.create_histogram(
+    "http.client.pool.acquire_duration",
+    unit="s",
+    description="Time a request waits for a connection from the http_client pool",
+    explicit_bucket_boundaries_advisory=[0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 2, 5],
+)
+active_requests = meter.create_up_down_counter(
+    "http.client.active_requests",
+    description="Requests sent through http_client that are waiting for response headers",
+)
+
+# first httpcore trace event after the pool handed a connection (new or reused) to the request
+CONNECTION_ACQUIRED_EVENTS = frozenset(
+    {
+        "connection.connect_tcp.started",
+        "http11.send_request_headers.started",
+        "http2.send_request_headers.started",
+    }
+)
+
+
+class PoolMetricsTransport(httpx.AsyncBaseTransport):
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attributes = {"server.address": request.url.host}
+        start = time.perf_counter()
+        acquired = False
+        parent_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: dict) -> None:
+            nonlocal acquired
+            if not acquired and event_name in CONNECTION_ACQUIRED_EVENTS:
+                acquired = True
+                pool_acquire_duration.record(time.perf_counter() - start, attributes)
+            if parent_trace is not None:
+                await parent_trace(event_name, info)
+
+        request.extensions["trace"] = trace
+        active_requests.add(1, attributes)
+        try:
+            return await self._transport.handle_async_request(request)
+        finally:
+            active_requests.add(-1, attributes)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class HttpClientManagerError(Exception):
+    """Exception raised when HttpClientManager is not properly initialized."""
+
+    pass
+
+
+def http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class HttpClientManager:
+    def __init__(self) -> None:
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def init(self, config: Settings = settings, transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+        """Builds the shared client, a transport can be given to replace the network (e.g. httpx.MockTransport)"""
+        if transport is None:
+            http2 = config.HTTP_CLIENT_HTTP2
+            if http2 and not http2_available():
+                logger.warning("HTTP_CLIENT_HTTP2 is enabled but the 'h2' package is not installed, using HTTP/1.1")
+                http2 = False
+            transport = httpx.AsyncHTTPTransport(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=config.HTTP_CLIENT_MAX_CONNECTIONS,
+                    max_keepalive_connections=config.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=config.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+                ),
+            )
+        self._client = httpx.AsyncClient(
+            transport=PoolMetricsTransport(transport),
+            timeout=httpx.Timeout(
+                connect=config.HTTP_CLIENT_CONNECT_TIMEOUT,
+                read=config.HTTP_CLIENT_READ_TIMEOUT,
+                write=config.HTTP_CLIENT_WRITE_TIMEOUT,
+                pool=config.HTTP_CLIENT_POOL_TIMEOUT,
+            ),
+        )
+
+    @property
+    def initialized(self) -> bool:
+        return self._client is not None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            raise HttpClientManagerError("HttpClientManager not initialized. Call init() first.")
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+http_client_manager = HttpClientManager()
+
+
+async def get_http_client() -> httpx.AsyncClient:
+    return http_client_manager.client
+
 
-# Cliente global do httpx
-http_client: httpx.AsyncClient = httpx.AsyncClient()
+async def get_optional_http_client() -> Optional[httpx.AsyncClient]:
+    """The shared client, None before the lifespan built it, for callers that may not need it"""
+    return http_client_manager.client if http_client_manager.initialized else None
@@ -0,0 +1,69 @@
+import hashlib
+import json
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from jose import jwk
+from jose import jwt
+from jose.backends.base import Key
+
+from app.core.settings import settings
+
+SigningKey = Union[str, Key]
+
+
+class KeyRing:
+    """JWT keys by ``kid``.
+
+    HS* algorithms sign and verify with ``secret`` and publish no keys. For RS*/ES* algorithms every entry of
+    ``keys`` (PEM, private or public) verifies tokens carrying its kid, ``active_kid`` (a private key) signs new
+    ones and the public halves are published as a JWKS. Keys are parsed once, not on every token.
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        secret: str = "",
+        keys: Optional[Dict[str, str]] = None,
+        active_kid: str = "",
+    ) -> None:
+        self.algorithm = algorithm
+        self.asymmetric = not algorithm.startswith("HS")
+        self._secret = secret
+        self._keys: Dict[str, Key] = {}
+        self._verification_keys: Dict[str, Key] = {}
+        self.active_kid = ""
+        if self.asymmetric:
+            self._keys = {kid: jwk.construct(pem, algorithm) for kid, pem in (keys or {}).items()}
+            self.active_kid = active_kid or next(iter(self._keys), "")
+            if self.active_kid not in self._keys:
+                raise ValueError(f"Signing key '{self.active_kid}' not found for algorithm {algorithm}")
+            self._verification_keys = {kid: key.public_key() for kid, key in self._keys.items()}
+        self.jwks = self._build_jwks()
+        self.jwks_body = json.dumps(self.jwks, separators=(",", ":")).encode("utf-8")
+        self.jwks_etag = f'"{hashlib.sha256(self.jwks_body).hexdigest()[:32]}"'
+
+    def _build_jwks(self) -> Dict[str, Any]:
+        if not self.asymmetric:
+            return {"keys": []}
+        return {"keys": [{**key.to_dict(), "kid": kid, "use": "sig"} for kid, key in self._verification_keys.items()]}
+
+    @property
+    def signing_key(self) -> Tuple[SigningKey, Dict[str, str]]:
+        """Key and extra JWT headers used to sign new tokens"""
+        if not self.asymmetric:
+            return self._secret, {}
+        return self._keys[self.active_kid], {"kid": self.active_kid}
+
+    def verification_key(self, token: str) -> Optional[SigningKey]:
+        """Key matching the token ``kid``, None for an unknown kid"""
+        if not self.asymmetric:
+            return self._secret
+        kid = jwt.get_unverified_header(token).get("kid")
+        return self._verification_keys.get(kid)
+
+
+key_ring = KeyRing(settings.ALGORITHM, settings.SECRET_KEY, settings.JWT_KEYS, settings.JWT_ACTIVE_KID)
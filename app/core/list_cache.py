@@ -0,0 +1,99 @@
+import hashlib
+import json
+from functools import wraps
+from typing import Optional
+from typing import Tuple
+
+from fastapi import Response
+from pydantic import BaseModel
+
+from app.core.cache import cache_manager
+from app.core.cache import CacheManager
+from app.core.settings import settings
+from app.core.telemetry import logger
+
+# KEYS: generation counter, ARGV: page key prefix, query hash. Returns {generation, cached body or false}, the page
+# key being derived from the stored generation, which needs a single Redis node, as the rest of the cache does.
+GET_PAGE_SCRIPT = """
+local generation = redis.call('GET', KEYS[1]) or '0'
+return {generation, redis.call('GET', ARGV[1] .. ':' .. generation .. ':' .. ARGV[2])}
+"""
+
+
+class ListCache:
+    """JSON bodies of list routes, cached per namespace (a resource, e.g. the model name) and normalized query.
+
+    Page keys embed the namespace generation, a Redis counter bumped on every write of the namespace: a bump
+    orphans all its pages at once, without scanning keys, and the orphans expire after ``expire`` seconds. Every
+    method fails open: without Redis, list routes read the database.
+    """
+
+    def __init__(
+        self, cache: CacheManager, prefix: str = settings.CACHE_PREFIX, expire: int = settings.CACHE_TTS
+    ) -> None:
+        self._cache = cache
+        self.prefix = prefix
+        self.expire = expire
+
+    def generation_key(self, namespace: str) -> str:
+        return f"{self.prefix}:{namespace}:generation"
+
+    @staticmethod
+    def query_hash(query: BaseModel) -> str:
+        # every field, defaults included, so "?page=1" and no page share a key
+        normalized = json.dumps(query.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+    async def get(self, namespace: str, query: BaseModel) -> Tuple[Optional[bytes], Optional[str]]:
+        """Cached body of the query page and the key to store it under, (None, None) without Redis"""
+        if not self._cache.initialized:
+            return None, None
+        page_prefix, query_hash = f"{self.prefix}:{namespace}:list", self.query_hash(query)
+        try:
+            generation, body = await self._cache.run_script(
+                GET_PAGE_SCRIPT, [self.generation_key(namespace)], [page_prefix, query_hash]
+            )
+        except Exception:
+            logger.warning("List cache unavailable, reading %s from the database", namespace, exc_info=True)
+            return None, None
+        return body or None, f"{page_prefix}:{generation.decode('utf-8')}:{query_hash}"
+
+    async def set(self, key: str, body: bytes) -> None:
+        try:
+            await self._cache.set(key, body, expire=self.expire)
+        except Exception:
+            logger.warning("Failed to cache list page '%s'", key, exc_info=True)
+
+    async def invalidate(self, namespace: str) -> None:
+        if not self._cache.initialized:
+            return
+        try:
+            await self._cache.incr(self.generation_key(namespace))
+        except Exception:
+            logger.warning("Failed to invalidate the %s list pages, they expire on their own", namespace, exc_info=True)
+
+    def cached(self, namespace: str, param: str = "find_query"):
+        """Caches the body of a list route returning a Response, keyed by its ``param`` query.
+
+        Goes below ``@authorize``, so cached pages are only served to authorized callers.
+        """
+
+        def decorator(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                body, key = await self.get(namespace, kwargs[param])
+                if body is not None:
+                    return Response(body, media_type="application/json", headers={settings.CACHE_STATUS_HEADER: "HIT"})
+
+                response = await func(*args, **kwargs)
+                if key is not None and isinstance(response, Response) and response.status_code == 200:
+                    await self.set(key, response.body)
+                    response.headers[settings.CACHE_STATUS_HEADER] = "MISS"
+                return response
+
+            return wrapper
+
+        return decorator
+
+
+list_cache = ListCache(cache_manager)
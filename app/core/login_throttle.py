@@ -0,0 +1,105 @@
+from typing import List
+
+from app.core.cache import CacheManager
+from app.core.settings import settings
+from app.core.telemetry import logger
+
+# KEYS: lock keys. Returns the longest remaining lockout in ms, 0 when none is active.
+LOCKOUT_SCRIPT = """
+local lockout = 0
+for i = 1, #KEYS do
+    local ttl = redis.call('PTTL', KEYS[i])
+    if ttl > lockout then
+        lockout = ttl
+    end
+end
+return lockout
+"""
+
+# KEYS: failure counter and lock key for each subject, ARGV: window_ms, base_lockout_ms, max_lockout_ms, then the
+# failures allowed for each subject. Past that, every failure locks the subject for twice as long as the previous one.
+# Returns the longest lockout set in ms.
+FAILURE_SCRIPT = """
+local window = tonumber(ARGV[1])
+local base_lockout = tonumber(ARGV[2])
+local max_lockout = tonumber(ARGV[3])
+local lockout = 0
+for i = 1, #KEYS / 2 do
+    local counter, lock = KEYS[i * 2 - 1], KEYS[i * 2]
+    local max_failures = tonumber(ARGV[3 + i])
+    local failures = redis.call('INCR', counter)
+    local subject_lockout = 0
+    if failures >= max_failures then
+        subject_lockout = math.min(base_lockout * 2 ^ (failures - max_failures), max_lockout)
+        redis.call('SET', lock, 1, 'PX', subject_lockout)
+    end
+    -- the counter outlives the lockout, so the next failure after it keeps escalating
+    redis.call('PEXPIRE', counter, window + subject_lockout)
+    if subject_lockout > lockout then
+        lockout = subject_lockout
+    end
+end
+return lockout
+"""
+
+
+class LoginThrottle:
+    """Counts failed sign-ins per account and per client ip in Redis, locking them out progressively.
+
+    Checked before the user lookup and bcrypt, so locked-out attempts cost a single Redis round trip. Every method
+    fails open: without Redis, sign-in works unthrottled.
+    """
+
+    def __init__(
+        self,
+        cache: CacheManager,
+        max_account_failures: int = settings.LOGIN_MAX_FAILURES_PER_ACCOUNT,
+        max_ip_failures: int = settings.LOGIN_MAX_FAILURES_PER_IP,
+        failure_window: int = settings.LOGIN_FAILURE_WINDOW_SECONDS,
+        base_lockout: int = settings.LOGIN_LOCKOUT_SECONDS,
+        max_lockout: int = settings.LOGIN_MAX_LOCKOUT_SECONDS,
+        prefix: str = f"{settings.CACHE_PREFIX}:login",
+    ) -> None:
+        self._cache = cache
+        self._max_failures = [max_account_failures, max_ip_failures]
+        self._args = [failure_window * 1000, base_lockout * 1000, max_lockout * 1000]
+        self._prefix = prefix
+
+    def _subjects(self, email: str, client_ip: str) -> List[str]:
+        subjects = [f"account:{email.strip().lower()}"]
+        if client_ip:
+            subjects.append(f"ip:{client_ip}")
+        return subjects
+
+    async def retry_after(self, email: str, client_ip: str = "") -> int:
+        """Seconds until the account and ip may try again, 0 when they are not locked out"""
+        if not self._cache.initialized:
+            return 0
+        keys = [f"{self._prefix}:lock:{subject}" for subject in self._subjects(email, client_ip)]
+        try:
+            lockout_ms = await self._cache.run_script(LOCKOUT_SCRIPT, keys, [])
+        except Exception:
+            logger.warning("Login throttle unavailable, skipping the lockout check", exc_info=True)
+            return 0
+        return (int(lockout_ms) + 999) // 1000
+
+    async def record_failure(self, email: str, client_ip: str = "") -> None:
+        if not self._cache.initialized:
+            return
+        subjects = self._subjects(email, client_ip)
+        keys: List[str] = []
+        for subject in subjects:
+            keys += [f"{self._prefix}:failures:{subject}", f"{self._prefix}:lock:{subject}"]
+        try:
+            await self._cache.run_script(FAILURE_SCRIPT, keys, self._args + self._max_failures[: len(subjects)])
+        except Exception:
+            logger.warning("Login throttle unavailable, failed sign-in not recorded", exc_info=True)
+
+    async def record_success(self, email: str) -> None:
+        """Clears the account failures, the ip ones are kept so one valid account cannot reset them"""
+        if not self._cache.initialized:
+            return
+        try:
+            await self._cache.delete(f"{self._prefix}:failures:{self._subjects(email, '')[0]}")
+        except Exception:
+            logger.warning("Login throttle unavailable, account failures not cleared", exc_info=True)
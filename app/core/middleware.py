@@ -1,11 +1,36 @@
 from datetime import datetime
+from ipaddress import ip_address
+from ipaddress import ip_network
+from ipaddress import IPv4Network
+from ipaddress import IPv6Network
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
 
 import pyroscope
 from fastapi import Request
 from fastapi import Response
+from fastapi import status
+from fastapi.responses import JSONResponse
 from opentelemetry import trace
 from opentelemetry.trace import get_current_span
+from starlette.datastructures import MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.routing import BaseRoute
+from starlette.routing import Match
+
+from app.core.compression import Compressor
+from app.core.rate_limit import Rate
+from app.core.rate_limit import rate_limiter
+from app.core.rate_limit import RateLimiter
+from app.core.rate_limit import RateLimitRule
+from app.core.security import decote_jwt
+from app.core.settings import Settings
+from app.core.settings import settings
+
+IPNetwork = Union[IPv4Network, IPv6Network]
 
 # from device_detector import DeviceDetector
 
@@ -101,3 +126,141 @@ class OtelMiddleware(BaseHTTPMiddleware):
         span.set_attributes(event)
         response.headers["otel-trace-id"] = format(trace_id, "032x")
         return response
+
+
+def parse_networks(values: Iterable[str]) -> Tuple[IPNetwork, ...]:
+    return tuple(ip_network(value, strict=False) for value in values)
+
+
+trusted_proxies = parse_networks(settings.TRUSTED_PROXIES)
+
+
+def _is_trusted(address: str, proxies: Tuple[IPNetwork, ...]) -> bool:
+    try:
+        parsed = ip_address(address)
+    except ValueError:
+        return False
+    return any(parsed in network for network in proxies)
+
+
+def client_ip(request: Request, proxies: Optional[Tuple[IPNetwork, ...]] = None) -> str:
+    """Client address: the peer, or the client a trusted proxy (TRUSTED_PROXIES) forwarded the request for.
+
+    Proxy headers from any other peer are ignored, anyone can send them.
+    """
+    proxies = trusted_proxies if proxies is None else proxies
+    peer = request.client.host if request.client else ""
+    if not proxies or not _is_trusted(peer, proxies):
+        return peer
+    if forwarded := request.headers.get("cf-connecting-ip"):
+        return forwarded.strip()
+    # every proxy appends the address it received the request from, the last untrusted one is the client
+    for address in reversed(request.headers.get("x-forwarded-for", "").split(",")):
+        address = address.strip()
+        if address and not _is_trusted(address, proxies):
+            return address
+    return peer
+
+
+class RateLimitMiddleware(BaseHTTPMiddleware):
+    """Applies the RATE_LIMIT_* limits per client ip, per authenticated user and per route template.
+
+    Requests pass untouched while Redis is not initialized or unreachable.
+    """
+
+    def __init__(self, app, limiter: RateLimiter = rate_limiter, config: Settings = settings) -> None:
+        super().__init__(app)
+        self.limiter = limiter
+        self.ip_rate = Rate.parse(config.RATE_LIMIT_PER_IP)
+        self.user_rate = Rate.parse(config.RATE_LIMIT_PER_USER)
+        self.route_rates = {template: Rate.parse(rate) for template, rate in config.RATE_LIMIT_ROUTES.items()}
+        self.trusted_proxies = parse_networks(config.TRUSTED_PROXIES)
+        self._limited_routes: Optional[List[Tuple[str, BaseRoute, Rate]]] = None
+
+    def limited_routes(self, request: Request) -> List[Tuple[str, BaseRoute, Rate]]:
+        # resolved once, only the routes with their own limit are matched on every request
+        if self._limited_routes is None:
+            self._limited_routes = []
+            for route in request.app.routes:
+                for method in getattr(route, "methods", None) or ():
+                    template = f"{method} {getattr(route, 'path_format', '')}"
+                    if template in self.route_rates:
+                        self._limited_routes.append((template, route, self.route_rates[template]))
+        return self._limited_routes
+
+    def rules(self, request: Request) -> List[RateLimitRule]:
+        ip = client_ip(request, self.trusted_proxies)
+        rules = [RateLimitRule("ip", ip, self.ip_rate)]
+        for template, route, rate in self.limited_routes(request):
+            match, _ = route.matches(request.scope)
+            if match is Match.FULL:
+                rules.append(RateLimitRule("route", f"{template}:{ip}", rate))
+                break
+
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        # verified, or a forged token naming a victim's id would drain the victim's bucket; JWTBearer reuses it
+        payload = decote_jwt(token) if scheme == "Bearer" and token else None
+        request.state.bearer_token, request.state.bearer_claims = token, payload
+        if payload and payload.get("id"):
+            rules.append(RateLimitRule("user", str(payload["id"]), self.user_rate))
+        return rules
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        if not self.limiter.enabled:
+            return await call_next(request)
+
+        result = await self.limiter.hit(self.rules(request))
+        if result is None:
+            return await call_next(request)
+        if not result.allowed:
+            return JSONResponse(
+                {"detail": "Too many requests"},
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers=result.headers,
+            )
+
+        response = await call_next(request)
+        response.headers.update(result.headers)
+        return response
+
+
+class CompressionMiddleware(BaseHTTPMiddleware):
+    """Compresses JSON and text responses of at least ``minimum_size`` bytes with the encoding the client prefers.
+
+    A response carrying an ETag is a known version of its path: its compressed bytes are reused by later requests
+    for the same version, e.g. cache hits, instead of being compressed again.
+    """
+
+    compressible_types = ("application/json", "text/")
+
+    def __init__(self, app, compressor: Optional[Compressor] = None, config: Settings = settings) -> None:
+        super().__init__(app)
+        self.compressor = compressor or Compressor(
+            config.COMPRESSION_GZIP_LEVEL, config.COMPRESSION_BROTLI_QUALITY, config.COMPRESSION_CACHE_SIZE
+        )
+        self.minimum_size = config.COMPRESSION_MINIMUM_SIZE
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        encoding = self.compressor.negotiate(request.headers.get("accept-encoding", ""))
+        response = await call_next(request)
+        if (
+            encoding is None
+            or response.status_code < 200
+            or response.status_code in (204, 304)
+            or "content-encoding" in response.headers
+            or not response.headers.get("content-type", "").startswith(self.compressible_types)
+        ):
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        headers = MutableHeaders(raw=list(response.headers.raw))
+        if len(body) >= self.minimum_size:
+            etag = response.headers.get("etag")
+            body = self.compressor.compress(body, encoding, (request.url.path, etag) if etag else None)
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+
+        compressed = Response(body, status_code=response.status_code, background=response.background)
+        compressed.raw_headers = headers.raw
+        return compressed
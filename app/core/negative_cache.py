@@ -0,0 +1,106 @@
+import time
+from collections import OrderedDict
+from typing import Union
+from uuid import UUID
+
+from opentelemetry import metrics
+
+from app.core.cache import cache_manager
+from app.core.cache import CacheManager
+from app.core.settings import settings
+from app.core.telemetry import logger
+
+meter = metrics.get_meter(__name__)
+negative_cache_hits = meter.create_counter(
+    "app.negative_cache.hits",
+    description="By-id lookups answered as not found without reading the database",
+)
+
+
+class NegativeCache:
+    """Ids a by-id lookup did not find, per namespace (a resource, e.g. the model name).
+
+    Entries live ``expire`` seconds in Redis, shared by the workers, and ``local_expire`` seconds in a per-worker
+    LRU of at most ``local_size`` ids, so a burst of lookups of the same missing id costs one Redis read per worker.
+    Ids the worker found in the database are kept in a second LRU of the same size and never checked in Redis: the
+    lookups of existing resources, the hot path, cost no extra round trip.
+    Writes drop the ids they touch (app.core.cache_keys), the short local expiry bounding how long another worker
+    may still answer 404 for a created id.
+    Every method fails open: without Redis, lookups read the database.
+    """
+
+    def __init__(
+        self,
+        cache: CacheManager,
+        prefix: str = settings.CACHE_PREFIX,
+        expire: int = settings.NEGATIVE_CACHE_TTL_SECONDS,
+        local_expire: float = settings.NEGATIVE_CACHE_LOCAL_TTL_SECONDS,
+        local_size: int = settings.NEGATIVE_CACHE_LOCAL_MAX_KEYS,
+    ) -> None:
+        self._cache = cache
+        self.prefix = prefix
+        self.expire = expire
+        self.local_expire = local_expire
+        self.local_size = local_size
+        self._local: "OrderedDict[str, float]" = OrderedDict()
+        self._found: "OrderedDict[str, None]" = OrderedDict()
+
+    def key(self, namespace: str, id: Union[UUID, int]) -> str:
+        return f"{self.prefix}:{namespace}:missing:{id}"
+
+    def _remember_locally(self, key: str) -> None:
+        self._local[key] = time.monotonic() + self.local_expire
+        self._local.move_to_end(key)
+        if len(self._local) > self.local_size:
+            self._local.popitem(last=False)
+
+    async def is_missing(self, namespace: str, id: Union[UUID, int]) -> bool:
+        if not self._cache.initialized:
+            return False
+        key = self.key(namespace, id)
+        expires_at = self._local.get(key)
+        if expires_at is not None:
+            if expires_at > time.monotonic():
+                negative_cache_hits.add(1, {"namespace": namespace, "layer": "local"})
+                return True
+            del self._local[key]
+        if key in self._found:
+            return False
+
+        try:
+            missing = await self._cache.exists(key)
+        except Exception:
+            logger.warning("Negative cache unavailable, reading %s from the database", namespace, exc_info=True)
+            return False
+        if missing:
+            self._remember_locally(key)
+            negative_cache_hits.add(1, {"namespace": namespace, "layer": "redis"})
+        return bool(missing)
+
+    def found(self, namespace: str, id: Union[UUID, int]) -> None:
+        """Marks an id the database returned, its next lookups going straight to the database"""
+        if not self._cache.initialized:
+            return
+        key = self.key(namespace, id)
+        self._found[key] = None
+        self._found.move_to_end(key)
+        if len(self._found) > self.local_size:
+            self._found.popitem(last=False)
+
+    async def remember(self, namespace: str, id: Union[UUID, int]) -> None:
+        if not self._cache.initialized:
+            return
+        key = self.key(namespace, id)
+        self._found.pop(key, None)
+        self._remember_locally(key)
+        try:
+            await self._cache.set(key, b"1", expire=self.expire)
+        except Exception:
+            logger.warning("Failed to cache the missing %s '%s'", namespace, id, exc_info=True)
+
+    def forget(self, namespace: str, id: Union[UUID, int]) -> None:
+        """Drops a local entry, its Redis entry being deleted with the other invalidations of the write"""
+        self._local.pop(self.key(namespace, id), None)
+
+
+negative_cache = NegativeCache(cache_manager)
@@ -0,0 +1,22 @@
+import secrets
+import string
+
+LOWERCASE = string.ascii_lowercase
+UPPERCASE = string.ascii_uppercase
+DIGITS = string.digits
+PUNCTUATION = string.punctuation
+
+system_random = secrets.SystemRandom()
+
+
+def generate_password(password_length: int = 12, has_punctuation: bool = True) -> str:
+    """Generates a password with the OS CSPRNG (``secrets``), holding at least one character of each class used"""
+    classes = [LOWERCASE, UPPERCASE, DIGITS] + ([PUNCTUATION] if has_punctuation else [])
+    if password_length < len(classes):
+        raise ValueError(f"password_length must be at least {len(classes)}")
+
+    alphabet = "".join(classes)
+    characters = [secrets.choice(char_class) for char_class in classes]
+    characters += [secrets.choice(alphabet) for _ in range(password_length - len(classes))]
+    system_random.shuffle(characters)
+    return "".join(characters)
@@ -0,0 +1,161 @@
+import asyncio
+from collections import deque
+from typing import Awaitable
+from typing import Callable
+from typing import Deque
+from typing import List
+from typing import Optional
+
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions
+from opentelemetry.metrics import Observation
+
+from app.core.cache import CacheManager
+from app.core.telemetry import logger
+
+PasswordFetcher = Callable[[int], Awaitable[List[str]]]
+
+meter = metrics.get_meter(__name__)
+
+
+class PasswordPool:
+    """Per-worker buffer of pre-generated passwords, refilled in bulk by a background task.
+
+    With a ``redis_key`` the buffer is a Redis list shared by every worker instead of a local deque. ``pop`` never
+    waits on the upstream API: it returns None when the pool is empty or not started, and callers fetch directly.
+    """
+
+    def __init__(self) -> None:
+        self._passwords: Deque[str] = deque()
+        self._fetcher: Optional[PasswordFetcher] = None
+        self._cache: Optional[CacheManager] = None
+        self._redis_key: str = ""
+        self._size: int = 0
+        self._low_watermark: int = 0
+        self._batch_size: int = 1
+        self._retry_delay: float = 1.0
+        self._shared_depth: int = 0
+        self._refill_needed = asyncio.Event()
+        self._refill_task: Optional[asyncio.Task] = None
+
+    def init(
+        self,
+        fetcher: PasswordFetcher,
+        size: int,
+        low_watermark: int,
+        batch_size: int,
+        cache: Optional[CacheManager] = None,
+        redis_key: str = "",
+        retry_delay: float = 1.0,
+    ) -> None:
+        if not 0 <= low_watermark < size:
+            raise ValueError("low_watermark must be between 0 and size")
+        self._fetcher = fetcher
+        self._size = size
+        self._low_watermark = low_watermark
+        self._batch_size = batch_size
+        self._retry_delay = retry_delay
+        self._cache = cache
+        self._redis_key = redis_key if cache is not None else ""
+
+    @property
+    def started(self) -> bool:
+        return self._refill_task is not None
+
+    @property
+    def shared(self) -> bool:
+        return bool(self._redis_key)
+
+    @property
+    def depth(self) -> int:
+        """Passwords available, for the shared pool this is the length seen by the last refill check"""
+        return self._shared_depth if self.shared else len(self._passwords)
+
+    async def start(self) -> None:
+        if self._fetcher is None:
+            raise RuntimeError("PasswordPool not initialized. Call init() first.")
+        if self._refill_task is None:
+            self._refill_needed = asyncio.Event()
+            self._refill_needed.set()
+            self._refill_task = asyncio.create_task(self._refill_loop())
+
+    async def close(self) -> None:
+        if self._refill_task is not None:
+            self._refill_task.cancel()
+            try:
+                await self._refill_task
+            except asyncio.CancelledError:
+                pass
+            self._refill_task = None
+        self._passwords.clear()
+
+    async def pop(self) -> Optional[str]:
+        if self._refill_task is None:
+            return None
+        if self.shared:
+            password = await self._pop_shared()
+            # the refill loop checks the list length, keeping the request path at a single LPOP
+            self._refill_needed.set()
+            return password
+        password = self._passwords.popleft() if self._passwords else None
+        if len(self._passwords) <= self._low_watermark:
+            self._refill_needed.set()
+        return password
+
+    async def _pop_shared(self) -> Optional[str]:
+        try:
+            password = await self._cache.lpop(self._redis_key)
+        except Exception:
+            logger.warning("Failed to pop from shared password pool '%s'", self._redis_key, exc_info=True)
+            return None
+        return password.decode("utf-8") if password is not None else None
+
+    async def _missing(self) -> int:
+        if self.shared:
+            self._shared_depth = await self._cache.llen(self._redis_key)
+        if self.depth > self._low_watermark:
+            return 0
+        return self._size - self.depth
+
+    async def _store(self, passwords: List[str]) -> None:
+        if self.shared:
+            await self._cache.rpush(self._redis_key, *passwords)
+            # workers refilling at the same time may overshoot, keep the list bounded
+            await self._cache.ltrim(self._redis_key, 0, self._size - 1)
+            self._shared_depth = min(self._shared_depth + len(passwords), self._size)
+        else:
+            self._passwords.extend(passwords)
+
+    async def _refill_loop(self) -> None:
+        while True:
+            await self._refill_needed.wait()
+            self._refill_needed.clear()
+            try:
+                missing = await self._missing()
+                while missing > 0:
+                    passwords = await self._fetcher(min(self._batch_size, missing))
+                    if not passwords:
+                        break
+                    await self._store(passwords)
+                    missing -= len(passwords)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Password pool refill failed, retrying in %ss", self._retry_delay, exc_info=True)
+                await asyncio.sleep(self._retry_delay)
+                self._refill_needed.set()
+
+
+password_pool = PasswordPool()
+
+
+def observe_pool_depth(options: CallbackOptions):
+    if password_pool.started:
+        yield Observation(password_pool.depth, {"pool.shared": password_pool.shared})
+
+
+meter.create_observable_gauge(
+    "app.password_pool.depth",
+    callbacks=[observe_pool_depth],
+    description="Pre-generated passwords available in the password pool",
+)
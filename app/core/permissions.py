@@ -0,0 +1,69 @@
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import NamedTuple
+
+from app.models.models_enums import UserRoles
+
+
+class Policy(NamedTuple):
+    name: str
+    mask: int
+    allow_same_id: bool = False
+
+
+class PermissionMatrix:
+    """Policies compiled into one bit each, with every role holding the bitmask of the policies granted to it.
+
+    The matrix is built at import time, so a decision for a (role, policy) pair is a dict lookup and a bitwise and.
+    """
+
+    def __init__(self) -> None:
+        self.policies: Dict[str, Policy] = {}
+        self._grants: Dict[Any, int] = {role: 0 for role in UserRoles}
+
+    def policy(self, name: str, roles: Iterable[UserRoles], allow_same_id: bool = False) -> Policy:
+        if name in self.policies:
+            raise ValueError(f"Policy '{name}' is already defined")
+        policy = Policy(name, 1 << len(self.policies), allow_same_id)
+        for role in roles:
+            self._grants[UserRoles(role)] |= policy.mask
+        self.policies[name] = policy
+        return policy
+
+    def compile(self, roles: Iterable[UserRoles], allow_same_id: bool = False) -> Policy:
+        """Anonymous policy for a role list, reusing the policy already compiled for the same rule"""
+        roles = frozenset(UserRoles(role) for role in roles)
+        name = f"{','.join(sorted(roles))}{':same-id' if allow_same_id else ''}"
+        if name not in self.policies:
+            return self.policy(name, roles, allow_same_id)
+        return self.policies[name]
+
+    def allows(self, role: UserRoles, policy: Policy) -> bool:
+        return bool(self._grants.get(role, 0) & policy.mask)
+
+    def check(self, policy: Policy, current_user: Any, resource_id: Any = None) -> bool:
+        # disabled users keep their claims until the token expires, they are granted nothing
+        if not getattr(current_user, "is_active", True):
+            return False
+        if self._grants.get(current_user.role, 0) & policy.mask:
+            return True
+        return policy.allow_same_id and current_user.id == resource_id
+
+
+permissions = PermissionMatrix()
+
+
+class UserPolicies:
+    """Policies of the user routes"""
+
+    LIST = permissions.policy("users:list", [UserRoles.MODERATOR, UserRoles.ADMIN, UserRoles.BASE_USER])
+    READ = permissions.policy("users:read", [UserRoles.MODERATOR, UserRoles.ADMIN], allow_same_id=True)
+    UPDATE = permissions.policy("users:update", [UserRoles.MODERATOR, UserRoles.ADMIN], allow_same_id=True)
+    DELETE = permissions.policy("users:delete", [UserRoles.ADMIN])
+
+
+class AuthPolicies:
+    """Policies of the auth routes"""
+
+    INTROSPECT = permissions.policy("auth:introspect", [UserRoles.ADMIN])
@@ -0,0 +1,159 @@
+import time
+from collections import OrderedDict
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from uuid import uuid4
+
+from opentelemetry import metrics
+
+from app.core.cache import cache_manager
+from app.core.cache import CacheManager
+from app.core.settings import settings
+from app.core.telemetry import logger
+
+meter = metrics.get_meter(__name__)
+rate_limit_rejections = meter.create_counter(
+    "app.rate_limit.rejections",
+    description="Requests rejected by the rate limiter",
+)
+
+# Sliding log per key in a sorted set scored by the request time in ms. Every key is checked before any is
+# written, so a request rejected by one rule does not consume the quota of the others.
+# KEYS: one per rule, ARGV: now_ms, member, then limit and window_ms for each key.
+# Returns {allowed, limit, remaining, reset_ms} of the most restrictive rule.
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local member = ARGV[2]
+local allowed = 1
+local limit, remaining, reset = 0, -1, 0
+for i = 1, #KEYS do
+    local key_limit = tonumber(ARGV[1 + i * 2])
+    local window = tonumber(ARGV[2 + i * 2])
+    redis.call('ZREMRANGEBYSCORE', KEYS[i], '-inf', now - window)
+    local count = redis.call('ZCARD', KEYS[i])
+    local key_reset = window
+    if count > 0 then
+        local oldest = redis.call('ZRANGE', KEYS[i], 0, 0, 'WITHSCORES')
+        key_reset = tonumber(oldest[2]) + window - now
+    end
+    local key_remaining = key_limit - count - 1
+    if count >= key_limit then
+        if allowed == 1 or key_reset > reset then
+            limit, remaining, reset = key_limit, 0, key_reset
+        end
+        allowed = 0
+    elseif allowed == 1 and (remaining < 0 or key_remaining < remaining) then
+        limit, remaining, reset = key_limit, key_remaining, key_reset
+    end
+end
+if allowed == 1 then
+    for i = 1, #KEYS do
+        redis.call('ZADD', KEYS[i], now, member)
+        redis.call('PEXPIRE', KEYS[i], tonumber(ARGV[2 + i * 2]))
+    end
+end
+return {allowed, limit, remaining, reset}
+"""
+
+
+class Rate(NamedTuple):
+    limit: int
+    window: float
+
+    @classmethod
+    def parse(cls, value: str) -> "Rate":
+        """Parses ``"<requests>/<seconds>"``, e.g. ``"10/60"``"""
+        limit, _, window = value.partition("/")
+        rate = cls(int(limit), float(window or 1))
+        if rate.limit <= 0 or rate.window <= 0:
+            raise ValueError(f"Invalid rate '{value}'")
+        return rate
+
+
+class RateLimitRule(NamedTuple):
+    scope: str
+    key: str
+    rate: Rate
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: float
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(max(self.remaining, 0)),
+            "RateLimit-Reset": str(max(int(self.reset + 0.999), 0)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = headers["RateLimit-Reset"]
+        return headers
+
+
+class TokenBucket:
+    """In-process token buckets, one per key, keeping at most ``max_keys`` keys (least recently used are dropped).
+
+    A bucket refilled at ``limit / window`` with ``limit`` tokens is never stricter than the sliding window of the
+    same rate, so a request it rejects would also be rejected by Redis.
+    """
+
+    def __init__(self, max_keys: int = 10000) -> None:
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def consume(self, key: str, rate: Rate) -> bool:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.pop(key, (float(rate.limit), now))
+        tokens = min(float(rate.limit), tokens + (now - updated_at) * rate.limit / rate.window)
+        allowed = tokens >= 1
+        self._buckets[key] = (tokens - 1 if allowed else tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return allowed
+
+
+class RateLimiter:
+    """Sliding-window rate limiter shared by every worker through Redis, shedding obvious abuse locally first"""
+
+    def __init__(self, cache: CacheManager, prefix: str = "rate-limit", max_local_keys: int = 10000) -> None:
+        self._cache = cache
+        self._prefix = prefix
+        self._local = TokenBucket(max_local_keys)
+
+    @property
+    def enabled(self) -> bool:
+        return self._cache.initialized
+
+    async def hit(self, rules: List[RateLimitRule]) -> Optional[RateLimitResult]:
+        """Counts a request against every rule, None when Redis could not be reached (fail open)"""
+        for rule in rules:
+            if not self._local.consume(f"{rule.scope}:{rule.key}", rule.rate):
+                rate_limit_rejections.add(1, {"rate_limit.scope": rule.scope, "rate_limit.layer": "local"})
+                return RateLimitResult(False, rule.rate.limit, 0, rule.rate.window / rule.rate.limit)
+
+        keys = [f"{self._prefix}:{rule.scope}:{rule.key}" for rule in rules]
+        args: List[object] = [int(time.time() * 1000), uuid4().hex]
+        for rule in rules:
+            args += [rule.rate.limit, int(rule.rate.window * 1000)]
+        try:
+            allowed, limit, remaining, reset_ms = await self._cache.run_script(SLIDING_WINDOW_SCRIPT, keys, args)
+        except Exception:
+            logger.warning("Rate limiter unavailable, letting the request through", exc_info=True)
+            return None
+
+        result = RateLimitResult(bool(allowed), int(limit), int(remaining), int(reset_ms) / 1000)
+        if not result.allowed:
+            rate_limit_rejections.add(1, {"rate_limit.layer": "redis"})
+        return result
+
+
+rate_limiter = RateLimiter(
+    cache_manager, prefix=f"{settings.CACHE_PREFIX}:rate-limit", max_local_keys=settings.RATE_LIMIT_LOCAL_MAX_KEYS
+)
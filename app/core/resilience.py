@@ -0,0 +1,201 @@
+import asyncio
+import time
+from collections import deque
+from enum import Enum
+from typing import Awaitable
+from typing import Callable
+from typing import Deque
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Type
+from typing import TypeVar
+
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions
+from opentelemetry.metrics import Observation
+
+from app.core.telemetry import logger
+
+T = TypeVar("T")
+
+meter = metrics.get_meter(__name__)
+breaker_trips = meter.create_counter(
+    "app.circuit_breaker.trips",
+    description="Times a circuit breaker moved to the open state",
+)
+breaker_rejections = meter.create_counter(
+    "app.circuit_breaker.rejections",
+    description="Calls rejected without reaching the upstream because the circuit breaker was open",
+)
+hedged_requests = meter.create_counter(
+    "app.hedged_requests",
+    description="Hedge attempts started because the first attempt exceeded the latency threshold",
+)
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+STATE_VALUES = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+
+class CircuitBreakerOpenError(Exception):
+    """Exception raised when a call is rejected by an open CircuitBreaker."""
+
+    pass
+
+
+class CircuitBreaker:
+    """Async circuit breaker, one instance per upstream and worker.
+
+    Opens after ``failure_threshold`` consecutive failures, rejects calls for ``recovery_timeout`` seconds, then lets
+    ``half_open_max_calls`` probes through: a successful probe closes it again, a failed one re-opens it. Only the
+    ``failure_exceptions`` count as failures, any other exception passes through untouched.
+    """
+
+    registry: List["CircuitBreaker"] = []
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        failure_exceptions: Tuple[Type[BaseException], ...] = (Exception,),
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.failure_exceptions = failure_exceptions
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._attributes = {"breaker.name": name}
+        CircuitBreaker.registry.append(self)
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state is CircuitState.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = CircuitState.HALF_OPEN
+            self._half_open_calls = 0
+        return self._state
+
+    def reset(self) -> None:
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._half_open_calls = 0
+
+    def _before_call(self) -> None:
+        state = self.state
+        if state is CircuitState.OPEN or (
+            state is CircuitState.HALF_OPEN and self._half_open_calls >= self.half_open_max_calls
+        ):
+            breaker_rejections.add(1, self._attributes)
+            raise CircuitBreakerOpenError(f"Circuit breaker '{self.name}' is open")
+        if state is CircuitState.HALF_OPEN:
+            self._half_open_calls += 1
+
+    def _on_success(self) -> None:
+        if self._state is not CircuitState.CLOSED:
+            logger.info("Circuit breaker '%s' closed", self.name)
+        self.reset()
+
+    def _on_failure(self) -> None:
+        self._failures += 1
+        if self._state is CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+            self._trip()
+
+    def _on_abort(self) -> None:
+        # cancelled or unrelated error: give the half-open probe slot back without judging the upstream
+        if self._state is CircuitState.HALF_OPEN:
+            self._half_open_calls = max(0, self._half_open_calls - 1)
+
+    def _trip(self) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._half_open_calls = 0
+        breaker_trips.add(1, self._attributes)
+        logger.warning("Circuit breaker '%s' opened after %s failures", self.name, self._failures)
+
+    async def call(self, func: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
+        self._before_call()
+        try:
+            result = await func(*args, **kwargs)
+        except self.failure_exceptions:
+            self._on_failure()
+            raise
+        except BaseException:
+            self._on_abort()
+            raise
+        self._on_success()
+        return result
+
+
+def observe_breaker_states(options: CallbackOptions):
+    for breaker in CircuitBreaker.registry:
+        yield Observation(STATE_VALUES[breaker.state], breaker._attributes)
+
+
+meter.create_observable_gauge(
+    "app.circuit_breaker.state",
+    callbacks=[observe_breaker_states],
+    description="Circuit breaker state: 0 closed, 1 half-open, 2 open",
+)
+
+
+class LatencyTracker:
+    """Rolling window of call latencies, used to pick the hedging delay"""
+
+    def __init__(
+        self, window: int = 200, percentile: float = 0.95, default: float = 0.1, min_samples: int = 20
+    ) -> None:
+        self.percentile = percentile
+        self.default = default
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._threshold: Optional[float] = None
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self._threshold = None
+
+    @property
+    def threshold(self) -> float:
+        if len(self._samples) < self.min_samples:
+            return self.default
+        if self._threshold is None:
+            ordered = sorted(self._samples)
+            self._threshold = ordered[min(len(ordered) - 1, int(len(ordered) * self.percentile))]
+        return self._threshold
+
+
+async def hedged(call: Callable[[], Awaitable[T]], delay: float, name: str = "") -> T:
+    """Runs ``call`` and, if it has not finished after ``delay`` seconds, a second concurrent attempt.
+
+    The first attempt to succeed wins and the other one is cancelled. Only use it for idempotent calls.
+    """
+    pending = {asyncio.ensure_future(call())}
+    try:
+        done, pending = await asyncio.wait(pending, timeout=delay)
+        if done:
+            return done.pop().result()
+
+        hedged_requests.add(1, {"hedge.name": name})
+        pending.add(asyncio.ensure_future(call()))
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
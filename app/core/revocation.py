@@ -0,0 +1,163 @@
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from typing import Optional
+
+from opentelemetry import metrics
+
+from app.core.cache import cache_manager
+from app.core.cache import CacheManager
+from app.core.settings import settings
+from app.core.telemetry import LogRateLimitFilter
+from app.core.telemetry import logger
+
+# is_revoked runs on every authenticated request, a Redis outage would otherwise log one warning per request
+lookup_logger = logging.getLogger(__name__)
+lookup_logger.addFilter(
+    LogRateLimitFilter("exception_type", rate=settings.HTTP_ERRORS_LOG_RATE, burst=settings.HTTP_ERRORS_LOG_BURST)
+)
+
+meter = metrics.get_meter(__name__)
+revocation_lookups = meter.create_counter(
+    "app.token_revocation.lookups",
+    description="Revocation checks that had to reach Redis, the Bloom filter could not rule the token out",
+)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter sized for ``capacity`` items at the given false positive rate"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        # double hashing, two 64-bit halves of one digest give every position
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little")
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class TokenRevocationList:
+    """Revoked access tokens by ``jti``, kept in Redis until the token would have expired anyway.
+
+    Every worker mirrors the list into a Bloom filter, loaded from Redis on start and kept current over pub/sub,
+    so checking a token that was never revoked needs no Redis call. The filter is rebuilt every token lifetime to
+    drop expired entries. Filter hits are confirmed in Redis.
+
+    Like the other Redis features, it fails open: while the sync is down, the last loaded filter keeps answering
+    (revocations published meanwhile reach this worker on the resync), and a hit Redis cannot confirm counts as
+    revoked. Before the first load, tokens are checked in Redis only, and accepted if it cannot answer.
+    """
+
+    def __init__(
+        self,
+        cache: CacheManager,
+        capacity: int = settings.TOKEN_REVOCATION_BLOOM_CAPACITY,
+        error_rate: float = settings.TOKEN_REVOCATION_BLOOM_ERROR_RATE,
+        rebuild_interval: float = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        prefix: str = f"{settings.CACHE_PREFIX}:revoked",
+        retry_delay: float = 1.0,
+    ) -> None:
+        self._cache = cache
+        self._capacity = capacity
+        self._error_rate = error_rate
+        self._rebuild_interval = rebuild_interval
+        self._retry_delay = retry_delay
+        self.prefix = prefix
+        self.channel = f"{prefix}:events"
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._loaded = False
+        self._sync_task: Optional[asyncio.Task] = None
+
+    @property
+    def started(self) -> bool:
+        return self._sync_task is not None
+
+    async def start(self) -> None:
+        if self._sync_task is None:
+            self._sync_task = asyncio.create_task(self._sync_loop())
+
+    async def close(self) -> None:
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+            self._sync_task = None
+        self._loaded = False
+
+    async def revoke(self, jti: str, expires_at: int) -> None:
+        ttl = expires_at - int(time.time())
+        if ttl <= 0:
+            return
+        await self._cache.set(f"{self.prefix}:{jti}", 1, expire=ttl)
+        self._bloom.add(jti)
+        await self._cache.publish(self.channel, jti)
+
+    async def is_revoked(self, jti: Optional[str]) -> bool:
+        if not jti or not self._cache.initialized:
+            return False
+        if self._loaded and jti not in self._bloom:
+            return False
+
+        revocation_lookups.add(1)
+        try:
+            return bool(await self._cache.exists(f"{self.prefix}:{jti}"))
+        except Exception:
+            lookup_logger.warning(
+                "Token revocation list unavailable, answering from the last loaded filter",
+                exc_info=True,
+                extra={"exception_type": "TokenRevocationUnavailable"},
+            )
+            # the filter has no false negatives: a loaded filter's hit is revoked, short of a false positive
+            return self._loaded
+
+    async def _load(self) -> BloomFilter:
+        bloom = BloomFilter(self._capacity, self._error_rate)
+        start = len(self.prefix) + 1
+        async for key in self._cache.scan_keys(f"{self.prefix}:*"):
+            bloom.add(key.decode("utf-8")[start:])
+        return bloom
+
+    async def _sync_loop(self) -> None:
+        while True:
+            pubsub = self._cache.pubsub()
+            try:
+                # subscribe before loading, so no revocation falls between the two
+                await pubsub.subscribe(self.channel)
+                self._bloom, self._loaded = await self._load(), True
+                rebuild_at = time.monotonic() + self._rebuild_interval
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is not None:
+                        self._bloom.add(message["data"].decode("utf-8"))
+                    if time.monotonic() >= rebuild_at:
+                        bloom = await self._load()
+                        # keep the jtis published while the new filter was loading
+                        while (message := await pubsub.get_message(ignore_subscribe_messages=True)) is not None:
+                            bloom.add(message["data"].decode("utf-8"))
+                        self._bloom = bloom
+                        rebuild_at = time.monotonic() + self._rebuild_interval
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # the loaded filter keeps answering, the resync reloads the revocations missed while disconnected
+                logger.warning("Token revocation sync failed, retrying in %ss", self._retry_delay, exc_info=True)
+                await asyncio.sleep(self._retry_delay)
+            finally:
+                await pubsub.close()
+
+
+token_revocation = TokenRevocationList(cache_manager)
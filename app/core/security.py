@@ -1,10 +1,20 @@
+import asyncio
+import base64
+import binascii
+import hashlib
+import hmac
+import random
+import time
+from collections import deque
 from datetime import datetime
 from datetime import timedelta
 from functools import wraps
+from typing import Deque
 from typing import Dict
-from typing import List
+from typing import Iterable
 from typing import Optional
 from typing import Tuple
+from uuid import uuid4
 
 import bcrypt
 from fastapi import Request
@@ -13,25 +23,29 @@ from fastapi.security import HTTPBearer
 from jose import jwt
 
 from app.core.exceptions import http_errors
+from app.core.keys import key_ring
+from app.core.permissions import permissions
+from app.core.permissions import Policy
+from app.core.revocation import token_revocation
 from app.core.settings import settings
 from app.models.models_enums import UserRoles
 
-secret_key = settings.SECRET_KEY
 algorithm = settings.ALGORITHM
 
 
-def authorize(role: List[UserRoles], allow_same_id: bool = False):
+def authorize(
+    role: Optional[Iterable[UserRoles]] = None,
+    allow_same_id: bool = False,
+    policy: Optional[Policy] = None,
+):
+    """Checks ``current_user`` against a policy of the permission matrix, or one compiled from ``role``"""
+    if policy is None:
+        policy = permissions.compile(role or [], allow_same_id)
+
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            user_role = kwargs.get("current_user").role
-            have_authorization = user_role in role
-            if allow_same_id:
-                is_same_id = kwargs.get("current_user").id == kwargs.get("id")
-                if not is_same_id and not have_authorization:
-                    raise http_errors.auth_error("Not enough permissions")
-                return await func(*args, **kwargs)
-            if not have_authorization:
+            if not permissions.check(policy, kwargs["current_user"], kwargs.get("id")):
                 raise http_errors.auth_error("Not enough permissions")
             return await func(*args, **kwargs)
 
@@ -47,17 +61,51 @@ def create_access_token(subject: Dict[str, str], expires_delta: timedelta = time
         else datetime.now() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     )
 
-    payload = {"exp": int(round(expire.timestamp())), **subject}
-    encoded_jwt = jwt.encode(payload, secret_key, algorithm)
+    payload = {"exp": int(round(expire.timestamp())), "jti": uuid4().hex, **subject}
+    signing_key, headers = key_ring.signing_key
+    encoded_jwt = jwt.encode(payload, signing_key, algorithm, headers=headers)
     expiration_datetime = expire.strftime(settings.DATETIME_FORMAT)
     return encoded_jwt, expiration_datetime
 
 
+class VerifyPasswordTiming:
+    """Rolling sample of verify_password durations.
+
+    ``wait`` sleeps on the event loop for a duration drawn from the sample, so rejecting an unknown email takes as
+    long as checking a real password, tracking the actual bcrypt cost on this host, without burning CPU. Until a
+    check was observed it sleeps ``default`` seconds, close to a bcrypt check at the default cost.
+    """
+
+    def __init__(self, window: int = 256, default: float = 0.25) -> None:
+        self._samples: Deque[float] = deque(maxlen=window)
+        self.default = default
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def calibrate(self) -> None:
+        """Seeds the sample with one real check, hashed with the same cost as get_password_hash.
+
+        Runs bcrypt twice, call it off the event loop.
+        """
+        verify_password("calibration", get_password_hash("calibration"))
+
+    async def wait(self) -> None:
+        # never calibrate here, bcrypt would block the event loop on the request path
+        await asyncio.sleep(random.choice(self._samples) if self._samples else self.default)
+
+
+verify_password_timing = VerifyPasswordTiming()
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     password_byte_enc = plain_password.encode("utf-8")
     hashed_byte_password = hashed_password.encode("utf-8")
 
-    return bcrypt.checkpw(password=password_byte_enc, hashed_password=hashed_byte_password)
+    start = time.perf_counter()
+    is_valid = bcrypt.checkpw(password=password_byte_enc, hashed_password=hashed_byte_password)
+    verify_password_timing.observe(time.perf_counter() - start)
+    return is_valid
 
 
 def get_password_hash(password: str) -> str:
@@ -71,7 +119,7 @@ def decote_jwt(token: str) -> Optional[str]:
     try:
         decoded_token = jwt.decode(
             token,
-            secret_key,
+            key_ring.verification_key(token),
             algorithms=algorithm,
             options={"verify_exp": False},
         )
@@ -80,6 +128,20 @@ def decote_jwt(token: str) -> Optional[str]:
         return None
 
 
+def verify_client_credentials(credentials: str, clients: Dict[str, str]) -> Optional[str]:
+    """Client id of HTTP Basic ``credentials`` whose secret hashes (sha256 hex) to the one of ``clients``"""
+    try:
+        client_id, _, secret = base64.b64decode(credentials, validate=True).decode("utf-8").partition(":")
+    except (binascii.Error, UnicodeDecodeError):
+        return None
+    expected = clients.get(client_id)
+    if expected is None or not secret:
+        return None
+    if not hmac.compare_digest(hashlib.sha256(secret.encode("utf-8")).hexdigest(), expected.lower()):
+        return None
+    return client_id
+
+
 class JWTBearer(HTTPBearer):
     def __init__(self, auto_error: bool = False):
         super().__init__(auto_error=auto_error)
@@ -90,8 +152,17 @@ class JWTBearer(HTTPBearer):
         if credentials:
             if not credentials.scheme == "Bearer":
                 raise http_errors.auth_error(detail="Authentication failed: invalid scheme, expected 'Bearer'")
-            if not self.verify_jwt(credentials.credentials):
+            if getattr(request.state, "bearer_token", None) == credentials.credentials:
+                # already verified by RateLimitMiddleware to pick the user bucket
+                payload = request.state.bearer_claims
+            else:
+                payload = decote_jwt(credentials.credentials)
+            if not payload:
                 raise http_errors.auth_error(detail="Authentication failed: token is invalid or expired")
+            if await token_revocation.is_revoked(payload.get("jti")):
+                raise http_errors.auth_error(detail="Authentication failed: token has been revoked")
+            # verified claims, so dependencies can use them without decoding the token again
+            request.state.token_claims = payload
             return credentials.credentials
         else:
             raise http_errors.auth_error(detail="Authentication failed: no authorization token provided")
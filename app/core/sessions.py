@@ -0,0 +1,214 @@
+import hashlib
+import json
+import re
+import secrets
+import time
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from uuid import uuid4
+
+from app.core.cache import CacheManager
+from app.core.settings import settings
+from app.core.telemetry import logger
+from app.core.token_version import token_versions
+
+# Session layout, ``<prefix>`` being SessionStore.prefix:
+#   <prefix>:<session_id>       hash: token (sha256 of the current refresh token), user_id, payload (access token
+#                                claims), created_at, last_used_at, ip, user_agent, index
+#   <prefix>:<session_id>:used  set of the rotated-out token hashes, to tell a replayed token from a forged one
+#   <prefix>:user:<user_id>     set of the user's session ids
+# Every key shares the session lifetime, renewed on each rotation. The rotate, list and revoke-all scripts derive
+# keys from stored values (token version, user set), which needs a single Redis node, as the rest of the cache does.
+
+ISSUE_SCRIPT = """
+redis.call('HSET', KEYS[1], 'token', ARGV[1], 'user_id', ARGV[2], 'payload', ARGV[3], 'created_at', ARGV[4],
+    'last_used_at', ARGV[4], 'ip', ARGV[5], 'user_agent', ARGV[6], 'index', KEYS[2])
+redis.call('PEXPIRE', KEYS[1], ARGV[7])
+redis.call('SADD', KEYS[2], ARGV[8])
+redis.call('PEXPIRE', KEYS[2], ARGV[7])
+return 1
+"""
+
+# Returns {1, payload, token version of the user} on rotation, {-1} when a rotated-out token is replayed (the session
+# is revoked), {0} otherwise.
+ROTATE_SCRIPT = """
+local session = redis.call('HMGET', KEYS[1], 'token', 'payload', 'index', 'user_id')
+if not session[1] then
+    return {0}
+end
+if session[1] ~= ARGV[1] then
+    if redis.call('SISMEMBER', KEYS[2], ARGV[1]) == 1 then
+        redis.call('DEL', KEYS[1], KEYS[2])
+        return {-1}
+    end
+    return {0}
+end
+redis.call('HSET', KEYS[1], 'token', ARGV[2], 'last_used_at', ARGV[3])
+redis.call('SADD', KEYS[2], ARGV[1])
+redis.call('PEXPIRE', KEYS[1], ARGV[4])
+redis.call('PEXPIRE', KEYS[2], ARGV[4])
+redis.call('PEXPIRE', session[3], ARGV[4])
+return {1, session[2], redis.call('GET', ARGV[5] .. ':' .. session[4]) or '0'}
+"""
+
+UPDATE_PAYLOAD_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('HSET', KEYS[1], 'payload', ARGV[1])
+end
+return 1
+"""
+
+LIST_SCRIPT = """
+local sessions = {}
+for _, session_id in ipairs(redis.call('SMEMBERS', KEYS[1])) do
+    local session = redis.call('HMGET', ARGV[1] .. ':' .. session_id, 'created_at', 'last_used_at', 'ip', 'user_agent')
+    if session[1] then
+        table.insert(sessions, {session_id, session[1], session[2], session[3], session[4]})
+    else
+        redis.call('SREM', KEYS[1], session_id)
+    end
+end
+return sessions
+"""
+
+REVOKE_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'user_id') ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1], KEYS[2])
+redis.call('SREM', KEYS[3], ARGV[2])
+return 1
+"""
+
+REVOKE_ALL_SCRIPT = """
+local session_ids = redis.call('SMEMBERS', KEYS[1])
+for _, session_id in ipairs(session_ids) do
+    redis.call('DEL', ARGV[1] .. ':' .. session_id, ARGV[1] .. ':' .. session_id .. ':used')
+end
+redis.call('DEL', KEYS[1])
+return #session_ids
+"""
+
+
+class RefreshTokenReuseError(Exception):
+    """Exception raised when an already rotated refresh token is presented again."""
+
+    pass
+
+
+class InvalidRefreshTokenError(Exception):
+    """Exception raised when a refresh token is not shaped like the issued ones."""
+
+    pass
+
+
+# uuid4().hex, checked before building keys so no token or path can name another key (e.g. <prefix>:user:<id>)
+SESSION_ID = re.compile(r"[0-9a-f]{32}")
+
+
+def hash_token(token: str) -> str:
+    # refresh tokens are 256 random bits, a fast hash is enough to keep them unusable if Redis leaks
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class SessionStore:
+    """Opaque refresh tokens backed by Redis sessions, rotated on every use.
+
+    A token is ``<session_id>.<secret>`` and only its hash is stored. Each refresh is a single script call that
+    returns the access token claims saved at sign-in, so it needs neither the database nor bcrypt.
+    """
+
+    def __init__(
+        self,
+        cache: CacheManager,
+        lifetime: int = settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600,
+        prefix: str = f"{settings.CACHE_PREFIX}:session",
+        version_prefix: str = token_versions.prefix,
+    ) -> None:
+        self._cache = cache
+        self.lifetime = lifetime
+        self.prefix = prefix
+        self.version_prefix = version_prefix
+
+    def _keys(self, session_id: str) -> Tuple[str, str]:
+        return f"{self.prefix}:{session_id}", f"{self.prefix}:{session_id}:used"
+
+    def _user_key(self, user_id: str) -> str:
+        return f"{self.prefix}:user:{user_id}"
+
+    @staticmethod
+    def session_id(token: str) -> Optional[str]:
+        """Session id of a refresh token, None when the token is not shaped like the issued ones"""
+        session_id, _, secret = token.partition(".")
+        return session_id if secret and SESSION_ID.fullmatch(session_id) else None
+
+    @staticmethod
+    def _new_token(session_id: str) -> str:
+        return f"{session_id}.{secrets.token_urlsafe(32)}"
+
+    async def issue(self, payload: Dict[str, Any], ip: str = "", user_agent: str = "") -> Optional[str]:
+        """Starts a session and returns its first refresh token, None when Redis is not available"""
+        if not self._cache.initialized:
+            return None
+        session_id = uuid4().hex
+        token = self._new_token(session_id)
+        session_key, _ = self._keys(session_id)
+        args = [
+            hash_token(token),
+            str(payload["id"]),
+            json.dumps(payload),
+            int(time.time()),
+            ip,
+            user_agent,
+            self.lifetime * 1000,
+            session_id,
+        ]
+        try:
+            await self._cache.run_script(ISSUE_SCRIPT, [session_key, self._user_key(str(payload["id"]))], args)
+        except Exception:
+            logger.warning("Session store unavailable, signing in without a refresh token", exc_info=True)
+            return None
+        return token
+
+    async def rotate(self, token: str) -> Optional[Tuple[str, Dict[str, Any], int]]:
+        """Exchanges a refresh token for the next one, the session claims and the user's current token version.
+
+        Returns None for an unknown token. Raises InvalidRefreshTokenError for a malformed one and
+        RefreshTokenReuseError, after revoking the session, when the token was already rotated.
+        """
+        session_id = self.session_id(token)
+        if session_id is None:
+            raise InvalidRefreshTokenError("Malformed refresh token")
+        new_token = self._new_token(session_id)
+        args = [hash_token(token), hash_token(new_token), int(time.time()), self.lifetime * 1000, self.version_prefix]
+        result = await self._cache.run_script(ROTATE_SCRIPT, list(self._keys(session_id)), args)
+        if result[0] == -1:
+            raise RefreshTokenReuseError(f"Refresh token of session '{session_id}' reused, session revoked")
+        if result[0] == 0:
+            return None
+        return new_token, json.loads(result[1]), int(result[2])
+
+    async def update_payload(self, token: str, payload: Dict[str, Any]) -> None:
+        """Replaces the claims of the token's session, used once the user changed since sign-in"""
+        session_key, _ = self._keys(token.partition(".")[0])
+        await self._cache.run_script(UPDATE_PAYLOAD_SCRIPT, [session_key], [json.dumps(payload)])
+
+    async def list(self, user_id: str) -> List[Dict[str, Any]]:
+        sessions = await self._cache.run_script(LIST_SCRIPT, [self._user_key(user_id)], [self.prefix])
+        fields = ("id", "created_at", "last_used_at", "ip", "user_agent")
+        return [
+            {field: value.decode("utf-8") if isinstance(value, bytes) else value for field, value in zip(fields, row)}
+            for row in sessions
+        ]
+
+    async def revoke(self, user_id: str, session_id: str) -> bool:
+        if not SESSION_ID.fullmatch(session_id):
+            return False
+        keys = [*self._keys(session_id), self._user_key(user_id)]
+        return bool(await self._cache.run_script(REVOKE_SCRIPT, keys, [user_id, session_id]))
+
+    async def revoke_all(self, user_id: str) -> int:
+        return int(await self._cache.run_script(REVOKE_ALL_SCRIPT, [self._user_key(user_id)], [self.prefix]))
@@ -1,4 +1,6 @@
 from typing import Dict
+from typing import List
+from typing import Literal
 from typing import Optional
 
 from pydantic_settings import BaseSettings
@@ -17,10 +19,94 @@ class Settings(BaseSettings):
     CACHE_TTS: int = 360
     CACHE_PREFIX: str = "auth-api"
     CACHE_STATUS_HEADER: str = "x-api-cache"
+    # by-id lookups that found nothing, kept in redis and in a per-worker LRU (app.core.negative_cache)
+    NEGATIVE_CACHE_TTL_SECONDS: int = 30
+    NEGATIVE_CACHE_LOCAL_TTL_SECONDS: float = 5.0
+    NEGATIVE_CACHE_LOCAL_MAX_KEYS: int = 10000
+
+    # outbound http client (app.core.http_client)
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_CLIENT_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_CLIENT_HTTP2: bool = False
+    HTTP_CLIENT_CONNECT_TIMEOUT: float = 2.0
+    HTTP_CLIENT_READ_TIMEOUT: float = 5.0
+    HTTP_CLIENT_WRITE_TIMEOUT: float = 5.0
+    HTTP_CLIENT_POOL_TIMEOUT: float = 2.0
+
+    # password generation (/v1/passwords)
+    PASSWORD_API_URL: str = "https://password.gabrielcarvalho.dev/v1/"
+    PASSWORD_LENGTH: int = 12
+    PASSWORD_HAS_PUNCTUATION: bool = True
+    # upstream: password API only, local: in-process generator only,
+    # fallback: password API, switching to the local generator once PASSWORD_UPSTREAM_BUDGET_MS is spent
+    PASSWORD_ENGINE: Literal["upstream", "local", "fallback"] = "upstream"
+    PASSWORD_UPSTREAM_BUDGET_MS: int = 300
+    PASSWORD_API_BREAKER_FAILURE_THRESHOLD: int = 5
+    PASSWORD_API_BREAKER_RECOVERY_SECONDS: float = 30.0
+    # send a second request when the first one is slower than the observed p95
+    PASSWORD_API_HEDGING_ENABLED: bool = False
+    PASSWORD_API_HEDGING_DEFAULT_DELAY_MS: int = 100
+    # concurrent single-password upstream fetches within the window share one quantity=N call
+    PASSWORD_COALESCING_ENABLED: bool = True
+    PASSWORD_COALESCING_WINDOW_MS: float = 5.0
+    PASSWORD_COALESCING_MAX_BATCH: int = 50
+    PASSWORD_POOL_ENABLED: bool = True
+    PASSWORD_POOL_SIZE: int = 200
+    PASSWORD_POOL_LOW_WATERMARK: int = 50
+    PASSWORD_POOL_BATCH_SIZE: int = 100
+    # when set, workers share the pool through this redis list instead of a per-worker buffer
+    PASSWORD_POOL_REDIS_KEY: str = ""
+
+    # sliding-window rate limits as "<requests>/<seconds>", enforced through redis (app.core.rate_limit)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_PER_IP: str = "300/60"
+    RATE_LIMIT_PER_USER: str = "600/60"
+    # per client ip and route template, keys are "<METHOD> <path template>"
+    RATE_LIMIT_ROUTES: Dict[str, str] = {
+        "POST /v1/auth/sign-in": "10/60",
+        "POST /v1/auth/sign-up": "5/60",
+    }
+    RATE_LIMIT_LOCAL_MAX_KEYS: int = 10000
+    # addresses or networks of the reverse proxies (e.g. the Cloudflare ranges) whose cf-connecting-ip and
+    # x-forwarded-for headers name the client; without a match the peer address is the client
+    TRUSTED_PROXIES: List[str] = []
+
+    # gzip/br response compression of JSON and text bodies from COMPRESSION_MINIMUM_SIZE bytes (app.core.compression),
+    # br needs the brotli package. Bodies with an ETag are compressed once per worker and encoding.
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_CACHE_SIZE: int = 1024
+
+    # failed sign-ins allowed per account / client ip within the window before a lockout, which then doubles
+    # on every further failure up to LOGIN_MAX_LOCKOUT_SECONDS (app.core.login_throttle)
+    LOGIN_MAX_FAILURES_PER_ACCOUNT: int = 5
+    LOGIN_MAX_FAILURES_PER_IP: int = 20
+    LOGIN_FAILURE_WINDOW_SECONDS: int = 900
+    LOGIN_LOCKOUT_SECONDS: int = 30
+    LOGIN_MAX_LOCKOUT_SECONDS: int = 900
 
     SECRET_KEY: str = ""
     ALGORITHM: str = "HS256"
+    # RS*/ES* only: PEM keys by kid, all of them verify and are published at /.well-known/jwks.json, JWT_ACTIVE_KID
+    # (the first key by default) signs. To rotate, publish the new key at least JWKS_MAX_AGE_SECONDS before making
+    # it active and keep the old one until ACCESS_TOKEN_EXPIRE_MINUTES after.
+    JWT_KEYS: Dict[str, str] = {}
+    JWT_ACTIVE_KID: str = ""
+    JWKS_MAX_AGE_SECONDS: int = 3600
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 25
+    # per-worker Bloom filter in front of the redis revocation list (app.core.revocation)
+    TOKEN_REVOCATION_BLOOM_CAPACITY: int = 100_000
+    TOKEN_REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    # tokens accepted per POST /v1/auth/introspect call
+    INTROSPECTION_MAX_BATCH: int = 100
+    # clients allowed to introspect over HTTP Basic, client id -> sha256 hex of its secret; admin bearer tokens
+    # are accepted as well
+    INTROSPECTION_CLIENTS: Dict[str, str] = {}
+    # sliding lifetime of refresh-token sessions, renewed on every rotation (app.core.sessions)
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
 
     DATETIME_FORMAT: str = "%Y-%m-%dT%H:%M:%S"
     TEST_DATABASE_URL: Optional[str] = None
@@ -43,6 +129,14 @@ class Settings(BaseSettings):
     COMMIT_BRANCH: str = ""
     DEPLOYMENT_USER: str = ""
     DEPLOYMENT_TRIGGER: str = ""
+    # fraction of repository/service calls traced by @instrument, 1.0 traces every call
+    OTEL_INSTRUMENT_SAMPLE_RATE: float = 1.0
+    OTEL_INSTRUMENT_SKIP_UNSAMPLED_PARENT: bool = False
+    # app.method.* duration, error and in-flight metrics of the @instrument(record_metrics=True) methods
+    OTEL_INSTRUMENT_RECORD_METRICS: bool = True
+    # warnings logged by http_errors, per exception type
+    HTTP_ERRORS_LOG_RATE: float = 10.0
+    HTTP_ERRORS_LOG_BURST: int = 20
 
     PYROSCOPE_SERVER_ADDRESS: str = ""
     PYROSCOPE_BASIC_AUTH_USERNAME: str = ""
@@ -1,13 +1,27 @@
 import asyncio
+import copy
 import inspect
 import logging
+import queue
+import random
+import threading
+import time
 from functools import wraps
+from logging.handlers import QueueHandler
+from logging.handlers import QueueListener
 from typing import Callable
 from typing import Dict
+from typing import Iterable
+from typing import List
 from typing import Optional
+from typing import Tuple
 
 import pyroscope
+from opentelemetry import context
+from opentelemetry import metrics
 from opentelemetry import trace
+from opentelemetry.metrics import CallbackOptions
+from opentelemetry.metrics import Observation
 from opentelemetry.semconv._incubating.attributes.code_attributes import CODE_FILEPATH
 from opentelemetry.semconv._incubating.attributes.code_attributes import CODE_FUNCTION
 from opentelemetry.semconv._incubating.attributes.code_attributes import CODE_LINENO
@@ -16,6 +30,145 @@ from opentelemetry.trace import Tracer
 
 
 logger = logging.getLogger()
+meter = metrics.get_meter(__name__)
+
+method_duration = meter.create_histogram(
+    "app.method.duration",
+    unit="s",
+    description="Duration of instrumented repository and service methods",
+    explicit_bucket_boundaries_advisory=[0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10],
+)
+method_errors = meter.create_counter(
+    "app.method.errors",
+    description="Exceptions raised by instrumented repository and service methods",
+)
+
+
+class _MethodMetrics:
+    """app.method.* state of one instrumented method, with its attribute sets built once."""
+
+    __slots__ = ("attributes", "active_calls", "_error_attributes")
+
+    def __init__(self, name: str) -> None:
+        self.attributes = {CODE_FUNCTION: name}
+        self.active_calls = 0
+        self._error_attributes: Dict[type, Dict[str, str]] = {}
+
+    def error(self, error: Exception) -> None:
+        attributes = self._error_attributes.get(type(error))
+        if attributes is None:
+            attributes = {**self.attributes, "error.type": type(error).__name__}
+            self._error_attributes[type(error)] = attributes
+        method_errors.add(1, attributes)
+
+
+_method_metrics: List[_MethodMetrics] = []
+
+
+def _observe_active_calls(options: CallbackOptions) -> Iterable[Observation]:
+    # in-flight calls are plain counters read at collection, not two measurements per call
+    return [Observation(method.active_calls, method.attributes) for method in _method_metrics]
+
+
+method_active_calls = meter.create_observable_up_down_counter(
+    "app.method.active_calls",
+    callbacks=[_observe_active_calls],
+    description="In-flight calls of instrumented repository and service methods",
+)
+
+
+class ContextQueueHandler(QueueHandler):
+    """QueueHandler that defers formatting to the listener thread and carries the caller's OTel context with
+    the record, so handlers reading the current span (e.g. the OTel LoggingHandler) still see it."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.otel_context = context.get_current()
+        return record
+
+
+class ContextQueueListener(QueueListener):
+    def handle(self, record: logging.LogRecord) -> None:
+        otel_context = getattr(record, "otel_context", None)
+        token = context.attach(otel_context) if otel_context is not None else None
+        try:
+            super().handle(record)
+        finally:
+            if token is not None:
+                context.detach(token)
+
+
+class QueueLogManager:
+    """Moves the root logger handlers behind a QueueHandler, so logging calls only enqueue the record and the
+    handlers run on a background thread."""
+
+    def __init__(self) -> None:
+        self._listener: Optional[ContextQueueListener] = None
+        self._queue_handler: Optional[ContextQueueHandler] = None
+        self._handlers: List[logging.Handler] = []
+
+    def init(self) -> None:
+        if self._listener is not None:
+            return
+        root = logging.getLogger()
+        # without handlers python falls back to logging.lastResort, keep that behaviour behind the queue
+        self._handlers = list(root.handlers) or ([logging.lastResort] if logging.lastResort else [])
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._queue_handler = ContextQueueHandler(log_queue)
+        self._listener = ContextQueueListener(log_queue, *self._handlers, respect_handler_level=True)
+        for handler in self._handlers:
+            root.removeHandler(handler)
+        root.addHandler(self._queue_handler)
+        self._listener.start()
+
+    def close(self) -> None:
+        """Flushes the queue and puts the original handlers back on the root logger."""
+        if self._listener is None:
+            return
+        root = logging.getLogger()
+        root.removeHandler(self._queue_handler)
+        self._listener.stop()
+        for handler in self._handlers:
+            if handler is not logging.lastResort:
+                root.addHandler(handler)
+        self._listener = None
+        self._queue_handler = None
+        self._handlers = []
+
+
+class LogRateLimitFilter(logging.Filter):
+    """Token bucket per value of ``key_attribute``, records without the attribute always pass. The first record
+    let through after a suppression carries the number of dropped records in ``suppressed``."""
+
+    def __init__(self, key_attribute: str, rate: float, burst: int) -> None:
+        super().__init__()
+        self.key_attribute = key_attribute
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._suppressed: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, self.key_attribute, None)
+        if key is None:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            tokens, last_refill = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last_refill) * self.rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                return False
+            self._buckets[key] = (tokens - 1, now)
+            suppressed = self._suppressed.pop(key, 0)
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+log_manager = QueueLogManager()
 
 
 class TracingDecoratorOptions:
@@ -28,11 +181,28 @@ class TracingDecoratorOptions:
 
     naming_scheme: Callable[[Callable], str] = NamingSchemes.default_scheme
     default_attributes: Dict[str, str] = {}
+    sample_rate: float = 1.0
+    skip_unsampled_parent: bool = False
+    record_metrics: bool = True
 
     @staticmethod
     def set_naming_scheme(naming_scheme: Callable[[Callable], str]):
         TracingDecoratorOptions.naming_scheme = naming_scheme
 
+    @staticmethod
+    def set_sample_rate(sample_rate: float):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0.0 and 1.0")
+        TracingDecoratorOptions.sample_rate = sample_rate
+
+    @staticmethod
+    def set_skip_unsampled_parent(skip: bool):
+        TracingDecoratorOptions.skip_unsampled_parent = skip
+
+    @staticmethod
+    def set_record_metrics(enabled: bool):
+        TracingDecoratorOptions.record_metrics = enabled
+
     @staticmethod
     def set_default_attributes(attributes: Optional[Dict[str, str]] = None):
         if not attributes:
@@ -41,6 +211,19 @@ class TracingDecoratorOptions:
             TracingDecoratorOptions.default_attributes[att] = attributes[att]
 
 
+def _should_trace(sample_rate: Optional[float], skip_unsampled_parent: Optional[bool]) -> bool:
+    rate = TracingDecoratorOptions.sample_rate if sample_rate is None else sample_rate
+    if rate < 1.0 and random.random() >= rate:
+        return False
+
+    skip = TracingDecoratorOptions.skip_unsampled_parent if skip_unsampled_parent is None else skip_unsampled_parent
+    if skip:
+        parent_context = trace.get_current_span().get_span_context()
+        if parent_context.is_valid and not parent_context.trace_flags.sampled:
+            return False
+    return True
+
+
 def instrument(
     _func_or_class=None,
     *,
@@ -51,6 +234,9 @@ def instrument(
     ignore=False,
     pyroscope_tagging: bool = False,
     pyroscope_tags: Optional[Dict[str, str]] = None,
+    sample_rate: Optional[float] = None,
+    skip_unsampled_parent: Optional[bool] = None,
+    record_metrics: bool = False,
 ):
     """
     A decorator to instrument a class or function with an OTEL tracing span.
@@ -64,8 +250,23 @@ def instrument(
     class decorator, they will be added to every function span under the class.: dict
     :param existing_tracer: Use a specific tracer instead of creating one :Tracer
     :param ignore: Do not instrument this function, has no effect for class decorators:bool
+    :param sample_rate: Fraction of calls that get a span (0.0 - 1.0). Falls back to
+    TracingDecoratorOptions.sample_rate when not set: float
+    :param skip_unsampled_parent: Call the function without a span when the parent span exists but is not
+    sampled. Falls back to TracingDecoratorOptions.skip_unsampled_parent when not set: bool
+    :param record_metrics: Record the app.method.* duration, error and in-flight metrics for every call, sampled
+    or not, while TracingDecoratorOptions.record_metrics is on. The only metric attribute is the span name (plus
+    error.type for errors), keeping cardinality low: bool
     :return:The decorator function
+
+    Span name, span attributes and pyroscope tags are computed once at decoration time, so naming schemes and
+    default attributes must be configured before the decorated modules are imported. Calls that are not sampled
+    run the bare function, without span or pyroscope tags.
+    Methods a class decorator inherits from an instrumented base class are instrumented again under the
+    subclass name, so UserRepository.read_by_options is reported apart from BaseRepository.read_by_options.
     """
+    if sample_rate is not None and not 0.0 <= sample_rate <= 1.0:
+        raise ValueError("sample_rate must be between 0.0 and 1.0")
 
     def decorate_class(cls):
         cls_pyroscope_tags = (
@@ -74,32 +275,28 @@ def instrument(
         for name, method in inspect.getmembers(cls, inspect.isfunction):
             # Ignore private functions, TODO: maybe make this a setting?
             if not name.startswith("_"):
+                inherited_span_name = ""
+                if name not in cls.__dict__ and getattr(method, "__tracing_class_decorated__", False):
+                    inherited_span_name = f"{cls.__qualname__}.{name}"
+                    method = method.__wrapped__
+                method_decorator = instrument(
+                    span_name=inherited_span_name,
+                    record_exception=record_exception,
+                    attributes=attributes,
+                    existing_tracer=existing_tracer,
+                    pyroscope_tagging=pyroscope_tagging,
+                    pyroscope_tags=cls_pyroscope_tags,
+                    sample_rate=sample_rate,
+                    skip_unsampled_parent=skip_unsampled_parent,
+                    record_metrics=record_metrics,
+                )
+                wrapper = method_decorator(method)
+                if getattr(wrapper, "__tracing_unwrapped__", None) is method:
+                    wrapper.__tracing_class_decorated__ = True
                 if isinstance(inspect.getattr_static(cls, name), staticmethod):
-                    setattr(
-                        cls,
-                        name,
-                        staticmethod(
-                            instrument(
-                                record_exception=record_exception,
-                                attributes=attributes,
-                                existing_tracer=existing_tracer,
-                                pyroscope_tagging=pyroscope_tagging,
-                                pyroscope_tags=cls_pyroscope_tags,
-                            )(method)
-                        ),
-                    )
+                    setattr(cls, name, staticmethod(wrapper))
                 else:
-                    setattr(
-                        cls,
-                        name,
-                        instrument(
-                            record_exception=record_exception,
-                            attributes=attributes,
-                            existing_tracer=existing_tracer,
-                            pyroscope_tagging=pyroscope_tagging,
-                            pyroscope_tags=cls_pyroscope_tags,
-                        )(method),
-                    )
+                    setattr(cls, name, wrapper)
 
         return cls
 
@@ -111,8 +308,6 @@ def instrument(
         if inspect.isclass(func_or_class):
             return decorate_class(func_or_class)
 
-        sig = inspect.signature(func_or_class)  # noqa
-
         # Check if already decorated (happens if both class and function
         # decorated). If so, we keep the function decorator settings only
         undecorated_func = getattr(func_or_class, "__tracing_unwrapped__", None)
@@ -120,60 +315,76 @@ def instrument(
             # We have already decorated this function, override
             return func_or_class
 
-        setattr(func_or_class, "__tracing_unwrapped__", func_or_class)
+        if ignore:
+            setattr(func_or_class, "__tracing_unwrapped__", func_or_class)
+            return func_or_class
 
         tracer = existing_tracer or trace.get_tracer(func_or_class.__module__)
+        name = span_name or TracingDecoratorOptions.naming_scheme(func_or_class)
+        span_attributes = {
+            CODE_NAMESPACE: func_or_class.__module__,
+            CODE_FUNCTION: func_or_class.__qualname__,
+            CODE_FILEPATH: func_or_class.__code__.co_filename,
+            CODE_LINENO: func_or_class.__code__.co_firstlineno,
+            **TracingDecoratorOptions.default_attributes,
+            **(attributes or {}),
+        }
+        p_tags = {**({"function": name} if pyroscope_tagging else {}), **(pyroscope_tags or {})}
+        method_metrics = None
+        if record_metrics:
+            method_metrics = _MethodMetrics(name)
+            _method_metrics.append(method_metrics)
 
-        def _set_semantic_attributes(span, func: Callable):
-            span.set_attribute(CODE_NAMESPACE, func.__module__)
-            span.set_attribute(CODE_FUNCTION, func.__qualname__)
-            span.set_attribute(CODE_FILEPATH, func.__code__.co_filename)
-            span.set_attribute(CODE_LINENO, func.__code__.co_firstlineno)
-
-        def _set_attributes(span, attributes_dict):
-            if attributes_dict:
-                for att in attributes_dict:
-                    span.set_attribute(att, attributes_dict[att])
-
-        def _build_pyroscope_tags(func_name):
-            tags = {}
-            if pyroscope_tagging:
-                tags["function"] = func_name
-            if pyroscope_tags:
-                tags.update(pyroscope_tags)
-            return tags
-
+        # one wrapper per call, sampling, span and metrics inlined: no inner call on the hot path
         @wraps(func_or_class)
         def wrap_with_span_sync(*args, **kwargs):
-            name = span_name or TracingDecoratorOptions.naming_scheme(func_or_class)
-            with tracer.start_as_current_span(name, record_exception=record_exception) as span:
-                _set_semantic_attributes(span, func_or_class)
-                _set_attributes(span, TracingDecoratorOptions.default_attributes)
-                _set_attributes(span, attributes)
-                p_tags = _build_pyroscope_tags(name)
-                if p_tags:
-                    with pyroscope.tag_wrapper(p_tags):
-                        return func_or_class(*args, **kwargs)
-                return func_or_class(*args, **kwargs)
+            start = None
+            if method_metrics is not None and TracingDecoratorOptions.record_metrics:
+                method_metrics.active_calls += 1
+                start = time.perf_counter()
+            try:
+                if not _should_trace(sample_rate, skip_unsampled_parent):
+                    return func_or_class(*args, **kwargs)
+                with tracer.start_as_current_span(name, attributes=span_attributes, record_exception=record_exception):
+                    if p_tags:
+                        with pyroscope.tag_wrapper(p_tags):
+                            return func_or_class(*args, **kwargs)
+                    return func_or_class(*args, **kwargs)
+            except Exception as error:
+                if start is not None:
+                    method_metrics.error(error)
+                raise
+            finally:
+                if start is not None:
+                    method_duration.record(time.perf_counter() - start, method_metrics.attributes)
+                    method_metrics.active_calls -= 1
 
         @wraps(func_or_class)
         async def wrap_with_span_async(*args, **kwargs):
-            name = span_name or TracingDecoratorOptions.naming_scheme(func_or_class)
-            with tracer.start_as_current_span(name, record_exception=record_exception) as span:
-                _set_semantic_attributes(span, func_or_class)
-                _set_attributes(span, TracingDecoratorOptions.default_attributes)
-                _set_attributes(span, attributes)
-                p_tags = _build_pyroscope_tags(name)
-                if p_tags:
-                    with pyroscope.tag_wrapper(p_tags):
-                        return await func_or_class(*args, **kwargs)
-                return await func_or_class(*args, **kwargs)
-
-        if ignore:
-            return func_or_class
+            start = None
+            if method_metrics is not None and TracingDecoratorOptions.record_metrics:
+                method_metrics.active_calls += 1
+                start = time.perf_counter()
+            try:
+                if not _should_trace(sample_rate, skip_unsampled_parent):
+                    return await func_or_class(*args, **kwargs)
+                with tracer.start_as_current_span(name, attributes=span_attributes, record_exception=record_exception):
+                    if p_tags:
+                        with pyroscope.tag_wrapper(p_tags):
+                            return await func_or_class(*args, **kwargs)
+                    return await func_or_class(*args, **kwargs)
+            except Exception as error:
+                if start is not None:
+                    method_metrics.error(error)
+                raise
+            finally:
+                if start is not None:
+                    method_duration.record(time.perf_counter() - start, method_metrics.attributes)
+                    method_metrics.active_calls -= 1
 
         wrapper = wrap_with_span_async if asyncio.iscoroutinefunction(func_or_class) else wrap_with_span_sync
         wrapper.__signature__ = inspect.signature(func_or_class)
+        wrapper.__tracing_unwrapped__ = func_or_class
 
         return wrapper
 
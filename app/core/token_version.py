@@ -0,0 +1,57 @@
+from typing import Dict
+from typing import Iterable
+from typing import Union
+from uuid import UUID
+
+from app.core.cache import cache_manager
+from app.core.cache import CacheManager
+from app.core.settings import settings
+from app.core.telemetry import logger
+
+
+class TokenVersions:
+    """Per-user token version kept in Redis, bumping it outdates every access token issued before.
+
+    Tokens carry the version they were issued with, so checking one is a single GET instead of loading the user.
+    Without Redis every version is 0 and every token is current.
+    """
+
+    def __init__(self, cache: CacheManager, prefix: str = f"{settings.CACHE_PREFIX}:token-version") -> None:
+        self._cache = cache
+        self.prefix = prefix
+
+    async def current(self, user_id: Union[UUID, str]) -> int:
+        if not self._cache.initialized:
+            return 0
+        try:
+            version = await self._cache.get(f"{self.prefix}:{user_id}")
+        except Exception:
+            logger.warning("Token versions unavailable, accepting token of user %s", user_id, exc_info=True)
+            return 0
+        return int(version) if version is not None else 0
+
+    async def current_many(self, user_ids: Iterable[Union[UUID, str]]) -> Dict[str, int]:
+        """Versions of several users in one round trip, by user id as a string; users never bumped are left out"""
+        user_ids = list(dict.fromkeys(str(user_id) for user_id in user_ids))
+        if not user_ids or not self._cache.initialized:
+            return {}
+        try:
+            versions = await self._cache.mget([f"{self.prefix}:{user_id}" for user_id in user_ids])
+        except Exception:
+            logger.warning("Token versions unavailable, accepting tokens of %s users", len(user_ids), exc_info=True)
+            return {}
+        return {user_id: int(version) for user_id, version in zip(user_ids, versions) if version is not None}
+
+    async def is_current(self, user_id: Union[UUID, str], version: int) -> bool:
+        return version >= await self.current(user_id)
+
+    async def bump(self, user_id: Union[UUID, str]) -> None:
+        if not self._cache.initialized:
+            return
+        try:
+            await self._cache.incr(f"{self.prefix}:{user_id}")
+        except Exception:
+            logger.warning("Token versions unavailable, tokens of user %s stay valid", user_id, exc_info=True)
+
+
+token_versions = TokenVersions(cache_manager)
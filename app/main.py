@@ -8,14 +8,26 @@ from fastapi_cache.backends.redis import RedisBackend
 from opentelemetry import trace
 from pyroscope.otel import PyroscopeSpanProcessor
 from redis import asyncio as aioredis
+from starlette.concurrency import run_in_threadpool
 
+from app.core.cache import cache_manager
 from app.core.database import sessionmanager
-from app.core.http_client import http_client
+from app.core.http_client import http_client_manager
+from app.core.middleware import CompressionMiddleware
 from app.core.middleware import OtelMiddleware
 from app.core.middleware import PyroscopeMiddleware
+from app.core.middleware import RateLimitMiddleware
+from app.core.password_pool import password_pool
+from app.core.responses import FastJSONResponse
+from app.core.responses import orjson_available
+from app.core.revocation import token_revocation
+from app.core.security import verify_password_timing
 from app.core.settings import settings
+from app.core.telemetry import log_manager
 from app.core.telemetry import logger
+from app.core.telemetry import TracingDecoratorOptions
 from app.routes import app_routes
+from app.services.password_service import PasswordService
 
 pyroscope.configure(
     application_name=settings.OTEL_SERVICE_NAME,
@@ -29,6 +41,10 @@ provider = trace.get_tracer_provider()
 if hasattr(provider, "add_span_processor"):
     provider.add_span_processor(PyroscopeSpanProcessor())
 
+TracingDecoratorOptions.set_sample_rate(settings.OTEL_INSTRUMENT_SAMPLE_RATE)
+TracingDecoratorOptions.set_skip_unsampled_parent(settings.OTEL_INSTRUMENT_SKIP_UNSAMPLED_PARENT)
+TracingDecoratorOptions.set_record_metrics(settings.OTEL_INSTRUMENT_RECORD_METRICS)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -37,18 +53,23 @@ async def lifespan(app: FastAPI):
     logger.info(f"{settings.OTEL_SERVICE_NAME} initialization started.")
     yield
     logger.info(f"{settings.OTEL_SERVICE_NAME} shutdown completed.")
+    log_manager.close()
 
 
 def init_app(init_db=True):
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
     logging.getLogger("opentelemetry").propagate = False
+    log_manager.init()
 
     if init_db:
 
         @asynccontextmanager
         async def lifespan(app: FastAPI):
             sessionmanager.init(settings.DATABASE_URL)
+            http_client_manager.init(settings)
+            await run_in_threadpool(verify_password_timing.calibrate)
+            cache_manager.init(settings.REDIS_URL)
             redis = aioredis.from_url(settings.REDIS_URL)
             FastAPICache.init(
                 RedisBackend(redis),
@@ -57,13 +78,32 @@ def init_app(init_db=True):
                 cache_status_header=settings.CACHE_STATUS_HEADER,
             )
 
+            await token_revocation.start()
+
+            if settings.PASSWORD_POOL_ENABLED and settings.PASSWORD_ENGINE != "local":
+                password_pool.init(
+                    fetcher=PasswordService(http_client_manager.client, password_pool).fetch_passwords,
+                    size=settings.PASSWORD_POOL_SIZE,
+                    low_watermark=settings.PASSWORD_POOL_LOW_WATERMARK,
+                    batch_size=settings.PASSWORD_POOL_BATCH_SIZE,
+                    cache=cache_manager,
+                    redis_key=settings.PASSWORD_POOL_REDIS_KEY,
+                )
+                await password_pool.start()
+
             logger.info(f"{settings.PROJECT_NAME} initialization started.")
             yield
             logger.info(f"{settings.PROJECT_NAME} shutdown completed.")
+            await password_pool.close()
+            await token_revocation.close()
             if sessionmanager._engine is not None:
                 await sessionmanager.close()
-            if http_client is not None:
-                await http_client.aclose()
+            await http_client_manager.close()
+            await cache_manager.close()
+            log_manager.close()
+
+    if not orjson_available():
+        logger.warning("The 'orjson' package is not installed, JSON responses are rendered with the stdlib json")
 
     app = FastAPI(
         title=settings.title,
@@ -71,8 +111,14 @@ def init_app(init_db=True):
         contact=settings.contact,
         summary=settings.summary,
         lifespan=lifespan,
+        default_response_class=FastJSONResponse,
     )
 
+    if settings.COMPRESSION_ENABLED:
+        app.add_middleware(CompressionMiddleware)
+    if settings.RATE_LIMIT_ENABLED:
+        # inside OtelMiddleware, so its wide event records the 429s; CompressionMiddleware is the innermost
+        app.add_middleware(RateLimitMiddleware)
     app.add_middleware(PyroscopeMiddleware)
     app.add_middleware(OtelMiddleware)
 
@@ -1,11 +1,18 @@
+import logging
 from typing import Any
+from typing import List
+from typing import Optional
+from typing import Sequence
 from typing import Union
 from uuid import UUID
 
 from pydantic import BaseModel
 from pydantic import EmailStr
+from sqlalchemy import any_
+from sqlalchemy import bindparam
 from sqlalchemy import select
 from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
@@ -16,7 +23,7 @@ from app.core.telemetry import logger
 from app.schemas.base_schema import FindBase
 
 
-@instrument(pyroscope_tagging=True)
+@instrument(pyroscope_tagging=True, record_metrics=True)
 class BaseRepository:
     def __init__(self, session: AsyncSession, model) -> None:
         self.session = session
@@ -35,7 +42,7 @@ class BaseRepository:
     async def get_model_by_id(
         self, session: AsyncSession, id: Union[UUID, int], use_select: bool = False, eager: bool = False
     ):
-        logger.debug(f"Fetching {self.model.__name__} with ID {id} | select={use_select}, eager={eager}")
+        logger.debug("Fetching %s with ID %s | select=%s, eager=%s", self.model.__name__, id, use_select, eager)
         if not (use_select and eager):
             return await self.session.get(self.model, id)
 
@@ -50,11 +57,26 @@ class BaseRepository:
     def get_compiled_query(self, query: select) -> str:
         return str(query.compile(compile_kwargs={"literal_binds": True}))
 
-    async def read_by_options(self, schema: FindBase, eager: bool = False, unique: bool = False):
-        logger.debug(f"Reading {self.model.__name__} by options: {schema.model_dump(exclude_unset=True)}")
+    async def read_by_options(
+        self,
+        schema: FindBase,
+        eager: bool = False,
+        unique: bool = False,
+        columns: Optional[Sequence[str]] = None,
+    ):
+        """Page of records matching ``schema``.
+
+        With ``columns`` the page is read-only: a Core select of those columns returns plain rows, with attribute
+        access like the models but no identity map, instrumentation or per-row model instance.
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Reading %s by options: %s", self.model.__name__, schema.model_dump(exclude_unset=True))
         order_query = await self.get_order_by(schema)
-        query = select(self.model).order_by(order_query)
-        if eager:
+        if columns:
+            query = select(*(getattr(self.model, column) for column in columns)).order_by(order_query)
+        else:
+            query = select(self.model).order_by(order_query)
+        if eager and not columns:
             for eager_relation in getattr(self.model, "eagers", []):
                 query = query.options(joinedload(getattr(self.model, eager_relation)))
         if schema.page_size != "all":
@@ -75,8 +97,8 @@ class BaseRepository:
         query = await self.session.execute(query)
         if unique:
             query = query.unique()
-        result = query.scalars().all()
-        logger.info(f"Found {len(result)} records for {self.model.__name__}")
+        result = query.all() if columns else query.scalars().all()
+        logger.info("Found %s records for %s", len(result), self.model.__name__)
         return {
             "data": result,
             "metadata": {
@@ -92,30 +114,38 @@ class BaseRepository:
         }
 
     async def read_by_id(self, id: Union[UUID, int], eager: bool = False, use_select: bool = False):
-        logger.debug(f"Reading {self.model.__name__} by ID: {id}")
+        logger.debug("Reading %s by ID: %s", self.model.__name__, id)
         result = await self.get_model_by_id(self.session, id, eager, use_select)
         if not result:
             raise http_errors.not_found(detail=f"Resource with id={id} not found")
         return result
 
+    async def read_by_ids(self, ids: List[Union[UUID, int]]):
+        logger.debug("Reading %s %s by IDs", len(ids), self.model.__name__)
+        # a single array parameter keeps one prepared statement for every batch size
+        query = select(self.model).where(self.model.id == any_(bindparam("ids", ids, type_=ARRAY(self.model.id.type))))
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
     async def read_by_email(self, email: EmailStr, unique: bool = False):
-        logger.debug(f"Reading {self.model.__name__} by email: {email}")
+        logger.debug("Reading %s by email: %s", self.model.__name__, email)
         query = select(self.model).where(self.model.email == email)
         result = await self.session.execute(query)
         if unique:
             result = result.unique()
         user = result.scalars().all()
-        logger.info(f"Found {len(user)} entries with email={email}")
+        logger.info("Found %s entries with email=%s", len(user), email)
         return user
 
     async def create(self, schema: BaseModel):
-        logger.debug(f"Creating {self.model.__name__} with data: {schema.model_dump(exclude_unset=True)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Creating %s with data: %s", self.model.__name__, schema.model_dump(exclude_unset=True))
         model = self.model(**schema.model_dump())
         try:
             self.session.add(model)
             await self.session.commit()
             await self.session.refresh(model)
-            logger.info(f"{self.model.__name__} created with ID {model.id}")
+            logger.info("%s created with ID %s", self.model.__name__, model.id)
         except IntegrityError:
             raise http_errors.duplicated_error(
                 detail=f"{self.model.__tablename__.capitalize()[:-1]} already registered"
@@ -126,7 +156,7 @@ class BaseRepository:
 
     async def update(self, id: Union[UUID, int], schema: BaseModel, use_select: bool = True):
         schema = schema.model_dump(exclude_unset=True)
-        logger.debug(f"Updating {self.model.__name__} ID={id} with data: {schema}")
+        logger.debug("Updating %s ID=%s with data: %s", self.model.__name__, id, schema)
         model = await self.get_model_by_id(self.session, id, use_select)
         if not model:
             raise http_errors.not_found(detail=f"Resource with id={id} not found")
@@ -141,11 +171,11 @@ class BaseRepository:
         self.session.add(model)
         await self.session.commit()
         await self.session.refresh(model)
-        logger.info(f"{self.model.__name__} with ID={id} successfully updated")
+        logger.info("%s with ID=%s successfully updated", self.model.__name__, id)
         return model
 
     async def update_attr(self, id: Union[UUID, int], column: str, value: Any, use_select: bool = False):
-        logger.debug(f"Updating column '{column}' of {self.model.__name__} ID={id} with value: {value}")
+        logger.debug("Updating column '%s' of %s ID=%s with value: %s", column, self.model.__name__, id, value)
         result = await self.get_model_by_id(self.session, id, use_select)
         if not result:
             raise http_errors.not_found(detail=f"Resource with id={id} not found")
@@ -157,17 +187,17 @@ class BaseRepository:
             await self.session.execute(stmt)
             await self.session.commit()
             await self.session.refresh(result)
-            logger.info(f"Updated '{column}' to '{value}' on model {self.model.__name__} (ID={id})")
+            logger.info("Updated '%s' to '%s' on model %s (ID=%s)", column, value, self.model.__name__, id)
             return result
         except IntegrityError as e:
             error_message = ":".join(str(e.orig).replace("\n", " ").split(":")[1:])
             raise http_errors.duplicated_error(detail=error_message)
 
     async def delete_by_id(self, id: Union[UUID, int], use_select: bool = False):
-        logger.debug(f"Deleting {self.model.__name__} ID={id}")
+        logger.debug("Deleting %s ID=%s", self.model.__name__, id)
         result = await self.get_model_by_id(self.session, id, use_select)
         if not result:
             raise http_errors.not_found(detail=f"not found id: {id}")
         await self.session.delete(result)
         await self.session.commit()
-        logger.info(f"{self.model.__name__} with ID={id} successfully deleted")
+        logger.info("%s with ID=%s successfully deleted", self.model.__name__, id)
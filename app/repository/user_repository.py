@@ -7,7 +7,7 @@ from app.models import User
 from app.repository.base_repository import BaseRepository
 
 
-@instrument(pyroscope_tagging=True)
+@instrument(pyroscope_tagging=True, record_metrics=True)
 class UserRepository(BaseRepository):
     def __init__(
         self,
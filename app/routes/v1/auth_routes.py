@@ -1,8 +1,27 @@
+from typing import Annotated
+from typing import List
+from typing import Union
+
 from fastapi import APIRouter
+from fastapi import Header
+from fastapi import Request
+from fastapi import Response
 
 from app.core.dependencies import AuthServiceDependency
+from app.core.dependencies import ClientIpDependency
+from app.core.dependencies import CurrentClaimsDependency
 from app.core.dependencies import CurrentUserDependency
+from app.core.dependencies import IntrospectionCallerDependency
+from app.core.dependencies import TokenDependency
+from app.core.responses import conditional_get
+from app.core.responses import ModelResponse
 from app.core.telemetry import logger
+from app.schemas.auth_schema import IntrospectionBatchResponse
+from app.schemas.auth_schema import IntrospectionResult
+from app.schemas.auth_schema import IntrospectRequest
+from app.schemas.auth_schema import RefreshTokenRequest
+from app.schemas.auth_schema import RefreshTokenResponse
+from app.schemas.auth_schema import Session
 from app.schemas.auth_schema import SignIn
 from app.schemas.auth_schema import SignInResponse
 from app.schemas.auth_schema import SignUp
@@ -12,9 +31,14 @@ router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
 @router.post("/sign-in", response_model=SignInResponse)
-async def sign_in(user_info: SignIn, service: AuthServiceDependency):
+async def sign_in(
+    user_info: SignIn,
+    service: AuthServiceDependency,
+    client_ip: ClientIpDependency,
+    user_agent: Annotated[str, Header()] = "",
+):
     logger.info("POST /auth/sign-in - email=%s", user_info.email)
-    return await service.sign_in(user_info)
+    return ModelResponse(await service.sign_in(user_info, client_ip, user_agent))
 
 
 @router.post("/sign-up", status_code=201, response_model=UserSchema)
@@ -29,7 +53,49 @@ async def refresh_token(current_user: CurrentUserDependency, service: AuthServic
     return await service.refresh_token(current_user)
 
 
+@router.post("/sign-out", status_code=204)
+async def sign_out(token: TokenDependency, service: AuthServiceDependency):
+    logger.info("POST /auth/sign-out")
+    await service.sign_out(token)
+
+
+@router.post("/refresh", response_model=RefreshTokenResponse)
+async def refresh(refresh_info: RefreshTokenRequest, service: AuthServiceDependency):
+    logger.info("POST /auth/refresh")
+    return ModelResponse(await service.refresh(refresh_info.refresh_token))
+
+
+@router.post("/introspect", response_model=Union[IntrospectionResult, IntrospectionBatchResponse])
+async def introspect(
+    introspect_info: IntrospectRequest, service: AuthServiceDependency, caller: IntrospectionCallerDependency
+):
+    if introspect_info.token is not None:
+        logger.info("POST /auth/introspect - caller=%s", caller)
+        return (await service.introspect([introspect_info.token]))[0]
+    logger.info("POST /auth/introspect - caller=%s, batch of %s", caller, len(introspect_info.tokens))
+    return ModelResponse(IntrospectionBatchResponse(results=await service.introspect(introspect_info.tokens)))
+
+
+@router.get("/sessions", response_model=List[Session])
+async def get_sessions(current_user: CurrentClaimsDependency, service: AuthServiceDependency):
+    logger.info("GET /auth/sessions - user_id=%s", current_user.id)
+    return await service.get_sessions(current_user)
+
+
+@router.delete("/sessions", status_code=204)
+async def revoke_sessions(current_user: CurrentClaimsDependency, service: AuthServiceDependency):
+    logger.info("DELETE /auth/sessions - user_id=%s", current_user.id)
+    await service.revoke_sessions(current_user)
+
+
+@router.delete("/sessions/{session_id}", status_code=204)
+async def revoke_session(session_id: str, current_user: CurrentClaimsDependency, service: AuthServiceDependency):
+    logger.info("DELETE /auth/sessions/%s - user_id=%s", session_id, current_user.id)
+    await service.revoke_session(current_user, session_id)
+
+
 @router.get("/me", response_model=UserSchema)
-async def get_me(current_user: CurrentUserDependency):
+@conditional_get
+async def get_me(current_user: CurrentUserDependency, request: Request, response: Response):
     logger.info("GET /auth/me - user_id=%s", current_user.id)
     return current_user
@@ -2,16 +2,24 @@ from uuid import UUID
 
 from fastapi import APIRouter
 from fastapi import Depends
+from fastapi import Request
+from fastapi import Response
 from fastapi_cache.decorator import cache
 
-from app.core.cache import cache_key_builder
-from app.core.dependencies import CurrentUserDependency
+from app.core.cache_keys import cache_keys
+from app.core.dependencies import CurrentClaimsDependency
 from app.core.dependencies import FindBase
 from app.core.dependencies import UserServiceDependency
+from app.core.list_cache import list_cache
+from app.core.permissions import UserPolicies
+from app.core.responses import conditional_get
+from app.core.responses import from_trusted_attributes
+from app.core.responses import ModelResponse
 from app.core.security import authorize
 from app.core.telemetry import logger
-from app.models.models_enums import UserRoles
+from app.models import User as UserModel
 from app.schemas.base_schema import Message
+from app.schemas.base_schema import Metadata
 from app.schemas.user_schema import BaseUserWithPassword
 from app.schemas.user_schema import FindUserResult
 from app.schemas.user_schema import UpsertUser
@@ -21,23 +29,35 @@ router = APIRouter(prefix="/users", tags=["user"])
 
 
 @router.get("", response_model=FindUserResult)
-@authorize(role=[UserRoles.MODERATOR, UserRoles.ADMIN, UserRoles.BASE_USER])
+@authorize(policy=UserPolicies.LIST)
+@list_cache.cached(UserModel.__name__)
 async def get_user_list(
     service: UserServiceDependency,
-    current_user: CurrentUserDependency,
+    current_user: CurrentClaimsDependency,
     find_query: FindBase = Depends(),
 ):
     logger.info("GET /user/ - user_id=%s", current_user.id)
-    return await service.get_list(find_query)
+    result = await service.get_list(find_query)
+    # the rows come from the database, build the page without validating every email again and dump it in one pass
+    return ModelResponse(
+        FindUserResult.model_construct(
+            data=[from_trusted_attributes(User, row) for row in result["data"]],
+            metadata=Metadata.model_validate(result["metadata"]),
+        )
+    )
 
 
 @router.get("/{id}", response_model=User)
-@cache(key_builder=cache_key_builder("UserService", "id"))
-@authorize(role=[UserRoles.MODERATOR, UserRoles.ADMIN], allow_same_id=True)
+# outermost: 304s and cached bodies are only served to callers allowed to read the user
+@authorize(policy=UserPolicies.READ)
+@conditional_get
+@cache(key_builder=cache_keys.key_builder(UserModel.__name__, "id"))
 async def get_by_id(
     id: UUID,
     service: UserServiceDependency,
-    current_user: CurrentUserDependency,
+    current_user: CurrentClaimsDependency,
+    request: Request,
+    response: Response,
 ):
     logger.info("GET /user/%s - user_id=%s", id, current_user.id)
     return await service.get_by_id(id)
@@ -52,23 +72,23 @@ async def create_user(user: BaseUserWithPassword, service: UserServiceDependency
 ### importante tem de fazer
 ### adicionar validacao para quano o a request tiver parametros iguais ao do current_user
 @router.put("/{id}", response_model=User)
-@authorize(role=[UserRoles.MODERATOR, UserRoles.ADMIN], allow_same_id=True)
+@authorize(policy=UserPolicies.UPDATE)
 async def update_user(
     id: UUID,
     user: UpsertUser,
     service: UserServiceDependency,
-    current_user: CurrentUserDependency,
+    current_user: CurrentClaimsDependency,
 ):
     logger.info("PUT /user/%s - user_id=%s", id, current_user.id)
     return await service.patch(id=id, schema=user)
 
 
 @router.patch("/enable_user/{id}", response_model=Message)
-@authorize(role=[UserRoles.MODERATOR, UserRoles.ADMIN], allow_same_id=True)
+@authorize(policy=UserPolicies.UPDATE)
 async def enabled_user(
     id: UUID,
     service: UserServiceDependency,
-    current_user: CurrentUserDependency,
+    current_user: CurrentClaimsDependency,
 ):
     logger.info("PATCH /user/enable_user/%s - user_id=%s", id, current_user.id)
     await service.patch_attr(id=id, attr="is_active", value=True)
@@ -76,11 +96,11 @@ async def enabled_user(
 
 
 @router.patch("/disable/{id}", response_model=Message)
-@authorize(role=[UserRoles.MODERATOR, UserRoles.ADMIN], allow_same_id=True)
+@authorize(policy=UserPolicies.UPDATE)
 async def disable_user(
     id: UUID,
     service: UserServiceDependency,
-    current_user: CurrentUserDependency,
+    current_user: CurrentClaimsDependency,
 ):
     logger.info("PATCH /user/disable/%s - user_id=%s", id, current_user.id)
     await service.patch_attr(id=id, attr="is_active", value=False)
@@ -88,11 +108,11 @@ async def disable_user(
 
 
 @router.delete("/{id}", status_code=204)
-@authorize(role=[UserRoles.ADMIN])
+@authorize(policy=UserPolicies.DELETE)
 async def delete_user(
     id: UUID,
     service: UserServiceDependency,
-    current_user: CurrentUserDependency,
+    current_user: CurrentClaimsDependency,
 ):
     logger.info("DELETE /user/%s - user_id=%s", id, current_user.id)
     await service.remove_by_id(id)
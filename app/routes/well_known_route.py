@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from fastapi import Header
+from fastapi import Response
+
+from app.core.keys import key_ring
+from app.core.settings import settings
+
+router = APIRouter(prefix="/.well-known", tags=["Well-known"])
+
+
+@router.get("/jwks.json")
+async def get_jwks(if_none_match: str = Header(default="")):
+    headers = {
+        "Cache-Control": f"public, max-age={settings.JWKS_MAX_AGE_SECONDS}, stale-while-revalidate=86400",
+        "ETag": key_ring.jwks_etag,
+    }
+    if key_ring.jwks_etag in if_none_match:
+        return Response(status_code=304, headers=headers)
+    return Response(key_ring.jwks_body, media_type="application/json", headers=headers)
@@ -0,0 +1,7 @@
+from pydantic import TypeAdapter
+
+from app.schemas.auth_schema import VerifiedPayload
+
+# Validators of the schemas read on every request, built once at import and shared.
+
+verified_payload_adapter: TypeAdapter[VerifiedPayload] = TypeAdapter(VerifiedPayload)
@@ -1,8 +1,17 @@
 from datetime import datetime
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from uuid import UUID
 
 from pydantic import BaseModel
 from pydantic import EmailStr
 from pydantic import Field
+from pydantic import model_validator
+
+from app.core.settings import settings
+from app.models.models_enums import UserRoles
 
 from app.schemas.user_schema import User
 
@@ -19,9 +28,20 @@ class SignUp(BaseModel):
 
 
 class Payload(BaseModel):
-    id: str
+    """Signed access token claims, enough to authenticate and authorize without loading the user"""
+
+    id: UUID
     email: EmailStr
     username: str
+    role: UserRoles = UserRoles.BASE_USER
+    is_active: bool = True
+    token_version: int = 0
+
+
+class VerifiedPayload(Payload):
+    """Claims of a token whose signature was verified, the email was validated when the token was issued"""
+
+    email: str
 
 
 class Token(BaseModel):
@@ -33,3 +53,44 @@ class SignInResponse(BaseModel):
     access_token: str
     expiration: datetime
     user_info: User
+    refresh_token: Optional[str] = None
+
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
+
+
+class RefreshTokenResponse(BaseModel):
+    access_token: str
+    expiration: datetime
+    refresh_token: str
+
+
+class Session(BaseModel):
+    id: str
+    created_at: datetime
+    last_used_at: datetime
+    ip: str
+    user_agent: str
+
+
+class IntrospectRequest(BaseModel):
+    token: Optional[str] = None
+    tokens: Optional[List[str]] = Field(default=None, min_length=1, max_length=settings.INTROSPECTION_MAX_BATCH)
+
+    @model_validator(mode="after")
+    def check_one_mode(self) -> "IntrospectRequest":
+        if (self.token is None) == (self.tokens is None):
+            raise ValueError("Provide either 'token' or 'tokens'")
+        return self
+
+
+class IntrospectionResult(BaseModel):
+    active: bool
+    claims: Optional[Dict[str, Any]] = None
+    role: Optional[UserRoles] = None
+    is_active: Optional[bool] = None
+
+
+class IntrospectionBatchResponse(BaseModel):
+    results: List[IntrospectionResult]
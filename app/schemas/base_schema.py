@@ -61,6 +61,11 @@ class FindBase(BaseModel):
     @field_validator("page_size")
     @classmethod
     def page_size_field_validator(cls, value: Union[str, int], info: ValidationInfo):
+        # the common values, without going through int() and its exception
+        if value == "all" or (type(value) is int and value >= 0):
+            return value
+        if isinstance(value, str) and value.isdecimal():
+            return int(value)
         try:
             input = int(value)
             if input < 0:
@@ -1,16 +1,38 @@
+from datetime import datetime
 from datetime import timedelta
+from datetime import timezone
+from typing import Dict
 from typing import List
+from typing import Optional
+from typing import Tuple
+from uuid import UUID
+
+from redis.exceptions import RedisError
 
 from app.core.cache import CacheManager
+from app.core.cache import CacheManagerError
 from app.core.exceptions import http_errors
+from app.core.login_throttle import LoginThrottle
+from app.core.revocation import token_revocation
 from app.core.security import create_access_token
+from app.core.security import decote_jwt
 from app.core.security import get_password_hash
 from app.core.security import verify_password
+from app.core.security import verify_password_timing
+from app.core.sessions import hash_token
+from app.core.sessions import InvalidRefreshTokenError
+from app.core.sessions import RefreshTokenReuseError
+from app.core.sessions import SessionStore
 from app.core.settings import settings
 from app.core.telemetry import instrument
+from app.core.telemetry import logger
+from app.core.token_version import token_versions
 from app.models import User
 from app.repository.user_repository import UserRepository
+from app.schemas.auth_schema import IntrospectionResult
 from app.schemas.auth_schema import Payload
+from app.schemas.auth_schema import RefreshTokenResponse
+from app.schemas.auth_schema import Session
 from app.schemas.auth_schema import SignIn
 from app.schemas.auth_schema import SignInResponse
 from app.schemas.auth_schema import SignUp
@@ -18,55 +40,218 @@ from app.schemas.user_schema import BaseUserWithPassword
 from app.services.base_service import BaseService
 
 
-@instrument(pyroscope_tagging=True)
+@instrument(pyroscope_tagging=True, record_metrics=True)
 class AuthService(BaseService):
     def __init__(self, user_repository: UserRepository, cache: CacheManager) -> None:
         self.user_repository = user_repository
+        self.login_throttle = LoginThrottle(cache)
+        self.sessions = SessionStore(cache)
         super().__init__(user_repository, cache)
 
-    async def sign_in(self, sign_in_info: SignIn):
+    async def sign_in(self, sign_in_info: SignIn, client_ip: str = "", user_agent: str = ""):
+        retry_after = await self.login_throttle.retry_after(sign_in_info.email, client_ip)
+        if retry_after:
+            raise http_errors.too_many_requests(
+                detail="Too many failed sign-in attempts, try again later",
+                headers={"Retry-After": str(retry_after)},
+            )
+
         user: List[User] = await self.user_repository.read_by_email(email=sign_in_info.email, unique=True)
         if not user:
+            # take as long as a password check would, without running bcrypt, so timing does not reveal the email
+            await verify_password_timing.wait()
+            await self.login_throttle.record_failure(sign_in_info.email, client_ip)
             raise http_errors.invalid_credentials(detail="Incorrect email or user not exist")
         found_user = user[0]
 
         if not verify_password(sign_in_info.password, found_user.password):
+            await self.login_throttle.record_failure(sign_in_info.email, client_ip)
             raise http_errors.invalid_credentials(detail="Incorrect password")
+        await self.login_throttle.record_success(sign_in_info.email)
 
         delattr(found_user, "password")
 
-        payload = Payload(
-            id=str(found_user.id),
-            email=found_user.email,
-            username=found_user.username,
-        )
+        claims = await self.get_claims(found_user)
         token_lifespan = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token, expiration_datetime = create_access_token(payload.model_dump(), token_lifespan)
+        access_token, expiration_datetime = create_access_token(claims, token_lifespan)
         sign_in_result = SignInResponse(
             access_token=access_token,
             expiration=expiration_datetime,
             user_info=found_user,
+            refresh_token=await self.sessions.issue(claims, client_ip, user_agent),
         )
         return sign_in_result
 
+    async def get_claims(self, user: User, token_version: Optional[int] = None) -> Dict:
+        if token_version is None:
+            token_version = await token_versions.current(user.id)
+        payload = Payload(
+            id=user.id,
+            email=user.email,
+            username=user.username,
+            role=user.role,
+            is_active=user.is_active,
+            token_version=token_version,
+        )
+        return payload.model_dump(mode="json")
+
     async def sign_up(self, user_info: SignUp) -> User:
         user = BaseUserWithPassword(**user_info.model_dump(exclude_none=True))
         user.password = get_password_hash(user_info.password)
         created_user = await self.user_repository.create(user)
+        # the user routes cache users, not this service: drop the list pages and a cached 404 of the new id
+        await self.invalidate_cache(created_user.id)
         delattr(created_user, "password")
         return created_user
 
     async def refresh_token(self, current_user: User):
-        payload = Payload(
-            id=str(current_user.id),
-            email=current_user.email,
-            username=current_user.username,
-        )
         token_lifespan = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token, expiration_datetime = create_access_token(payload.model_dump(), token_lifespan)
+        access_token, expiration_datetime = create_access_token(await self.get_claims(current_user), token_lifespan)
         sign_in_result = SignInResponse(
             access_token=access_token,
             expiration=expiration_datetime,
             user_info=current_user,
         )
         return sign_in_result
+
+    async def refresh(self, refresh_token: str) -> RefreshTokenResponse:
+        try:
+            rotated = await self.sessions.rotate(refresh_token)
+        except InvalidRefreshTokenError:
+            raise http_errors.invalid_credentials(detail="Refresh token is malformed")
+        except RefreshTokenReuseError:
+            raise http_errors.auth_error(detail="Refresh token already used, session revoked")
+        except (CacheManagerError, RedisError):
+            raise self._sessions_unavailable()
+        if rotated is None:
+            raise http_errors.auth_error(detail="Refresh token is invalid or expired")
+
+        new_refresh_token, claims, token_version = rotated
+        if claims.get("token_version", 0) < token_version:
+            # the user changed since the claims were saved, rebuild them once from the database
+            users = await self.user_repository.read_by_ids([UUID(claims["id"])])
+            if not users:
+                raise http_errors.auth_error(detail="User not found")
+            claims = await self.get_claims(users[0], token_version)
+            await self.sessions.update_payload(new_refresh_token, claims)
+        if not claims.get("is_active", True):
+            raise http_errors.auth_error(detail="Inactive user")
+
+        token_lifespan = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        access_token, expiration_datetime = create_access_token(claims, token_lifespan)
+        return RefreshTokenResponse(
+            access_token=access_token,
+            expiration=expiration_datetime,
+            refresh_token=new_refresh_token,
+        )
+
+    async def sign_out(self, token: str) -> None:
+        """Revokes the access token until it expires"""
+        payload = decote_jwt(token)
+        if not payload or "jti" not in payload:
+            raise http_errors.bad_request("Token cannot be revoked")
+        try:
+            await token_revocation.revoke(payload["jti"], payload["exp"])
+        except (CacheManagerError, RedisError):
+            raise http_errors.service_unavailable("Token revocation unavailable, try again later")
+
+    async def introspect(self, tokens: List[str]) -> List[IntrospectionResult]:
+        """Token state and claims, cached until each token expires; user state is read in one query per batch.
+
+        Cached results keep the token_version claim and are checked against the users' current versions, read in
+        one round trip per batch: a token outdated by a change of its user is inactive, cached or not.
+        """
+        keys = [f"{settings.CACHE_PREFIX}:introspect:{hash_token(token)}" for token in tokens]
+        cached = await self._get_introspections(keys)
+        results: List[Optional[IntrospectionResult]] = [None] * len(tokens)
+        pending: Dict[int, Dict] = {}
+        for index, (token, entry) in enumerate(zip(tokens, cached)):
+            if entry is not None:
+                results[index] = IntrospectionResult.model_validate_json(entry)
+            elif claims := decote_jwt(token):
+                pending[index] = claims
+            else:
+                results[index] = IntrospectionResult(active=False)
+
+        to_check = [result.claims for result in results if result is not None and result.active]
+        versions = await token_versions.current_many(claims["id"] for claims in [*to_check, *pending.values()])
+
+        def outdated(claims: Dict) -> bool:
+            return claims.get("token_version", 0) < versions.get(claims["id"], 0)
+
+        for index, result in enumerate(results):
+            if result is not None and result.active and outdated(result.claims):
+                results[index] = IntrospectionResult(active=False)
+
+        if pending:
+            current = {index: claims for index, claims in pending.items() if not outdated(claims)}
+            users = await self.user_repository.read_by_ids(list({UUID(claims["id"]) for claims in current.values()}))
+            users_by_id = {str(user.id): user for user in users}
+            now = int(datetime.now().timestamp())
+            to_cache = []
+            for index, claims in pending.items():
+                user = users_by_id.get(claims["id"]) if index in current else None
+                if user is None:
+                    # versions only grow, an outdated token stays inactive
+                    results[index] = IntrospectionResult(active=False)
+                else:
+                    results[index] = IntrospectionResult(
+                        active=user.is_active, claims=claims, role=user.role, is_active=user.is_active
+                    )
+                to_cache.append((keys[index], results[index].model_dump_json(), claims["exp"] - now))
+            await self._set_introspections([item for item in to_cache if item[2] > 0])
+
+        # revocations are not cached, the check is an in-memory Bloom filter lookup for tokens never revoked
+        for index, result in enumerate(results):
+            if result.active and await token_revocation.is_revoked(result.claims.get("jti")):
+                results[index] = IntrospectionResult(active=False)
+        return results
+
+    async def _get_introspections(self, keys: List[str]) -> List[Optional[bytes]]:
+        if self._cache.initialized:
+            try:
+                return await self._cache.mget(keys)
+            except Exception:
+                logger.warning("Failed to read cached introspections", exc_info=True)
+        return [None] * len(keys)
+
+    async def _set_introspections(self, items: List[Tuple[str, str, int]]) -> None:
+        if self._cache.initialized and items:
+            try:
+                await self._cache.set_many(items)
+            except Exception:
+                logger.warning("Failed to cache introspections", exc_info=True)
+
+    async def get_sessions(self, current_user: Payload) -> List[Session]:
+        try:
+            sessions = await self.sessions.list(str(current_user.id))
+        except (CacheManagerError, RedisError):
+            raise self._sessions_unavailable()
+        return [
+            Session(
+                **{
+                    **session,
+                    "created_at": datetime.fromtimestamp(int(session["created_at"]), timezone.utc),
+                    "last_used_at": datetime.fromtimestamp(int(session["last_used_at"]), timezone.utc),
+                }
+            )
+            for session in sessions
+        ]
+
+    async def revoke_session(self, current_user: Payload, session_id: str) -> None:
+        try:
+            revoked = await self.sessions.revoke(str(current_user.id), session_id)
+        except (CacheManagerError, RedisError):
+            raise self._sessions_unavailable()
+        if not revoked:
+            raise http_errors.not_found(detail="Session not found")
+
+    async def revoke_sessions(self, current_user: Payload) -> None:
+        try:
+            await self.sessions.revoke_all(str(current_user.id))
+        except (CacheManagerError, RedisError):
+            raise self._sessions_unavailable()
+
+    @staticmethod
+    def _sessions_unavailable():
+        return http_errors.service_unavailable("Session store unavailable, try again later")
@@ -1,53 +1,66 @@
-import logging
 from typing import Union
 from uuid import UUID
 
-from fastapi_cache import FastAPICache
+from fastapi import HTTPException
+from fastapi import status
 from pydantic import BaseModel
 
 from app.core.cache import CacheManager
+from app.core.cache_keys import cache_keys
+from app.core.exceptions import http_errors
+from app.core.negative_cache import negative_cache
 from app.core.telemetry import instrument
 from app.repository.base_repository import BaseRepository
 from app.schemas.base_schema import FindBase
 
-logger = logging.getLogger(__name__)
 
-
-@instrument(pyroscope_tagging=True)
+@instrument(pyroscope_tagging=True, record_metrics=True)
 class BaseService:
     def __init__(self, repository: BaseRepository, cache: CacheManager) -> None:
         self._repository = repository
         self._cache = cache
 
-    async def invalidate_cache(self, id: Union[UUID, int]) -> None:
-        cache_key = f"{self.__class__.__name__}:{id}"
-        try:
-            backend = FastAPICache.get_backend()
-            await backend.clear(key=cache_key)
-        except Exception:
-            logger.warning(
-                "Failed to invalidate cache key '%s'",
-                cache_key,
-                exc_info=True,
-            )
+    @property
+    def cache_namespace(self) -> str:
+        # cached reads are keyed by resource, so every service writing users invalidates the same entries
+        return self._repository.model.__name__
+
+    async def invalidate_cache(self, *ids: Union[UUID, int]) -> None:
+        await cache_keys.invalidate(self.cache_namespace, *ids)
 
     async def get_list(self, schema: FindBase, **kwargs):
         return await self._repository.read_by_options(schema, **kwargs)
 
     async def get_by_id(self, id: Union[UUID, int], **kwargs):
-        return await self._repository.read_by_id(id, **kwargs)
+        namespace = self.cache_namespace
+        if await negative_cache.is_missing(namespace, id):
+            raise http_errors.not_found(detail=f"Resource with id={id} not found")
+        try:
+            resource = await self._repository.read_by_id(id, **kwargs)
+        except HTTPException as error:
+            if error.status_code == status.HTTP_404_NOT_FOUND:
+                await negative_cache.remember(namespace, id)
+            raise
+        negative_cache.found(namespace, id)
+        return resource
 
+    # invalidations follow the commit, a read in between would cache the former row again
     async def add(self, schema: BaseModel, **kwargs):
-        return await self._repository.create(schema, **kwargs)
+        created = await self._repository.create(schema, **kwargs)
+        await self.invalidate_cache(created.id)
+        return created
 
     async def patch(self, id: Union[UUID, int], schema: BaseModel, **kwargs):
+        updated = await self._repository.update(id, schema, **kwargs)
         await self.invalidate_cache(id)
-        return await self._repository.update(id, schema, **kwargs)
+        return updated
 
     async def patch_attr(self, id: Union[UUID, int], attr: str, value, **kwargs):
+        updated = await self._repository.update_attr(id, attr, value, **kwargs)
         await self.invalidate_cache(id)
-        return await self._repository.update_attr(id, attr, value, **kwargs)
+        return updated
 
     async def remove_by_id(self, id: Union[UUID, int], **kwargs):
+        removed = await self._repository.delete_by_id(id, **kwargs)
         await self.invalidate_cache(id)
-        return await self._repository.delete_by_id(id, **kwargs)
+        return removed
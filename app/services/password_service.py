@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from datetime import timezone
+from typing import List
+from typing import Optional
+
+import httpx
+from fastapi import HTTPException
+from tenacity import before_sleep_log
+from tenacity import retry
+from tenacity import retry_if_exception_type
+from tenacity import stop_after_attempt
+from tenacity import wait_exponential
+
+from app.core.batching import MicroBatcher
+from app.core.exceptions import http_errors
+from app.core.password_generator import generate_password
+from app.core.password_pool import PasswordPool
+from app.core.resilience import CircuitBreaker
+from app.core.resilience import CircuitBreakerOpenError
+from app.core.resilience import hedged
+from app.core.resilience import LatencyTracker
+from app.core.settings import settings
+from app.core.telemetry import instrument
+from app.core.telemetry import logger
+
+# shared by every PasswordService of this worker
+password_api_breaker = CircuitBreaker(
+    "password_api",
+    failure_threshold=settings.PASSWORD_API_BREAKER_FAILURE_THRESHOLD,
+    recovery_timeout=settings.PASSWORD_API_BREAKER_RECOVERY_SECONDS,
+    failure_exceptions=(httpx.RequestError, httpx.HTTPStatusError),
+)
+password_api_latency = LatencyTracker(default=settings.PASSWORD_API_HEDGING_DEFAULT_DELAY_MS / 1000)
+password_batcher: MicroBatcher[str] = MicroBatcher(
+    "password_api",
+    max_wait=settings.PASSWORD_COALESCING_WINDOW_MS / 1000,
+    max_batch_size=settings.PASSWORD_COALESCING_MAX_BATCH,
+)
+
+
+@instrument(pyroscope_tagging=True, record_metrics=True)
+class PasswordService:
+    def __init__(
+        self, http_client: Optional[httpx.AsyncClient], pool: PasswordPool, engine: Optional[str] = None
+    ) -> None:
+        # None only with the local engine, which never calls the password API
+        self._http_client = http_client
+        self._pool = pool
+        self._engine = engine or settings.PASSWORD_ENGINE
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(min=1, max=5),
+        retry=retry_if_exception_type(httpx.RequestError),
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+        reraise=True,
+    )
+    async def fetch_passwords(self, quantity: int = 1) -> List[str]:
+        params = {
+            "password_length": settings.PASSWORD_LENGTH,
+            "quantity": quantity,
+            "has_punctuation": str(settings.PASSWORD_HAS_PUNCTUATION).lower(),
+        }
+        try:
+            response = await self._call_upstream(params)
+        except CircuitBreakerOpenError:
+            raise http_errors.service_unavailable("Password API unavailable, try again later")
+        except httpx.HTTPStatusError:
+            raise http_errors.bad_request("Error while fetching the API")
+        if response.status_code >= 400:
+            raise http_errors.bad_request("Error while fetching the API")
+        return response.json()["data"]
+
+    async def _call_upstream(self, params: dict) -> httpx.Response:
+        async def attempt() -> httpx.Response:
+            return await password_api_breaker.call(self._request_passwords, params)
+
+        if settings.PASSWORD_API_HEDGING_ENABLED:
+            return await hedged(attempt, password_api_latency.threshold, name="password_api")
+        return await attempt()
+
+    async def _request_passwords(self, params: dict) -> httpx.Response:
+        start = time.perf_counter()
+        response = await self._http_client.get(settings.PASSWORD_API_URL, params=params)
+        password_api_latency.observe(time.perf_counter() - start)
+        if response.status_code >= 500:
+            response.raise_for_status()
+        return response
+
+    async def fetch_password(self) -> str:
+        if settings.PASSWORD_COALESCING_ENABLED:
+            return await password_batcher.submit(self.fetch_passwords)
+        return (await self.fetch_passwords())[0]
+
+    def generate_password(self) -> str:
+        return generate_password(settings.PASSWORD_LENGTH, settings.PASSWORD_HAS_PUNCTUATION)
+
+    async def fetch_password_with_fallback(self) -> str:
+        try:
+            return await asyncio.wait_for(self.fetch_password(), timeout=settings.PASSWORD_UPSTREAM_BUDGET_MS / 1000)
+        except (asyncio.TimeoutError, httpx.HTTPError, HTTPException):
+            logger.warning("Password API failed or exceeded its latency budget, generating the password locally")
+            return self.generate_password()
+
+    async def get_password(self):
+        if self._engine == "local":
+            password = self.generate_password()
+        else:
+            password = await self._pool.pop()
+        if password is None:
+            if self._engine == "fallback":
+                password = await self.fetch_password_with_fallback()
+            else:
+                password = await self.fetch_password()
+
+        return {
+            "status": "ok",
+            "password": password,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
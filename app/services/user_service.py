@@ -1,23 +1,52 @@
+from typing import Union
+from uuid import UUID
+
+from pydantic import BaseModel
+
 from app.core.cache import CacheManager
 from app.core.security import get_password_hash
 from app.core.telemetry import instrument
+from app.core.token_version import token_versions
 from app.repository.user_repository import UserRepository
+from app.schemas.base_schema import FindBase
 from app.schemas.user_schema import BaseUserWithPassword
+from app.schemas.user_schema import User
 from app.services.base_service import BaseService
 
 
-@instrument(pyroscope_tagging=True)
+@instrument(pyroscope_tagging=True, record_metrics=True)
 class UserService(BaseService):
     def __init__(self, user_repository: UserRepository, cache: CacheManager) -> None:
         self.user_repository = user_repository
         super().__init__(user_repository, cache)
 
+    async def get_list(self, schema: FindBase, **kwargs):
+        # only the columns of the response schema, read as plain rows
+        return await super().get_list(schema, columns=list(User.model_fields), **kwargs)
+
     async def add(self, user_schema: BaseUserWithPassword):  # type: ignore
         user_schema.password = get_password_hash(user_schema.password)
         created_user = await self._repository.create(user_schema)
+        await self.invalidate_cache(created_user.id)
         delattr(created_user, "password")
         return created_user
 
+    # the user's tokens carry its claims, outdate them on every change
+    async def patch(self, id: Union[UUID, int], schema: BaseModel, **kwargs):
+        user = await super().patch(id, schema, **kwargs)
+        await token_versions.bump(id)
+        return user
+
+    async def patch_attr(self, id: Union[UUID, int], attr: str, value, **kwargs):
+        user = await super().patch_attr(id, attr, value, **kwargs)
+        await token_versions.bump(id)
+        return user
+
+    async def remove_by_id(self, id: Union[UUID, int], **kwargs):
+        result = await super().remove_by_id(id, **kwargs)
+        await token_versions.bump(id)
+        return result
+
     # will come here later, but for now only admin can touch this method
     # async def remove_by_id(self, id: Union[UUID, int], current_user: UserModel):
     #     return await self._repository.delete_by_id(id)
@@ -0,0 +1,69 @@
+"""Per-call overhead of the ``instrument`` decorator.
+
+Run with ``python -m benchmarks.instrument_overhead``.
+"""
+
+import asyncio
+import time
+
+from opentelemetry import metrics
+from opentelemetry import trace
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF
+
+from app.core.telemetry import instrument
+from app.core.telemetry import TracingDecoratorOptions
+
+ITERATIONS = 50_000
+
+metrics.set_meter_provider(MeterProvider(metric_readers=[InMemoryMetricReader()]))
+tracer_provider = TracerProvider()
+tracer = tracer_provider.get_tracer(__name__)
+unsampled_tracer = TracerProvider(sampler=ALWAYS_OFF).get_tracer(__name__)
+
+
+def make_target():
+    # a fresh function per variant, instrument() skips functions it already decorated
+    async def target():
+        return None
+
+    return target
+
+
+bare = make_target()
+variants = {
+    "instrument": instrument(existing_tracer=tracer)(make_target()),
+    "instrument + pyroscope tags": instrument(existing_tracer=tracer, pyroscope_tagging=True)(make_target()),
+    "instrument sample_rate=0.1": instrument(existing_tracer=tracer, sample_rate=0.1)(make_target()),
+    "instrument skip_unsampled_parent": instrument(existing_tracer=tracer, skip_unsampled_parent=True)(make_target()),
+    "metrics only (sample_rate=0)": instrument(sample_rate=0.0, record_metrics=True)(make_target()),
+}
+
+
+async def measure(func) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        await func()
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+
+async def main():
+    # the parent span is not sampled, which is what skip_unsampled_parent reacts to
+    with unsampled_tracer.start_as_current_span("parent"):
+        assert not trace.get_current_span().get_span_context().trace_flags.sampled
+        bare_cost = await measure(bare)
+        print(f"{'bare':<36} {bare_cost:8.2f} us/call")
+        for label, func in variants.items():
+            cost = await measure(func)
+            print(f"{label:<36} {cost:8.2f} us/call  (+{cost - bare_cost:.2f} us)")
+
+        # OTEL_INSTRUMENT_RECORD_METRICS=false
+        TracingDecoratorOptions.set_record_metrics(False)
+        cost = await measure(variants["metrics only (sample_rate=0)"])
+        print(f"{'metrics switched off (sample_rate=0)':<36} {cost:8.2f} us/call  (+{cost - bare_cost:.2f} us)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
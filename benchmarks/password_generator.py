@@ -0,0 +1,32 @@
+"""Latency of the local password engine compared with the budget given to the upstream API.
+
+Run with ``python -m benchmarks.password_generator``.
+"""
+
+import statistics
+import time
+
+from app.core.password_generator import generate_password
+from app.core.settings import settings
+
+ITERATIONS = 100_000
+
+
+def main():
+    samples = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter_ns()
+        generate_password(settings.PASSWORD_LENGTH, settings.PASSWORD_HAS_PUNCTUATION)
+        samples.append((time.perf_counter_ns() - start) / 1000)
+
+    percentiles = statistics.quantiles(samples, n=1000)
+    print(f"generate_password(length={settings.PASSWORD_LENGTH}), {ITERATIONS} calls")
+    print(f"  p50   {statistics.median(samples):8.2f} us")
+    print(f"  p99   {percentiles[989]:8.2f} us")
+    print(f"  p99.9 {percentiles[998]:8.2f} us")
+    print(f"  max   {max(samples):8.2f} us")
+    print(f"upstream budget before fallback: {settings.PASSWORD_UPSTREAM_BUDGET_MS} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Startup cost of the schemas and per-request cost of the token claims validation.
+
+Reports the import time of the schema modules in a fresh interpreter, the time to build the validator and serializer
+of each hot schema, and the claims validation done on every authenticated request. Run with
+``python -m benchmarks.schema_build``.
+"""
+
+import subprocess
+import sys
+import time
+from uuid import uuid4
+
+from pydantic import TypeAdapter
+
+from app.schemas.adapters import verified_payload_adapter
+from app.schemas.auth_schema import Payload
+from app.schemas.auth_schema import SignIn
+from app.schemas.auth_schema import VerifiedPayload
+from app.schemas.base_schema import FindBase
+from app.schemas.user_schema import FindUser
+from app.schemas.user_schema import FindUserResult
+from app.schemas.user_schema import OptionalUser
+from app.schemas.user_schema import User
+
+ITERATIONS = 20_000
+SCHEMA_MODULES = [
+    "app.schemas.base_schema",
+    "app.schemas.user_schema",
+    "app.schemas.auth_schema",
+    "app.schemas.adapters",
+]
+
+IMPORT_SCRIPT = f"""
+import time
+import app.core.exceptions, app.core.settings, app.models, email_validator, pydantic
+start = time.perf_counter()
+import {", ".join(SCHEMA_MODULES)}
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def build_time(build):
+    start = time.perf_counter()
+    build()
+    return (time.perf_counter() - start) * 1000
+
+
+def per_call(call):
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        call()
+    return (time.perf_counter() - start) / ITERATIONS * 1_000_000
+
+
+def main():
+    output = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT], capture_output=True, text=True, check=True)
+    print(f"schema modules import, dependencies preloaded: {float(output.stdout):.2f} ms")
+
+    print("validator and serializer build")
+    for model in (FindBase, User, FindUserResult, OptionalUser, FindUser, SignIn, Payload):
+        print(f"  {model.__name__:16} {build_time(lambda: model.model_rebuild(force=True)):7.2f} ms")
+    print(f"  {'TypeAdapter':16} {build_time(lambda: TypeAdapter(VerifiedPayload)):7.2f} ms")
+
+    claims = {"id": str(uuid4()), "email": "user@mail.com", "username": "user", "role": "ADMIN", "exp": 1, "jti": "x"}
+    print(f"token claims validation, {ITERATIONS} calls")
+    print(f"  Payload(**claims)                {per_call(lambda: Payload(**claims)):7.2f} us")
+    print(
+        f"  verified_payload_adapter         {per_call(lambda: verified_payload_adapter.validate_python(claims)):7.2f} us"
+    )
+
+
+if __name__ == "__main__":
+    main()
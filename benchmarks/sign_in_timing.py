@@ -0,0 +1,48 @@
+"""Latency and CPU of the two sign_in rejection paths: wrong password (bcrypt) and unknown email (timing envelope).
+
+Run with ``python -m benchmarks.sign_in_timing``.
+"""
+
+import asyncio
+import statistics
+import time
+
+from app.core.security import get_password_hash
+from app.core.security import verify_password
+from app.core.security import verify_password_timing
+
+ITERATIONS = 50
+
+
+def report(name, samples, cpu):
+    deciles = statistics.quantiles(samples, n=10)
+    print(f"{name}, {len(samples)} attempts")
+    print(f"  p10   {deciles[0]:8.2f} ms")
+    print(f"  p50   {statistics.median(samples):8.2f} ms")
+    print(f"  p90   {deciles[8]:8.2f} ms")
+    print(f"  mean  {statistics.mean(samples):8.2f} ms  (stdev {statistics.stdev(samples):.2f})")
+    print(f"  cpu   {cpu / len(samples) * 1000:8.3f} ms per attempt")
+
+
+async def main():
+    hashed_password = get_password_hash("correct password")
+
+    samples = []
+    cpu_start = time.process_time()
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        verify_password("wrong password", hashed_password)
+        samples.append((time.perf_counter() - start) * 1000)
+    report("known email, wrong password (bcrypt)", samples, time.process_time() - cpu_start)
+
+    samples = []
+    cpu_start = time.process_time()
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        await verify_password_timing.wait()
+        samples.append((time.perf_counter() - start) * 1000)
+    report("unknown email (timing envelope)", samples, time.process_time() - cpu_start)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
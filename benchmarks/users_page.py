@@ -0,0 +1,84 @@
+"""Serialization cost of a 1000-row ``GET /v1/users`` page, without the database.
+
+Compares the former path (``response_model`` validation and serialization, stdlib json), the same path with the orjson
+default response class, and the route's ``ModelResponse`` over rows copied without validation.
+
+Run with ``python -m benchmarks.users_page``.
+"""
+
+import asyncio
+import statistics
+import time
+from datetime import datetime
+from datetime import timezone
+from uuid import uuid4
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from app.core.responses import FastJSONResponse
+from app.core.responses import from_trusted_attributes
+from app.core.responses import ModelResponse
+from app.models import User
+from app.models.models_enums import UserRoles
+from app.schemas.base_schema import Metadata
+from app.schemas.user_schema import FindUserResult
+from app.schemas.user_schema import User as UserSchema
+
+ROWS = 1000
+ITERATIONS = 50
+
+
+def make_page():
+    users = []
+    for i in range(ROWS):
+        user = User(password="hashed", email=f"user{i}@mail.com", username=f"user{i}", role=UserRoles.BASE_USER)
+        user.id, user.created_at, user.updated_at = uuid4(), datetime.now(timezone.utc), datetime.now(timezone.utc)
+        users.append(user)
+    metadata = {"page": 1, "page_size": ROWS, "ordering": "-created_at", "total_count": ROWS}
+    return {"data": users, "metadata": metadata}
+
+
+def make_app(response_class, model_response):
+    page = make_page()
+    app = FastAPI(default_response_class=response_class)
+
+    @app.get("/v1/users", response_model=FindUserResult)
+    async def get_user_list():
+        if model_response:
+            return ModelResponse(
+                FindUserResult.model_construct(
+                    data=[from_trusted_attributes(UserSchema, row) for row in page["data"]],
+                    metadata=Metadata.model_validate(page["metadata"]),
+                )
+            )
+        return page
+
+    return app
+
+
+async def measure(app):
+    samples = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        for _ in range(ITERATIONS):
+            start = time.perf_counter()
+            response = await client.get("/v1/users")
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples, len(response.content)
+
+
+async def main():
+    cases = {
+        "response_model + stdlib json": make_app(JSONResponse, model_response=False),
+        "response_model + orjson": make_app(FastJSONResponse, model_response=False),
+        "ModelResponse": make_app(FastJSONResponse, model_response=True),
+    }
+    print(f"GET /v1/users, {ROWS} rows, {ITERATIONS} requests")
+    for name, app in cases.items():
+        samples, size = await measure(app)
+        print(f"  {name:30} p50 {statistics.median(samples):7.2f} ms  min {min(samples):7.2f} ms  ({size} bytes)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+"""CPU and memory of reading a 1000-row users page as ORM objects or as the read-only column rows.
+
+Uses an in-memory SQLite database, so it measures the ORM side only, not the driver or the network. Run with
+``python -m benchmarks.users_rows``.
+"""
+
+import statistics
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+from datetime import timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy import select
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.responses import from_trusted_attributes
+from app.models import User
+from app.schemas.user_schema import User as UserSchema
+
+ROWS = 1000
+ITERATIONS = 50
+COLUMNS = list(UserSchema.model_fields)
+
+
+def make_engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE users (id CHAR(32) PRIMARY KEY, created_at DATETIME, updated_at DATETIME, "
+                "password VARCHAR, email VARCHAR, username VARCHAR, role VARCHAR, is_active BOOLEAN)"
+            )
+        )
+        now = datetime.now(timezone.utc)
+        connection.execute(
+            text("INSERT INTO users VALUES (:id, :now, :now, 'hashed', :email, :username, 'BASE_USER', 1)"),
+            [
+                {"id": uuid.uuid4().hex, "now": now, "email": f"user{i}@mail.com", "username": f"user{i}"}
+                for i in range(ROWS)
+            ],
+        )
+    return engine
+
+
+def read_models(session):
+    return session.execute(select(User).order_by(User.created_at.desc())).scalars().all()
+
+
+def read_rows(session):
+    query = select(*(getattr(User, column) for column in COLUMNS)).order_by(User.created_at.desc())
+    return session.execute(query).all()
+
+
+def measure(engine, read):
+    samples = []
+    for _ in range(ITERATIONS):
+        # a session per request, as in the app, so the identity map starts empty
+        with Session(engine) as session:
+            start = time.perf_counter()
+            page = [from_trusted_attributes(UserSchema, row) for row in read(session)]
+            samples.append((time.perf_counter() - start) * 1000)
+
+    with Session(engine) as session:
+        tracemalloc.start()
+        rows = read(session)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    assert len(rows) == len(page) == ROWS
+    return statistics.median(samples), peak / ROWS
+
+
+def main():
+    engine = make_engine()
+    print(f"users page, {ROWS} rows, {ITERATIONS} reads, up to the response schema")
+    for name, read in (("ORM models", read_models), ("column rows", read_rows)):
+        cpu, memory = measure(engine, read)
+        print(f"  {name:12} p50 {cpu:7.2f} ms  peak {memory:7.0f} bytes per row")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,10 @@
 from typing import AsyncGenerator
+from typing import Callable
 from typing import Dict
 from typing import Generator
 from typing import List
 from typing import Optional
 from typing import Union
-from unittest.mock import patch
 from uuid import UUID
 from uuid import uuid4
 
@@ -13,6 +13,9 @@ from fastapi_cache import FastAPICache
 from fastapi_cache.backends.inmemory import InMemoryBackend
 from httpx import ASGITransport
 from httpx import AsyncClient
+from httpx import MockTransport
+from httpx import Request
+from httpx import Response
 from sqlalchemy import create_engine
 from sqlalchemy import event
 from sqlalchemy import text
@@ -23,6 +26,8 @@ from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import Session
 from sqlalchemy.orm import SessionTransaction
 
+from app.core.http_client import get_http_client
+from app.core.http_client import get_optional_http_client
 from app.core.settings import settings
 from app.main import app
 from app.models import Base
@@ -98,14 +103,23 @@ async def client() -> AsyncGenerator:
 
 
 @pytest.fixture
-def mock_http_client():
-    """Fixture para mockar o cliente HTTP global nos testes."""
-    with patch("app.core.http_client.get_http_client") as mock_get_client:
-        from unittest.mock import AsyncMock
+def upstream_handler() -> Callable[[Request], Response]:
+    def handler(request: Request) -> Response:
+        quantity = int(request.url.params.get("quantity", 1))
+        return Response(200, json={"data": [f"password-{count}" for count in range(quantity)]})
 
-        mock_client = AsyncMock()
-        mock_get_client.return_value = mock_client
+    return handler
+
+
+@pytest.fixture
+async def mock_http_client(upstream_handler) -> AsyncGenerator:
+    """Fixture que injeta nas rotas um http_client com MockTransport, usando o handler de upstream_handler."""
+    async with AsyncClient(transport=MockTransport(upstream_handler)) as mock_client:
+        for dependency in (get_http_client, get_optional_http_client):
+            app.dependency_overrides[dependency] = lambda: mock_client
         yield mock_client
+        for dependency in (get_http_client, get_optional_http_client):
+            app.dependency_overrides.pop(dependency, None)
 
 
 @pytest.fixture(autouse=True, scope="session")
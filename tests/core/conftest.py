@@ -0,0 +1,60 @@
+from typing import Any
+from typing import List
+from typing import Optional
+
+import fakeredis
+import pytest
+
+from app.core.cache import CacheManager
+
+
+class FakeUserRepository:
+    """Users kept in a list, recording the lookups that reach the "database"."""
+
+    def __init__(self) -> None:
+        self.users: List[Any] = []
+        self.queries: List[Any] = []
+
+    async def read_by_email(self, email: str, unique: bool = False) -> List[Any]:
+        self.queries.append(email)
+        return [user for user in self.users if user.email == email]
+
+    async def read_by_ids(self, ids: List[Any]) -> List[Any]:
+        self.queries.append(sorted(ids))
+        return [user for user in self.users if user.id in ids]
+
+
+class FakeRedis(fakeredis.FakeAsyncRedis):
+    """In-process Redis running the Lua scripts as Redis would, with its own server per test.
+
+    Records the name of every command sent outside a pipeline and raises ``error`` from them when set.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, server=fakeredis.FakeServer(), **kwargs)
+        self.commands: List[str] = []
+        self.error: Optional[Exception] = None
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        self.commands.append(args[0])
+        if self.error:
+            raise self.error
+        return await super().execute_command(*args, **options)
+
+
+@pytest.fixture
+def user_repository() -> FakeUserRepository:
+    return FakeUserRepository()
+
+
+@pytest.fixture
+def redis() -> FakeRedis:
+    return FakeRedis()
+
+
+@pytest.fixture
+def cache(redis: FakeRedis) -> CacheManager:
+    """CacheManager connected to ``redis``, closing it leaves the cache uninitialized"""
+    cache = CacheManager()
+    cache._redis_connection = redis
+    return cache
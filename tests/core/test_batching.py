@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from app.core.batching import MicroBatcher
+
+
+class UpstreamError(Exception):
+    pass
+
+
+@pytest.mark.asyncio
+async def test_concurrent_submits_share_one_fetch():
+    calls = []
+
+    async def fetch(quantity):
+        calls.append(quantity)
+        return [f"password-{i}" for i in range(quantity)]
+
+    batcher = MicroBatcher("test", max_wait=0.01)
+    results = await asyncio.gather(*(batcher.submit(fetch) for _ in range(5)))
+
+    assert calls == [5]
+    assert sorted(results) == [f"password-{i}" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_batch_flushes_at_max_batch_size():
+    calls = []
+
+    async def fetch(quantity):
+        calls.append(quantity)
+        return ["password"] * quantity
+
+    batcher = MicroBatcher("test", max_wait=60, max_batch_size=3)
+    await asyncio.wait_for(asyncio.gather(*(batcher.submit(fetch) for _ in range(6))), timeout=1)
+
+    assert calls == [3, 3]
+
+
+@pytest.mark.asyncio
+async def test_fetch_error_reaches_every_caller():
+    async def fetch(quantity):
+        raise UpstreamError()
+
+    batcher = MicroBatcher("test", max_wait=0.01)
+    results = await asyncio.gather(*(batcher.submit(fetch) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, UpstreamError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_short_result_fails_remaining_callers():
+    async def fetch(quantity):
+        return ["password"]
+
+    batcher = MicroBatcher("test", max_wait=0.01)
+    results = await asyncio.gather(*(batcher.submit(fetch) for _ in range(2)), return_exceptions=True)
+
+    assert results[0] == "password"
+    assert isinstance(results[1], RuntimeError)
@@ -0,0 +1,139 @@
+import random
+from types import SimpleNamespace
+from uuid import UUID
+from uuid import uuid4
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.backends.redis import RedisBackend
+from fastapi_cache.decorator import cache
+from pydantic import BaseModel
+
+from app.core.cache_keys import CacheKeys
+from app.core.cache_keys import cache_keys
+from app.core.exceptions import http_errors
+from app.core.list_cache import list_cache
+from app.core.negative_cache import negative_cache
+from app.core.settings import settings
+from app.services.base_service import BaseService
+
+
+class Thing(BaseModel):
+    name: str
+
+
+class ThingRepository:
+    """In-memory rows, the source of truth the cached reads are checked against."""
+
+    model = Thing
+
+    def __init__(self):
+        self.rows = {}
+
+    async def read_by_id(self, id):
+        if id not in self.rows:
+            raise http_errors.not_found(detail=f"Resource with id={id} not found")
+        return self.rows[id]
+
+    async def create(self, schema):
+        row = {"id": str(uuid4()), **schema.model_dump()}
+        self.rows[UUID(row["id"])] = row
+        return SimpleNamespace(**row)
+
+    async def update(self, id, schema):
+        row = await self.read_by_id(id)
+        row.update(schema.model_dump())
+        return row
+
+    async def delete_by_id(self, id):
+        await self.read_by_id(id)
+        del self.rows[id]
+
+
+class ThingService(BaseService):
+    pass
+
+
+class ThingAdminService(BaseService):
+    """A second service writing the same resource, as AuthService writes users."""
+
+
+@pytest.fixture
+def harness():
+    FastAPICache.init(InMemoryBackend(), cache_status_header=settings.CACHE_STATUS_HEADER, expire=360)
+    repository = ThingRepository()
+    service = ThingService(repository, None)
+    app = FastAPI()
+
+    @app.get("/things/{id}")
+    @cache(key_builder=cache_keys.key_builder(Thing.__name__, "id"))
+    async def get_thing(id: UUID):
+        return await service.get_by_id(id)
+
+    return app, repository, service
+
+
+@pytest.mark.asyncio
+async def test_cached_reads_never_outlive_writes(harness):
+    app, repository, reading_service = harness
+    writers = [reading_service, ThingAdminService(repository, None)]
+    rng = random.Random(7)
+    known_ids = [UUID((await reading_service.add(Thing(name="initial"))).id) for _ in range(3)]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for step in range(300):
+            id = rng.choice(known_ids)
+            operation = rng.choice(["read", "read", "read", "update", "delete", "add"])
+            service = rng.choice(writers)
+            if operation == "update" and id in repository.rows:
+                await service.patch(id, Thing(name=f"name-{step}"))
+            elif operation == "delete" and id in repository.rows:
+                await service.remove_by_id(id)
+            elif operation == "add":
+                known_ids.append(UUID((await service.add(Thing(name=f"added-{step}"))).id))
+            else:
+                response = await client.get(f"/things/{id}")
+                if id in repository.rows:
+                    assert response.status_code == 200
+                    assert response.json() == repository.rows[id], f"stale read at step {step}"
+                else:
+                    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_route_and_service_share_the_key(harness):
+    app, repository, service = harness
+    id = UUID((await service.add(Thing(name="thing"))).id)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get(f"/things/{id}")
+
+    backend = FastAPICache.get_backend()
+    assert await backend.get(cache_keys.by_id("Thing", id)) is not None
+    assert cache_keys.by_id("Thing", str(id).upper()) == cache_keys.by_id("Thing", id)
+
+    # a write through another service drops the entry the route read
+    await ThingAdminService(repository, None).patch(id, Thing(name="renamed"))
+    assert await backend.get(cache_keys.by_id("Thing", id)) is None
+
+
+@pytest.mark.asyncio
+async def test_redis_invalidations_share_one_transaction(cache, redis, monkeypatch):
+    monkeypatch.setattr(FastAPICache, "_backend", RedisBackend(redis))
+    id = uuid4()
+    keys = ["test:Thing:" + str(id), negative_cache.key("Thing", id)]
+    for key in keys:
+        await redis.set(key, b"cached")
+    redis.commands.clear()
+
+    await CacheKeys(cache, prefix="test").invalidate("Thing", id)
+
+    # sent as one MULTI/EXEC pipeline, no command on its own
+    assert redis.commands == []
+    assert await redis.exists(*keys) == 0
+    assert await redis.get(list_cache.generation_key("Thing")) == b"1"
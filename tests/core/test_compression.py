@@ -0,0 +1,97 @@
+import gzip
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi import Response
+
+from app.core.compression import Compressor
+from app.core.middleware import CompressionMiddleware
+from app.core.settings import settings
+
+BODY = b'{"data": "' + b"x" * 4096 + b'"}'
+
+
+class CountingCompressor(Compressor):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.encoders = {"gzip": self.count(self.encoders["gzip"])}
+        self.calls = 0
+
+    def count(self, encoder):
+        def wrapper(body):
+            self.calls += 1
+            return encoder(body)
+
+        return wrapper
+
+
+def make_app(compressor):
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, compressor=compressor, config=settings)
+
+    @app.get("/large")
+    async def large():
+        return Response(BODY, media_type="application/json", headers={"ETag": 'W/"v1"'})
+
+    @app.get("/small")
+    async def small():
+        return {"detail": "ok"}
+
+    return app
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip, deflate", "gzip"),
+        ("gzip;q=0", None),
+        ("*", "gzip"),
+        ("identity", None),
+        ("", None),
+        ("deflate, GZIP;q=0.5", "gzip"),
+    ],
+)
+def test_negotiate(accept_encoding, expected):
+    compressor = Compressor()
+    compressor.encoders.pop("br", None)
+
+    assert compressor.negotiate(accept_encoding) == expected
+
+
+@pytest.mark.asyncio
+async def test_compresses_large_responses_once_per_version():
+    compressor = CountingCompressor()
+    transport = httpx.ASGITransport(app=make_app(compressor))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.get("/large", headers={"Accept-Encoding": "gzip"})
+        second = await client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    for response in (first, second):
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert response.headers["etag"] == 'W/"v1"'
+        assert response.content == BODY
+    assert compressor.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_skips_small_and_unaccepted_responses():
+    compressor = CountingCompressor()
+    transport = httpx.ASGITransport(app=make_app(compressor))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        small = await client.get("/small", headers={"Accept-Encoding": "gzip"})
+        identity = await client.get("/large", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in small.headers
+    assert small.json() == {"detail": "ok"}
+    assert "content-encoding" not in identity.headers
+    assert identity.content == BODY
+    assert compressor.calls == 0
+
+
+def test_gzip_output_is_deterministic():
+    compressor = Compressor()
+
+    assert compressor.compress(BODY, "gzip") == compressor.compress(BODY, "gzip")
+    assert gzip.decompress(compressor.compress(BODY, "gzip")) == BODY
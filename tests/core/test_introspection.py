@@ -0,0 +1,60 @@
+from datetime import timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.core.security import create_access_token
+from app.core.token_version import TokenVersions
+from app.models.models_enums import UserRoles
+from app.services import auth_service
+from app.services.auth_service import AuthService
+
+
+def make_user(is_active=True):
+    return SimpleNamespace(id=uuid4(), role=UserRoles.MODERATOR, is_active=is_active)
+
+
+def make_token(user, token_version=0):
+    claims = {"id": str(user.id), "email": "user@mail.com", "username": "user", "token_version": token_version}
+    token, _ = create_access_token(claims, timedelta(5))
+    return token
+
+
+@pytest.mark.asyncio
+async def test_introspect_batch_reads_users_once_and_caches_results(cache, user_repository):
+    active, inactive = make_user(), make_user(is_active=False)
+    user_repository.users += [active, inactive]
+    service = AuthService(user_repository, cache)
+    tokens = [make_token(active), make_token(inactive), "invalid"]
+
+    results = await service.introspect(tokens)
+
+    assert [result.active for result in results] == [True, False, False]
+    assert results[0].role == UserRoles.MODERATOR
+    assert results[1].is_active is False
+    assert user_repository.queries == [sorted([active.id, inactive.id])]
+
+    assert [result.active for result in await service.introspect(tokens)] == [True, False, False]
+    assert len(user_repository.queries) == 1
+
+
+@pytest.mark.asyncio
+async def test_introspect_checks_token_versions_of_cached_and_new_results(cache, redis, user_repository, monkeypatch):
+    versions = TokenVersions(cache, prefix="test")
+    monkeypatch.setattr(auth_service, "token_versions", versions)
+    user, other = make_user(), make_user()
+    user_repository.users += [user, other]
+    service = AuthService(user_repository, cache)
+    cached_token = make_token(user)
+    assert (await service.introspect([cached_token]))[0].active
+
+    await versions.bump(user.id)
+    redis.commands.clear()
+    results = await service.introspect([cached_token, make_token(user), make_token(user, 1), make_token(other)])
+
+    assert [result.active for result in results] == [False, False, True, True]
+    # one round trip for the cached results, one for the versions of the whole batch
+    assert redis.commands.count("MGET") == 2
+    # outdated tokens are answered without reading their user
+    assert user_repository.queries[-1] == sorted([user.id, other.id])
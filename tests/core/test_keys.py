@@ -0,0 +1,60 @@
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwt
+
+from app.core.keys import KeyRing
+
+
+def private_pem() -> str:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode("utf-8")
+
+
+@pytest.fixture(scope="module")
+def pems():
+    return {"old": private_pem(), "new": private_pem()}
+
+
+def sign(ring: KeyRing, claims: dict) -> str:
+    key, headers = ring.signing_key
+    return jwt.encode(claims, key, ring.algorithm, headers=headers)
+
+
+def test_key_ring_signs_with_active_kid_and_verifies_rotated_keys(pems):
+    old_ring = KeyRing("RS256", keys={"old": pems["old"]})
+    ring = KeyRing("RS256", keys=pems, active_kid="new")
+
+    old_token = sign(old_ring, {"id": "1"})
+    new_token = sign(ring, {"id": "2"})
+
+    assert jwt.get_unverified_header(new_token)["kid"] == "new"
+    assert jwt.decode(old_token, ring.verification_key(old_token), algorithms="RS256") == {"id": "1"}
+    assert jwt.decode(new_token, ring.verification_key(new_token), algorithms="RS256") == {"id": "2"}
+
+
+def test_key_ring_unknown_kid_has_no_key(pems):
+    token = sign(KeyRing("RS256", keys={"other": pems["old"]}), {"id": "1"})
+
+    assert KeyRing("RS256", keys={"new": pems["new"]}).verification_key(token) is None
+
+
+def test_jwks_publishes_only_public_keys(pems):
+    ring = KeyRing("RS256", keys=pems)
+
+    assert [key["kid"] for key in ring.jwks["keys"]] == ["old", "new"]
+    assert all(set(key) == {"alg", "kty", "n", "e", "kid", "use"} for key in ring.jwks["keys"])
+
+
+def test_missing_active_kid_raises(pems):
+    with pytest.raises(ValueError):
+        KeyRing("RS256", keys=pems, active_kid="missing")
+
+
+def test_hmac_key_ring_uses_secret():
+    ring = KeyRing("HS256", secret="secret")
+
+    assert ring.signing_key == ("secret", {})
+    assert ring.jwks == {"keys": []}
@@ -0,0 +1,62 @@
+import pytest
+from fastapi import Response
+
+from app.core.list_cache import ListCache
+from app.core.settings import settings
+from app.schemas.base_schema import FindBase
+
+
+@pytest.mark.asyncio
+async def test_pages_are_cached_per_normalized_query(cache, redis):
+    list_cache = ListCache(cache, prefix="test")
+
+    body, key = await list_cache.get("User", FindBase())
+    assert body is None
+    await list_cache.set(key, b"page")
+    assert 0 < await redis.ttl(key) <= list_cache.expire
+
+    assert await list_cache.get("User", FindBase(page=1, page_size="20")) == (b"page", key)
+    assert (await list_cache.get("User", FindBase(page=2)))[0] is None
+    assert (await list_cache.get("Thing", FindBase()))[0] is None
+
+
+@pytest.mark.asyncio
+async def test_invalidate_moves_the_namespace_to_a_new_generation(cache, redis):
+    list_cache = ListCache(cache, prefix="test")
+    _, key = await list_cache.get("User", FindBase())
+    await list_cache.set(key, b"page")
+
+    await list_cache.invalidate("User")
+
+    body, new_key = await list_cache.get("User", FindBase())
+    assert body is None
+    assert new_key != key
+    assert await redis.get(list_cache.generation_key("User")) == b"1"
+
+
+@pytest.mark.asyncio
+async def test_without_redis_nothing_is_cached(cache):
+    await cache.close()
+    list_cache = ListCache(cache)
+
+    assert await list_cache.get("User", FindBase()) == (None, None)
+    await list_cache.invalidate("User")
+
+
+@pytest.mark.asyncio
+async def test_cached_route_is_served_from_the_cache(cache):
+    list_cache = ListCache(cache, prefix="test")
+    calls = []
+
+    @list_cache.cached("User")
+    async def route(find_query):
+        calls.append(find_query)
+        return Response(b'{"data":[]}', media_type="application/json")
+
+    miss = await route(find_query=FindBase())
+    hit = await route(find_query=FindBase())
+
+    assert miss.headers[settings.CACHE_STATUS_HEADER] == "MISS"
+    assert hit.headers[settings.CACHE_STATUS_HEADER] == "HIT"
+    assert hit.body == miss.body
+    assert len(calls) == 1
@@ -0,0 +1,88 @@
+import pytest
+from fastapi import HTTPException
+
+from app.core.login_throttle import LoginThrottle
+from app.core.settings import settings
+from app.schemas.auth_schema import SignIn
+from app.services.auth_service import AuthService
+
+
+def make_throttle(cache):
+    return LoginThrottle(
+        cache,
+        max_account_failures=3,
+        max_ip_failures=5,
+        failure_window=60,
+        base_lockout=30,
+        max_lockout=100,
+        prefix="test",
+    )
+
+
+@pytest.mark.asyncio
+async def test_failures_lock_the_account_out_progressively(cache, redis):
+    throttle = make_throttle(cache)
+    lockouts = []
+    for _ in range(5):
+        await throttle.record_failure("User@Mail.com", "1.2.3.4")
+        lockouts.append(await throttle.retry_after("user@mail.com"))
+
+    assert lockouts == [0, 0, 30, 60, 100]
+    # the counter outlives the lockout, so the next failure keeps escalating
+    assert await redis.pttl("test:failures:account:user@mail.com") > 100000
+
+
+@pytest.mark.asyncio
+async def test_failures_from_one_ip_lock_it_out_for_every_account(cache):
+    throttle = make_throttle(cache)
+    for index in range(5):
+        await throttle.record_failure(f"user-{index}@mail.com", "1.2.3.4")
+
+    assert await throttle.retry_after("other@mail.com", "1.2.3.4") == 30
+    assert await throttle.retry_after("other@mail.com", "5.6.7.8") == 0
+
+
+@pytest.mark.asyncio
+async def test_success_clears_the_account_failures_but_not_the_ip_ones(cache, redis):
+    throttle = make_throttle(cache)
+    for _ in range(2):
+        await throttle.record_failure("user@mail.com", "1.2.3.4")
+
+    await throttle.record_success("user@mail.com")
+    await throttle.record_failure("user@mail.com", "1.2.3.4")
+
+    assert await throttle.retry_after("user@mail.com") == 0
+    assert await redis.get("test:failures:ip:1.2.3.4") == b"3"
+
+
+@pytest.mark.asyncio
+async def test_throttle_fails_open(cache, redis):
+    redis.error = ConnectionError()
+    assert await make_throttle(cache).retry_after("user@mail.com") == 0
+
+    await cache.close()
+    assert await make_throttle(cache).retry_after("user@mail.com") == 0
+
+
+@pytest.mark.asyncio
+async def test_locked_out_sign_in_skips_user_lookup(cache, redis, user_repository):
+    await redis.set(f"{settings.CACHE_PREFIX}:login:lock:ip:1.2.3.4", 1, px=30000)
+    service = AuthService(user_repository, cache)
+
+    with pytest.raises(HTTPException) as error:
+        await service.sign_in(SignIn(email="user@mail.com", password="password"), "1.2.3.4")
+
+    assert error.value.status_code == 429
+    assert error.value.headers == {"Retry-After": "30"}
+    assert user_repository.queries == []
+
+
+@pytest.mark.asyncio
+async def test_failed_sign_in_is_recorded(cache, redis, user_repository):
+    service = AuthService(user_repository, cache)
+
+    with pytest.raises(HTTPException):
+        await service.sign_in(SignIn(email="user@mail.com", password="password"), "1.2.3.4")
+
+    assert user_repository.queries == ["user@mail.com"]
+    assert await redis.get(f"{settings.CACHE_PREFIX}:login:failures:account:user@mail.com") == b"1"
@@ -0,0 +1,93 @@
+from uuid import uuid4
+
+import pytest
+
+from app.core.negative_cache import NegativeCache
+
+
+@pytest.mark.asyncio
+async def test_remembered_ids_are_served_from_the_local_lru(cache, redis):
+    negative_cache = NegativeCache(cache, prefix="test")
+    missing_id = uuid4()
+
+    assert not await negative_cache.is_missing("User", missing_id)
+    await negative_cache.remember("User", missing_id)
+
+    for _ in range(10):
+        assert await negative_cache.is_missing("User", missing_id)
+    assert not await negative_cache.is_missing("Thing", missing_id)
+    assert redis.commands.count("EXISTS") == 2
+    assert 0 < await redis.ttl(negative_cache.key("User", missing_id)) <= negative_cache.expire
+
+
+@pytest.mark.asyncio
+async def test_other_workers_read_redis_once_then_locally(cache, redis):
+    missing_id = uuid4()
+    await NegativeCache(cache, prefix="test").remember("User", missing_id)
+    other_worker = NegativeCache(cache, prefix="test")
+
+    assert await other_worker.is_missing("User", missing_id)
+    assert await other_worker.is_missing("User", missing_id)
+    assert redis.commands.count("EXISTS") == 1
+
+
+@pytest.mark.asyncio
+async def test_forget_and_expiry(cache, redis):
+    negative_cache = NegativeCache(cache, prefix="test", local_expire=0)
+    created_id = uuid4()
+    await negative_cache.remember("User", created_id)
+
+    negative_cache.forget("User", created_id)
+    assert not negative_cache._local
+    assert await negative_cache.is_missing("User", created_id)
+
+    await redis.delete(negative_cache.key("User", created_id))
+    assert not await negative_cache.is_missing("User", created_id)
+
+
+@pytest.mark.asyncio
+async def test_local_lru_is_bounded(cache):
+    negative_cache = NegativeCache(cache, prefix="test", local_size=2)
+    ids = [uuid4() for _ in range(3)]
+    for missing_id in ids:
+        await negative_cache.remember("User", missing_id)
+
+    assert list(negative_cache._local) == [negative_cache.key("User", missing_id) for missing_id in ids[1:]]
+
+
+@pytest.mark.asyncio
+async def test_without_redis_nothing_is_remembered(cache):
+    await cache.close()
+    negative_cache = NegativeCache(cache)
+    missing_id = uuid4()
+
+    await negative_cache.remember("User", missing_id)
+
+    assert not await negative_cache.is_missing("User", missing_id)
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_read_the_database(cache, redis):
+    redis.error = ConnectionError()
+    negative_cache = NegativeCache(cache, prefix="test")
+    missing_id = uuid4()
+
+    await negative_cache.remember("User", missing_id)
+    negative_cache.forget("User", missing_id)
+
+    assert not await negative_cache.is_missing("User", missing_id)
+
+
+@pytest.mark.asyncio
+async def test_found_ids_skip_the_redis_read(cache, redis):
+    negative_cache = NegativeCache(cache, prefix="test")
+    existing_id = uuid4()
+    negative_cache.found("User", existing_id)
+
+    for _ in range(10):
+        assert not await negative_cache.is_missing("User", existing_id)
+    assert redis.commands == []
+
+    # deleted since: the database 404 is remembered and wins over the found mark
+    await negative_cache.remember("User", existing_id)
+    assert await negative_cache.is_missing("User", existing_id)
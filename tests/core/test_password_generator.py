@@ -0,0 +1,28 @@
+import string
+
+import pytest
+
+from app.core.password_generator import generate_password
+
+
+@pytest.mark.parametrize("password_length", [4, 12, 64])
+def test_generate_password_with_punctuation(password_length):
+    password = generate_password(password_length, has_punctuation=True)
+
+    assert len(password) == password_length
+    assert any(char in string.ascii_lowercase for char in password)
+    assert any(char in string.ascii_uppercase for char in password)
+    assert any(char in string.digits for char in password)
+    assert any(char in string.punctuation for char in password)
+
+
+def test_generate_password_without_punctuation():
+    passwords = [generate_password(32, has_punctuation=False) for _ in range(50)]
+
+    assert all(char.isalnum() for password in passwords for char in password)
+    assert len(set(passwords)) == len(passwords)
+
+
+def test_generate_password_too_short_raises():
+    with pytest.raises(ValueError):
+        generate_password(3, has_punctuation=True)
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from app.core.password_pool import PasswordPool
+
+
+class FakeFetcher:
+    def __init__(self):
+        self.quantities = []
+
+    async def __call__(self, quantity):
+        self.quantities.append(quantity)
+        return [f"password-{len(self.quantities)}-{count}" for count in range(quantity)]
+
+
+async def wait_for_depth(pool: PasswordPool, depth: int):
+    for _ in range(100):
+        if pool.depth >= depth:
+            return
+        await asyncio.sleep(0)
+    raise AssertionError(f"pool depth stayed at {pool.depth}")
+
+
+@pytest.mark.asyncio
+async def test_password_pool_not_started_returns_none():
+    pool = PasswordPool()
+
+    assert await pool.pop() is None
+
+
+@pytest.mark.asyncio
+async def test_password_pool_fills_in_batches_and_pops_in_order():
+    fetcher = FakeFetcher()
+    pool = PasswordPool()
+    pool.init(fetcher, size=10, low_watermark=3, batch_size=4)
+    await pool.start()
+    try:
+        await wait_for_depth(pool, 10)
+
+        assert fetcher.quantities == [4, 4, 2]
+        assert await pool.pop() == "password-1-0"
+        assert pool.depth == 9
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_password_pool_refills_below_low_watermark():
+    fetcher = FakeFetcher()
+    pool = PasswordPool()
+    pool.init(fetcher, size=5, low_watermark=2, batch_size=5)
+    await pool.start()
+    try:
+        await wait_for_depth(pool, 5)
+        for _ in range(2):
+            await pool.pop()
+        await asyncio.sleep(0)
+        assert fetcher.quantities == [5]
+
+        await pool.pop()
+        await wait_for_depth(pool, 5)
+        assert fetcher.quantities == [5, 3]
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_password_pool_retries_failed_refill():
+    calls = []
+
+    async def flaky_fetcher(quantity):
+        calls.append(quantity)
+        if len(calls) == 1:
+            raise RuntimeError("upstream down")
+        return ["password"] * quantity
+
+    pool = PasswordPool()
+    pool.init(flaky_fetcher, size=2, low_watermark=0, batch_size=2, retry_delay=0)
+    await pool.start()
+    try:
+        await wait_for_depth(pool, 2)
+        assert calls == [2, 2]
+    finally:
+        await pool.close()
@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.permissions import PermissionMatrix
+from app.core.permissions import permissions
+from app.core.permissions import UserPolicies
+from app.models.models_enums import UserRoles
+
+
+def test_policies_compile_to_role_bitmasks():
+    matrix = PermissionMatrix()
+    read = matrix.policy("read", [UserRoles.BASE_USER, UserRoles.ADMIN])
+    delete = matrix.policy("delete", [UserRoles.ADMIN])
+
+    assert read.mask != delete.mask
+    assert matrix.allows(UserRoles.ADMIN, read) and matrix.allows(UserRoles.ADMIN, delete)
+    assert matrix.allows(UserRoles.BASE_USER, read)
+    assert not matrix.allows(UserRoles.BASE_USER, delete)
+    assert not matrix.allows(UserRoles.GUEST, read)
+
+
+def test_policy_names_are_unique():
+    matrix = PermissionMatrix()
+    matrix.policy("read", [UserRoles.ADMIN])
+
+    with pytest.raises(ValueError):
+        matrix.policy("read", [UserRoles.BASE_USER])
+
+
+def test_compile_reuses_the_policy_of_the_same_rule():
+    matrix = PermissionMatrix()
+
+    policy = matrix.compile([UserRoles.MODERATOR, UserRoles.ADMIN], allow_same_id=True)
+
+    assert matrix.compile([UserRoles.ADMIN, UserRoles.MODERATOR], allow_same_id=True) is policy
+    assert matrix.compile([UserRoles.ADMIN, UserRoles.MODERATOR]) is not policy
+
+
+def test_same_id_rule_lets_users_reach_their_own_resource():
+    user = SimpleNamespace(role=UserRoles.BASE_USER, id="user-id")
+
+    assert permissions.check(UserPolicies.UPDATE, user, "user-id")
+    assert not permissions.check(UserPolicies.UPDATE, user, "other-id")
+    assert not permissions.check(UserPolicies.DELETE, user, "user-id")
+
+
+def test_inactive_users_are_granted_nothing():
+    user = SimpleNamespace(role=UserRoles.ADMIN, id="user-id", is_active=False)
+
+    assert not permissions.check(UserPolicies.READ, user, "other-id")
+    assert not permissions.check(UserPolicies.UPDATE, user, "user-id")
@@ -0,0 +1,166 @@
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport
+from httpx import AsyncClient
+from jose import jwt
+
+from app.core import rate_limit
+from app.core.middleware import RateLimitMiddleware
+from app.core.rate_limit import Rate
+from app.core.rate_limit import RateLimiter
+from app.core.rate_limit import RateLimitRule
+from app.core.rate_limit import SLIDING_WINDOW_SCRIPT
+from app.core.rate_limit import TokenBucket
+from app.core.security import create_access_token
+from app.core.settings import settings
+
+
+def test_rate_parse():
+    assert Rate.parse("10/60") == Rate(10, 60.0)
+    with pytest.raises(ValueError):
+        Rate.parse("0/60")
+
+
+def test_token_bucket_rejects_when_empty_and_refills(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    bucket = TokenBucket()
+    rate = Rate(2, 10)
+
+    assert [bucket.consume("key", rate) for _ in range(3)] == [True, True, False]
+    now[0] += 5
+    assert bucket.consume("key", rate)
+
+
+def test_token_bucket_drops_least_recently_used_keys():
+    bucket = TokenBucket(max_keys=2)
+    rate = Rate(1, 60)
+    for key in ("a", "b", "c"):
+        bucket.consume(key, rate)
+
+    assert bucket.consume("a", rate)
+
+
+async def hit_window(cache, keys, now_ms, *rates):
+    args = [now_ms, uuid4().hex]
+    for limit, window_ms in rates:
+        args += [limit, window_ms]
+    return await cache.run_script(SLIDING_WINDOW_SCRIPT, keys, args)
+
+
+@pytest.mark.asyncio
+async def test_sliding_window_admits_the_limit_then_rejects_until_the_window_slides(cache, redis):
+    results = [await hit_window(cache, ["key"], 1000 + step, (3, 10000)) for step in range(4)]
+
+    assert results == [[1, 3, 2, 10000], [1, 3, 1, 9999], [1, 3, 0, 9998], [0, 3, 0, 9997]]
+    assert await redis.zcard("key") == 3
+    assert 0 < await redis.pttl("key") <= 10000
+    # the oldest request leaves the window 10 s after it was counted
+    assert await hit_window(cache, ["key"], 11000, (3, 10000)) == [1, 3, 0, 1]
+
+
+@pytest.mark.asyncio
+async def test_sliding_window_rejection_consumes_no_rule_and_reports_the_most_restrictive(cache, redis):
+    assert await hit_window(cache, ["loose", "strict"], 1000, (10, 60000), (1, 5000)) == [1, 1, 0, 5000]
+
+    assert await hit_window(cache, ["loose", "strict"], 2000, (10, 60000), (1, 5000)) == [0, 1, 0, 4000]
+    assert await redis.zcard("loose") == 1
+    assert await hit_window(cache, ["loose"], 3000, (10, 60000)) == [1, 10, 8, 58000]
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_sheds_locally_without_reaching_redis(cache, redis):
+    limiter = RateLimiter(cache)
+    rules = [RateLimitRule("ip", "1.1.1.1", Rate(1, 60))]
+
+    assert (await limiter.hit(rules)).allowed
+    result = await limiter.hit(rules)
+
+    assert not result.allowed
+    assert await redis.zcard("rate-limit:ip:1.1.1.1") == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_fails_open_when_redis_errors(cache, redis):
+    redis.error = ConnectionError()
+    limiter = RateLimiter(cache)
+
+    assert await limiter.hit([RateLimitRule("ip", "1.1.1.1", Rate(10, 60))]) is None
+
+
+def build_app(cache, trusted_proxies=("127.0.0.1",)) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/v1/auth/sign-in")
+    async def sign_in():
+        return {"status": "ok"}
+
+    # httpx's ASGITransport connects from 127.0.0.1
+    config = settings.model_copy(
+        update={"RATE_LIMIT_ROUTES": {"POST /v1/auth/sign-in": "5/60"}, "TRUSTED_PROXIES": list(trusted_proxies)}
+    )
+    app.add_middleware(RateLimitMiddleware, limiter=RateLimiter(cache, prefix="test"), config=config)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_middleware_keys_ip_and_route_and_sets_headers(cache, redis):
+    async with AsyncClient(transport=ASGITransport(app=build_app(cache)), base_url="https://test") as client:
+        response = await client.post("/v1/auth/sign-in", headers={"cf-connecting-ip": "1.2.3.4"})
+
+    assert response.status_code == 200
+    assert response.headers["RateLimit-Limit"] == "5"
+    assert response.headers["RateLimit-Remaining"] == "4"
+    assert response.headers["RateLimit-Reset"] == "60"
+    assert sorted(await redis.keys("test:*")) == [b"test:ip:1.2.3.4", b"test:route:POST /v1/auth/sign-in:1.2.3.4"]
+
+
+@pytest.mark.asyncio
+async def test_middleware_ignores_proxy_headers_from_untrusted_peers(cache, redis):
+    app = build_app(cache, trusted_proxies=("10.0.0.0/8",))
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="https://test") as client:
+        await client.post("/v1/auth/sign-in", headers={"cf-connecting-ip": "1.2.3.4", "x-forwarded-for": "5.6.7.8"})
+
+    assert await redis.exists("test:ip:127.0.0.1")
+
+
+@pytest.mark.asyncio
+async def test_middleware_takes_the_last_untrusted_forwarded_address(cache, redis):
+    app = build_app(cache, trusted_proxies=("127.0.0.1", "10.0.0.0/8"))
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="https://test") as client:
+        await client.post("/v1/auth/sign-in", headers={"x-forwarded-for": "9.9.9.9, 1.2.3.4, 10.0.0.2"})
+
+    assert await redis.exists("test:ip:1.2.3.4")
+
+
+@pytest.mark.asyncio
+async def test_middleware_keys_users_from_verified_tokens_only(cache, redis):
+    token, _ = create_access_token({"id": "user-id"}, timedelta(minutes=5))
+    # a forged token naming the user must not drain the user's bucket
+    forged = jwt.encode({"id": "user-id", "exp": int(time.time()) + 300}, "any-secret", algorithm="HS256")
+    async with AsyncClient(transport=ASGITransport(app=build_app(cache)), base_url="https://test") as client:
+        await client.post("/v1/auth/sign-in", headers={"authorization": f"Bearer {forged}"})
+        assert not await redis.exists("test:user:user-id")
+        assert await redis.exists("test:ip:127.0.0.1")
+
+        await client.post("/v1/auth/sign-in", headers={"authorization": f"Bearer {token}"})
+    assert await redis.zcard("test:user:user-id") == 1
+
+
+@pytest.mark.asyncio
+async def test_middleware_rejects_with_429_once_other_workers_used_the_quota(cache, redis, monkeypatch):
+    now_ms = 1_000_000
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(time=lambda: now_ms / 1000, monotonic=time.monotonic))
+    key = "test:route:POST /v1/auth/sign-in:127.0.0.1"
+    await redis.zadd(key, {f"other-worker-{i}": now_ms - 58500 + i for i in range(5)})
+    async with AsyncClient(transport=ASGITransport(app=build_app(cache)), base_url="https://test") as client:
+        response = await client.post("/v1/auth/sign-in")
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "2"
+    assert response.headers["RateLimit-Remaining"] == "0"
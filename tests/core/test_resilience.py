@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+from app.core.resilience import CircuitBreaker
+from app.core.resilience import CircuitBreakerOpenError
+from app.core.resilience import CircuitState
+from app.core.resilience import hedged
+from app.core.resilience import LatencyTracker
+
+
+class UpstreamError(Exception):
+    pass
+
+
+async def failing_call():
+    raise UpstreamError()
+
+
+async def successful_call():
+    return "ok"
+
+
+@pytest.fixture
+def breaker():
+    return CircuitBreaker("test", failure_threshold=2, recovery_timeout=60, failure_exceptions=(UpstreamError,))
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_opens_after_consecutive_failures(breaker):
+    for _ in range(2):
+        with pytest.raises(UpstreamError):
+            await breaker.call(failing_call)
+
+    assert breaker.state is CircuitState.OPEN
+    with pytest.raises(CircuitBreakerOpenError):
+        await breaker.call(successful_call)
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_success_resets_failure_count(breaker):
+    with pytest.raises(UpstreamError):
+        await breaker.call(failing_call)
+    assert await breaker.call(successful_call) == "ok"
+    with pytest.raises(UpstreamError):
+        await breaker.call(failing_call)
+
+    assert breaker.state is CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_ignores_unrelated_exceptions(breaker):
+    async def bad_request():
+        raise ValueError()
+
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            await breaker.call(bad_request)
+
+    assert breaker.state is CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_half_open_probe_closes_or_reopens(breaker):
+    for _ in range(2):
+        with pytest.raises(UpstreamError):
+            await breaker.call(failing_call)
+    breaker.recovery_timeout = 0
+
+    assert breaker.state is CircuitState.HALF_OPEN
+    with pytest.raises(UpstreamError):
+        await breaker.call(failing_call)
+    breaker.recovery_timeout = 60
+    assert breaker.state is CircuitState.OPEN
+
+    breaker.recovery_timeout = 0
+    assert await breaker.call(successful_call) == "ok"
+    assert breaker.state is CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_hedged_returns_fast_call_without_second_attempt():
+    calls = []
+
+    async def call():
+        calls.append(1)
+        return "fast"
+
+    assert await hedged(call, delay=1) == "fast"
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_hedged_second_attempt_wins_over_slow_first():
+    delays = [10, 0]
+    cancelled = []
+
+    async def call():
+        delay = delays.pop(0)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(delay)
+            raise
+        return delay
+
+    assert await hedged(call, delay=0.01) == 0
+    await asyncio.sleep(0)
+    assert cancelled == [10]
+
+
+def test_latency_tracker_threshold_uses_percentile_after_min_samples():
+    tracker = LatencyTracker(window=100, percentile=0.95, default=0.5, min_samples=10)
+    for sample in range(5):
+        tracker.observe(sample / 100)
+    assert tracker.threshold == 0.5
+
+    for sample in range(5, 100):
+        tracker.observe(sample / 100)
+    assert tracker.threshold == 0.95
@@ -0,0 +1,93 @@
+import json
+from datetime import datetime
+from datetime import timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import Response
+from starlette.datastructures import Headers
+
+from app.core.responses import conditional_get
+from app.core.responses import etag_matches
+from app.core.responses import FastJSONResponse
+from app.core.responses import from_trusted_attributes
+from app.core.responses import ModelResponse
+from app.core.responses import weak_etag
+from app.models.models_enums import UserRoles
+from app.schemas.user_schema import User
+
+
+def make_row():
+    now = datetime.now(timezone.utc)
+    return SimpleNamespace(
+        id=uuid4(),
+        created_at=now,
+        updated_at=now,
+        email="user@mail.com",
+        username="user",
+        is_active=True,
+        role=UserRoles.ADMIN,
+        password="hashed",
+    )
+
+
+def test_fast_json_response_renders_compact_json():
+    response = FastJSONResponse({"detail": "ok", "count": 1})
+
+    assert json.loads(response.body) == {"detail": "ok", "count": 1}
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_model_response_matches_model_dump_json():
+    user = User.model_validate(make_row(), from_attributes=True)
+
+    assert ModelResponse(user).body == user.model_dump_json().encode()
+
+
+def test_from_trusted_attributes_copies_only_schema_fields():
+    row = make_row()
+
+    user = from_trusted_attributes(User, row)
+
+    assert user == User.model_validate(row, from_attributes=True)
+    assert "password" not in json.loads(ModelResponse(user).body)
+
+
+def test_weak_etag_is_the_same_for_a_row_and_its_cached_json():
+    row = make_row()
+
+    etag = weak_etag(row.id, row.updated_at)
+
+    assert etag.startswith('W/"')
+    assert weak_etag(str(row.id), row.updated_at.isoformat()) == etag
+    assert weak_etag(row.id, datetime.now(timezone.utc)) != etag
+
+
+@pytest.mark.parametrize(
+    "if_none_match, matches",
+    [('W/"abc"', True), ('"abc"', True), ('"other", W/"abc"', True), ("*", True), ('W/"other"', False), ("", False)],
+)
+def test_etag_matches_uses_weak_comparison(if_none_match, matches):
+    assert etag_matches(if_none_match, 'W/"abc"') is matches
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cached", [False, True])
+async def test_conditional_get_answers_not_modified(cached):
+    row = make_row()
+    record = json.loads(ModelResponse(from_trusted_attributes(User, row)).body) if cached else row
+    etag = weak_etag(row.id, row.updated_at)
+
+    async def route(request, response):
+        return record
+
+    request = SimpleNamespace(headers=Headers({"if-none-match": etag}))
+    not_modified = await conditional_get(route)(request=request, response=Response())
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+
+    response = Response()
+    request = SimpleNamespace(headers=Headers({}))
+    assert await conditional_get(route)(request=request, response=response) is record
+    assert response.headers["etag"] == etag
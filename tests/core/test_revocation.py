@@ -0,0 +1,83 @@
+import asyncio
+import time
+from uuid import uuid4
+
+import pytest
+
+from app.core.revocation import BloomFilter
+from app.core.revocation import TokenRevocationList
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    added = [uuid4().hex for _ in range(1000)]
+    for item in added:
+        bloom.add(item)
+
+    assert all(item in bloom for item in added)
+    false_positives = sum(uuid4().hex in bloom for _ in range(10000))
+    assert false_positives < 300
+
+
+async def wait_for(condition):
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not met within 1s")
+
+
+@pytest.mark.asyncio
+async def test_revoke_stores_and_publishes_jti(cache, redis):
+    revocations = TokenRevocationList(cache, capacity=100, prefix="test")
+
+    await revocations.revoke("jti", int(time.time()) + 60)
+
+    assert 0 < await redis.ttl("test:jti") <= 60
+    assert "PUBLISH" in redis.commands
+    assert await revocations.is_revoked("jti")
+
+
+@pytest.mark.asyncio
+async def test_sync_loads_then_follows_the_revocations_of_other_workers(cache):
+    other_worker = TokenRevocationList(cache, capacity=100, prefix="test")
+    await other_worker.revoke("before-start", int(time.time()) + 60)
+    revocations = TokenRevocationList(cache, capacity=100, prefix="test")
+
+    await revocations.start()
+    try:
+        await wait_for(lambda: revocations._loaded)
+        assert "before-start" in revocations._bloom
+
+        await other_worker.revoke("after-start", int(time.time()) + 60)
+        await wait_for(lambda: "after-start" in revocations._bloom)
+    finally:
+        await revocations.close()
+
+
+@pytest.mark.asyncio
+async def test_synced_filter_skips_redis_for_tokens_never_revoked(cache, redis):
+    revocations = TokenRevocationList(cache, capacity=100, prefix="test")
+    revocations._loaded = True
+
+    assert not await revocations.is_revoked("jti")
+    assert redis.commands == []
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_are_answered_from_the_loaded_filter(cache, redis):
+    redis.error = ConnectionError()
+    revocations = TokenRevocationList(cache, capacity=100)
+    revocations._loaded = True
+    revocations._bloom.add("revoked")
+
+    assert await revocations.is_revoked("revoked")
+    assert not await revocations.is_revoked("never-revoked")
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fail_open_before_the_first_load(cache, redis):
+    redis.error = ConnectionError()
+    revocations = TokenRevocationList(cache, capacity=100)
+
+    assert not await revocations.is_revoked("jti")
@@ -0,0 +1,31 @@
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.models_enums import UserRoles
+from app.schemas.adapters import verified_payload_adapter
+from app.schemas.auth_schema import Payload
+from app.schemas.base_schema import FindBase
+
+
+def test_verified_payload_adapter_reads_signed_claims():
+    user_id = uuid4()
+    claims = {"id": str(user_id), "email": "user@mail.com", "username": "user", "role": "ADMIN", "jti": "jti"}
+
+    payload = verified_payload_adapter.validate_python(claims)
+
+    assert isinstance(payload, Payload)
+    assert payload.id == user_id
+    assert payload.role == UserRoles.ADMIN
+
+
+@pytest.mark.parametrize("page_size, expected", [("10", 10), (5, 5), ("all", "all"), (" 7 ", 7)])
+def test_find_base_page_size(page_size, expected):
+    assert FindBase(page_size=page_size).page_size == expected
+
+
+@pytest.mark.parametrize("page_size", ["-1", "ten", -1])
+def test_find_base_rejects_invalid_page_size(page_size):
+    with pytest.raises(HTTPException):
+        FindBase(page_size=page_size)
@@ -1,9 +1,14 @@
+import base64
+import hashlib
+import time
 from unittest.mock import AsyncMock
 
 import pytest
 from fastapi import HTTPException
 
 from app.core.security import authorize
+from app.core.security import verify_client_credentials
+from app.core.security import VerifyPasswordTiming
 from app.models.models_enums import UserRoles
 
 
@@ -55,3 +60,38 @@ async def test_authorize_without_same_id(mock_function):
     decorated_func = authorize(role=[UserRoles.MODERATOR], allow_same_id=False)(mock_function)
     with pytest.raises(HTTPException):
         await decorated_func(**kwargs)
+
+
+@pytest.mark.asyncio
+async def test_verify_password_timing_waits_like_an_observed_check():
+    timing = VerifyPasswordTiming()
+    timing.observe(0.05)
+
+    start = time.perf_counter()
+    await timing.wait()
+
+    assert time.perf_counter() - start >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_verify_password_timing_sleeps_the_default_until_calibrated(monkeypatch):
+    timing = VerifyPasswordTiming(default=0.01)
+    monkeypatch.setattr(timing, "calibrate", lambda: pytest.fail("calibrated on the event loop"))
+
+    start = time.perf_counter()
+    await timing.wait()
+
+    assert time.perf_counter() - start >= 0.01
+
+
+def test_verify_client_credentials():
+    clients = {"resource-server": hashlib.sha256(b"s3cret").hexdigest()}
+
+    def basic(value):
+        return base64.b64encode(value.encode()).decode()
+
+    assert verify_client_credentials(basic("resource-server:s3cret"), clients) == "resource-server"
+    assert verify_client_credentials(basic("resource-server:wrong"), clients) is None
+    assert verify_client_credentials(basic("other:s3cret"), clients) is None
+    assert verify_client_credentials(basic("resource-server:"), clients) is None
+    assert verify_client_credentials("not base64!", clients) is None
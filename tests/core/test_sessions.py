@@ -0,0 +1,115 @@
+import pytest
+
+from app.core.sessions import hash_token
+from app.core.sessions import InvalidRefreshTokenError
+from app.core.sessions import RefreshTokenReuseError
+from app.core.sessions import SessionStore
+
+PAYLOAD = {"id": "user-id", "email": "user@mail.com", "username": "user"}
+SESSION_ID = "0123456789abcdef0123456789abcdef"
+TOKEN = f"{SESSION_ID}.secret"
+
+
+@pytest.fixture
+def store(cache):
+    return SessionStore(cache, lifetime=3600, prefix="test", version_prefix="versions")
+
+
+@pytest.mark.asyncio
+async def test_issue_stores_only_the_token_hash(store, redis):
+    token = await store.issue(PAYLOAD, "1.2.3.4", "agent")
+
+    session_id, _, secret = token.partition(".")
+    session = await redis.hgetall(f"test:{session_id}")
+    assert session[b"token"] == hash_token(token).encode()
+    assert session[b"ip"] == b"1.2.3.4"
+    assert not any(secret.encode() in value for value in session.values())
+    assert await redis.smembers("test:user:user-id") == {session_id.encode()}
+    assert 0 < await redis.pttl(f"test:{session_id}") <= 3600 * 1000
+
+
+@pytest.mark.asyncio
+async def test_issue_without_redis_returns_none(store, cache):
+    await cache.close()
+
+    assert await store.issue(PAYLOAD) is None
+
+
+@pytest.mark.asyncio
+async def test_rotate_returns_next_token_claims_and_version(store, redis):
+    token = await store.issue(PAYLOAD)
+    await redis.incr("versions:user-id")
+
+    new_token, payload, version = await store.rotate(token)
+
+    assert new_token.partition(".")[0] == token.partition(".")[0]
+    assert payload == PAYLOAD
+    assert version == 1
+    assert (await store.rotate(new_token))[1] == PAYLOAD
+
+
+@pytest.mark.asyncio
+async def test_rotate_unknown_token_returns_none(store):
+    token = await store.issue(PAYLOAD)
+
+    assert await store.rotate(TOKEN) is None
+    assert await store.rotate(f"{token.partition('.')[0]}.forged") is None
+    assert await store.rotate(token) is not None
+
+
+@pytest.mark.asyncio
+async def test_rotate_reused_token_revokes_the_session(store):
+    token = await store.issue(PAYLOAD)
+    new_token, _, _ = await store.rotate(token)
+
+    with pytest.raises(RefreshTokenReuseError):
+        await store.rotate(token)
+    assert await store.rotate(new_token) is None
+
+
+@pytest.mark.asyncio
+async def test_update_payload_changes_the_claims_of_the_next_rotation(store):
+    token = await store.issue(PAYLOAD)
+
+    await store.update_payload(token, {**PAYLOAD, "username": "renamed"})
+
+    _, payload, _ = await store.rotate(token)
+    assert payload["username"] == "renamed"
+
+
+@pytest.mark.asyncio
+async def test_list_and_revoke_sessions(store, redis):
+    first = (await store.issue(PAYLOAD, "1.2.3.4", "agent")).partition(".")[0]
+    second = (await store.issue(PAYLOAD, "5.6.7.8", "other")).partition(".")[0]
+    expired = (await store.issue(PAYLOAD)).partition(".")[0]
+    await redis.delete(f"test:{expired}")
+
+    sessions = await store.list("user-id")
+
+    assert sorted((session["id"], session["ip"], session["user_agent"]) for session in sessions) == sorted(
+        [(first, "1.2.3.4", "agent"), (second, "5.6.7.8", "other")]
+    )
+    # sessions that expired are dropped from the user index
+    assert expired.encode() not in await redis.smembers("test:user:user-id")
+
+    assert not await store.revoke("other-user-id", first)
+    assert await store.revoke("user-id", first)
+    assert [session["id"] for session in await store.list("user-id")] == [second]
+
+    assert await store.revoke_all("user-id") == 1
+    assert await store.list("user-id") == []
+    assert await redis.keys("test:*") == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("token", ["user:user-id.x", "session.secret", f"{SESSION_ID}.", f"{SESSION_ID.upper()}.x", ""])
+async def test_rotate_rejects_malformed_tokens_without_reaching_redis(store, redis, token):
+    with pytest.raises(InvalidRefreshTokenError):
+        await store.rotate(token)
+    assert redis.commands == []
+
+
+@pytest.mark.asyncio
+async def test_revoke_ignores_malformed_session_ids(store, redis):
+    assert not await store.revoke("user-id", "user:user-id")
+    assert redis.commands == []
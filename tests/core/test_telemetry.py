@@ -0,0 +1,194 @@
+import logging
+
+import pytest
+from opentelemetry import metrics
+from opentelemetry import trace
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF
+
+from app.core.telemetry import instrument
+from app.core.telemetry import LogRateLimitFilter
+from app.core.telemetry import QueueLogManager
+from app.core.telemetry import TracingDecoratorOptions
+
+
+@pytest.fixture(scope="module")
+def metric_reader():
+    reader = InMemoryMetricReader()
+    metrics.set_meter_provider(MeterProvider(metric_readers=[reader]))
+    return reader
+
+
+@pytest.fixture
+def exporter():
+    return InMemorySpanExporter()
+
+
+@pytest.fixture
+def tracer(exporter):
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return provider.get_tracer(__name__)
+
+
+@pytest.mark.asyncio
+async def test_instrument_records_span_with_static_attributes(tracer, exporter):
+    async def target():
+        return 1
+
+    decorated = instrument(existing_tracer=tracer, attributes={"layer": "service"})(target)
+
+    assert await decorated() == 1
+    assert await decorated() == 1
+    spans = exporter.get_finished_spans()
+    assert len(spans) == 2
+    assert spans[0].name == target.__qualname__
+    assert spans[0].attributes["layer"] == "service"
+    assert spans[0].attributes["code.function"] == target.__qualname__
+
+
+@pytest.mark.asyncio
+async def test_instrument_with_zero_sample_rate_skips_span(tracer, exporter):
+    async def target():
+        return 1
+
+    decorated = instrument(existing_tracer=tracer, sample_rate=0.0)(target)
+
+    assert await decorated() == 1
+    assert exporter.get_finished_spans() == ()
+
+
+def test_instrument_skips_span_when_parent_is_not_sampled(tracer, exporter):
+    def target():
+        return 1
+
+    decorated = instrument(existing_tracer=tracer, skip_unsampled_parent=True)(target)
+    unsampled_tracer = TracerProvider(sampler=ALWAYS_OFF).get_tracer(__name__)
+
+    with unsampled_tracer.start_as_current_span("parent"):
+        assert decorated() == 1
+    assert exporter.get_finished_spans() == ()
+
+    assert decorated() == 1
+    assert len(exporter.get_finished_spans()) == 1
+
+
+def test_instrument_rejects_invalid_sample_rate():
+    with pytest.raises(ValueError):
+        instrument(sample_rate=1.5)
+
+
+@pytest.mark.asyncio
+async def test_class_decorator_names_inherited_methods_after_subclass(tracer, exporter):
+    @instrument(existing_tracer=tracer)
+    class Base:
+        async def read(self):
+            return "read"
+
+    @instrument(existing_tracer=tracer)
+    class Child(Base):
+        pass
+
+    assert await Child().read() == "read"
+    assert await Base().read() == "read"
+    child_span, base_span = exporter.get_finished_spans()
+    assert child_span.name == Child.__qualname__ + ".read"
+    assert base_span.name == Base.__qualname__ + ".read"
+
+
+@pytest.mark.asyncio
+async def test_instrument_records_metrics_for_sampled_out_calls(metric_reader):
+    @instrument(sample_rate=0.0, record_metrics=True)
+    class Repository:
+        async def read(self):
+            return "read"
+
+        async def fail(self):
+            raise ValueError("boom")
+
+    assert await Repository().read() == "read"
+    with pytest.raises(ValueError):
+        await Repository().fail()
+
+    points = {
+        metric.name: metric.data.data_points
+        for resource_metrics in metric_reader.get_metrics_data().resource_metrics
+        for scope_metrics in resource_metrics.scope_metrics
+        for metric in scope_metrics.metrics
+    }
+    read_name, fail_name = Repository.read.__qualname__, Repository.fail.__qualname__
+    durations = {point.attributes["code.function"]: point.count for point in points["app.method.duration"]}
+    assert durations[read_name] == 1
+    assert durations[fail_name] == 1
+    (error_point,) = [p for p in points["app.method.errors"] if p.attributes["code.function"] == fail_name]
+    assert error_point.value == 1
+    assert error_point.attributes["error.type"] == "ValueError"
+    assert all(point.value == 0 for point in points["app.method.active_calls"])
+
+
+@pytest.mark.asyncio
+async def test_instrument_metrics_can_be_switched_off(metric_reader, monkeypatch):
+    monkeypatch.setattr(TracingDecoratorOptions, "record_metrics", False)
+
+    @instrument(sample_rate=0.0, record_metrics=True)
+    async def switched_off():
+        return "read"
+
+    assert await switched_off() == "read"
+    names = {
+        point.attributes["code.function"]
+        for resource_metrics in metric_reader.get_metrics_data().resource_metrics
+        for scope_metrics in resource_metrics.scope_metrics
+        for metric in scope_metrics.metrics
+        if metric.name == "app.method.duration"
+        for point in metric.data.data_points
+    }
+    assert switched_off.__qualname__ not in names
+
+
+def test_log_rate_limit_filter_suppresses_per_key_and_reports_count():
+    rate_filter = LogRateLimitFilter("exception_type", rate=0.0, burst=2)
+
+    def record(exception_type=None):
+        log_record = logging.LogRecord("test", logging.WARNING, __file__, 1, "msg", None, None)
+        if exception_type:
+            log_record.exception_type = exception_type
+        return log_record
+
+    assert [rate_filter.filter(record("NotFoundError")) for _ in range(4)] == [True, True, False, False]
+    assert rate_filter.filter(record("AuthError")) is True
+    assert rate_filter.filter(record()) is True
+
+    rate_filter.rate = 1e9
+    allowed = record("NotFoundError")
+    assert rate_filter.filter(allowed) is True
+    assert allowed.suppressed == 2
+
+
+def test_queue_log_manager_keeps_span_context_for_listener_handlers():
+    class SpanCapturingHandler(logging.Handler):
+        def __init__(self):
+            super().__init__()
+            self.trace_ids = []
+
+        def emit(self, record):
+            self.trace_ids.append(trace.get_current_span().get_span_context().trace_id)
+
+    root = logging.getLogger()
+    handler = SpanCapturingHandler()
+    root.addHandler(handler)
+    manager = QueueLogManager()
+    manager.init()
+    try:
+        assert handler not in root.handlers
+        with TracerProvider().get_tracer(__name__).start_as_current_span("request") as span:
+            root.warning("inside request")
+    finally:
+        manager.close()
+        root.removeHandler(handler)
+
+    assert handler.trace_ids == [span.get_span_context().trace_id]
@@ -0,0 +1,125 @@
+import json
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+
+from app.core import dependencies
+from app.core.dependencies import get_current_claims
+from app.core.keys import key_ring
+from app.core.sessions import SessionStore
+from app.core.token_version import TokenVersions
+from app.models.models_enums import UserRoles
+from app.services.auth_service import AuthService
+
+
+def make_claims(**claims):
+    return {"id": str(uuid4()), "email": "user@mail.com", "username": "user", **claims}
+
+
+@pytest.mark.asyncio
+async def test_bump_outdates_previous_versions(cache):
+    versions = TokenVersions(cache, prefix="test")
+
+    assert await versions.is_current("user", 0)
+    await versions.bump("user")
+
+    assert await versions.current("user") == 1
+    assert not await versions.is_current("user", 0)
+    assert await versions.is_current("user", 1)
+
+
+@pytest.mark.asyncio
+async def test_current_many_reads_the_batch_in_one_round_trip(cache, redis):
+    versions = TokenVersions(cache, prefix="test")
+    await versions.bump("bumped")
+    redis.commands.clear()
+
+    assert await versions.current_many(["bumped", "never-bumped", "bumped"]) == {"bumped": 1}
+    assert redis.commands == ["MGET"]
+
+    redis.error = ConnectionError()
+    assert await versions.current_many(["bumped"]) == {}
+
+
+@pytest.mark.asyncio
+async def test_without_redis_every_token_is_current(cache):
+    await cache.close()
+    versions = TokenVersions(cache)
+
+    await versions.bump("user")
+
+    assert await versions.current("user") == 0
+
+
+@pytest.mark.asyncio
+async def test_current_claims_rejects_outdated_token(cache, monkeypatch):
+    claims = make_claims(role=UserRoles.ADMIN.value, token_version=0)
+    versions = TokenVersions(cache)
+    monkeypatch.setattr(dependencies, "token_versions", versions)
+    request = SimpleNamespace(state=SimpleNamespace(token_claims=claims))
+
+    current = await get_current_claims(request, "token")
+    assert current.role == UserRoles.ADMIN
+
+    await versions.bump(claims["id"])
+    with pytest.raises(HTTPException) as error:
+        await get_current_claims(request, "token")
+    assert error.value.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_current_claims_rejects_inactive_user(cache, monkeypatch):
+    monkeypatch.setattr(dependencies, "token_versions", TokenVersions(cache))
+    claims = make_claims(role=UserRoles.ADMIN.value, is_active=False, token_version=0)
+    request = SimpleNamespace(state=SimpleNamespace(token_claims=claims))
+
+    with pytest.raises(HTTPException) as error:
+        await get_current_claims(request, "token")
+    assert error.value.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_refresh_rebuilds_outdated_claims(cache, redis, user_repository):
+    user = SimpleNamespace(id=uuid4(), email="user@mail.com", username="user", role=UserRoles.MODERATOR, is_active=True)
+    user_repository.users.append(user)
+    service = AuthService(user_repository, cache)
+    service.sessions = SessionStore(cache, prefix="test", version_prefix="versions")
+    saved_claims = make_claims(id=str(user.id), role=UserRoles.BASE_USER.value, token_version=0)
+    refresh_token = await service.sessions.issue(saved_claims)
+    versions = TokenVersions(cache, prefix="versions")
+    for _ in range(2):
+        await versions.bump(user.id)
+
+    response = await service.refresh(refresh_token)
+
+    claims = jwt.get_unverified_claims(response.access_token)
+    assert claims["role"] == UserRoles.MODERATOR.value
+    assert claims["is_active"] is True
+    assert claims["token_version"] == 2
+    session_id = refresh_token.partition(".")[0]
+    assert json.loads(await redis.hget(f"test:{session_id}", "payload"))["token_version"] == 2
+    assert key_ring.verification_key(response.access_token) is not None
+
+    # the rebuilt claims are saved, the next refresh reads no user
+    await service.refresh(response.refresh_token)
+    assert len(user_repository.queries) == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_fails_for_disabled_user(cache, user_repository):
+    user = SimpleNamespace(
+        id=uuid4(), email="user@mail.com", username="user", role=UserRoles.BASE_USER, is_active=False
+    )
+    user_repository.users.append(user)
+    service = AuthService(user_repository, cache)
+    service.sessions = SessionStore(cache, prefix="test", version_prefix="versions")
+    refresh_token = await service.sessions.issue(make_claims(id=str(user.id), is_active=True, token_version=0))
+    # disabling the user bumps its token version
+    await TokenVersions(cache, prefix="versions").bump(user.id)
+
+    with pytest.raises(HTTPException) as error:
+        await service.refresh(refresh_token)
+    assert error.value.status_code == 403
@@ -0,0 +1,20 @@
+import pytest
+
+from app.core.keys import key_ring
+
+
+@pytest.mark.anyio
+async def test_jwks_route_should_return_200_OK_with_cache_headers_GET(client):
+    response = await client.get("/.well-known/jwks.json")
+
+    assert response.status_code == 200
+    assert response.json() == key_ring.jwks
+    assert response.headers["etag"] == key_ring.jwks_etag
+    assert "max-age" in response.headers["cache-control"]
+
+
+@pytest.mark.anyio
+async def test_jwks_route_with_matching_etag_should_return_304_NOT_MODIFIED_GET(client):
+    response = await client.get("/.well-known/jwks.json", headers={"If-None-Match": key_ring.jwks_etag})
+
+    assert response.status_code == 304
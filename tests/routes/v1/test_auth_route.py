@@ -1,3 +1,4 @@
+from urllib.parse import urlencode
 from uuid import UUID
 
 import pytest
@@ -186,6 +187,25 @@ async def test_auth_sign_up_should_return_200_OK_POST(client, session, factory_u
     assert validate_datetime(response_json["updated_at"])
 
 
+@pytest.mark.anyio
+async def test_auth_sign_up_user_is_listed_right_after_POST(
+    client, session, factory_user, moderator_user_token, default_username_search_options
+):
+    list_url = f"/v1/users?{urlencode(default_username_search_options)}"
+    before = await client.get(list_url, headers=moderator_user_token)
+    assert factory_user.email not in [user["email"] for user in before.json()["data"]]
+
+    response = await client.post(
+        f"{base_auth_route}/sign-up",
+        json={"email": factory_user.email, "password": factory_user.password, "username": factory_user.username},
+    )
+    assert response.status_code == 201
+
+    after = await client.get(list_url, headers=moderator_user_token)
+    assert after.status_code == 200
+    assert factory_user.email in [user["email"] for user in after.json()["data"]]
+
+
 @pytest.mark.anyio
 async def test_auth_sign_up_should_return_409_username_already_registered_POST(client, session, normal_user):
     response = await client.post(
@@ -216,4 +236,67 @@ async def test_auth_sign_up_should_return_409_email_already_registered_POST(clie
     assert response.json() == {"detail": "Email already registered"}
 
 
+@pytest.mark.anyio
+async def test_introspect_single_token_should_return_200_OK_POST(client, session, normal_user_token, admin_user_token):
+    token = normal_user_token["Authorization"].split(" ")[1]
+    response = await client.post(f"{base_auth_route}/introspect", json={"token": token}, headers=admin_user_token)
+    response_json = response.json()
+
+    assert response.status_code == 200
+    assert response_json["active"] is True
+    assert response_json["is_active"] is True
+    assert response_json["role"] == "BASE_USER"
+    assert UUID(response_json["claims"]["id"])
+
+
+@pytest.mark.anyio
+async def test_introspect_batch_should_return_200_OK_POST(
+    client, session, normal_user_token, disable_normal_user_token, admin_user_token
+):
+    tokens = [
+        normal_user_token["Authorization"].split(" ")[1],
+        disable_normal_user_token["Authorization"].split(" ")[1],
+        "invalid-token",
+    ]
+    response = await client.post(f"{base_auth_route}/introspect", json={"tokens": tokens}, headers=admin_user_token)
+    results = response.json()["results"]
+
+    assert response.status_code == 200
+    assert [result["active"] for result in results] == [True, False, False]
+    assert results[1]["is_active"] is False
+
+
+@pytest.mark.anyio
+async def test_introspect_without_credentials_should_return_401_UNAUTHORIZED_POST(client, session, normal_user_token):
+    token = normal_user_token["Authorization"].split(" ")[1]
+    response = await client.post(f"{base_auth_route}/introspect", json={"token": token})
+
+    assert response.status_code == 401
+
+
+@pytest.mark.anyio
+async def test_introspect_with_non_admin_token_should_return_403_FORBIDDEN_POST(client, session, normal_user_token):
+    token = normal_user_token["Authorization"].split(" ")[1]
+    response = await client.post(f"{base_auth_route}/introspect", json={"token": token}, headers=normal_user_token)
+
+    assert response.status_code == 403
+
+
+@pytest.mark.anyio
+async def test_introspect_without_tokens_should_return_422_UNPROCESSABLE_ENTITY_POST(client, session, admin_user_token):
+    response = await client.post(f"{base_auth_route}/introspect", json={}, headers=admin_user_token)
+
+    assert response.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_get_me_with_matching_etag_should_return_304_NOT_MODIFIED_GET(client, session, normal_user_token):
+    etag = (await client.get(f"{base_auth_route}/me", headers=normal_user_token)).headers["etag"]
+
+    response = await client.get(f"{base_auth_route}/me", headers=normal_user_token | {"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+
+
 ic
@@ -0,0 +1,82 @@
+import pytest
+from httpx import Response
+
+from app.core.settings import settings
+from app.services.password_service import password_api_breaker
+
+base_password_url: str = "/v1/passwords"
+
+
+@pytest.fixture(autouse=True)
+def reset_password_api_breaker():
+    password_api_breaker.reset()
+    yield
+    password_api_breaker.reset()
+
+
+@pytest.mark.anyio
+async def test_get_password_should_return_200_OK_GET(client, mock_http_client):
+    response = await client.get(base_password_url)
+    response_json = response.json()
+
+    assert response.status_code == 200
+    assert response_json["status"] == "ok"
+    assert response_json["password"] == "password-0"
+
+
+@pytest.mark.anyio
+async def test_get_protected_password_should_return_200_OK_GET(client, session, mock_http_client, normal_user_token):
+    response = await client.get(f"{base_password_url}/protected", headers=normal_user_token)
+
+    assert response.status_code == 200
+    assert response.json()["password"] == "password-0"
+
+
+@pytest.mark.anyio
+async def test_get_protected_password_without_token_should_return_403_FORBIDDEN_GET(client, mock_http_client):
+    response = await client.get(f"{base_password_url}/protected")
+
+    assert response.status_code == 403
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("upstream_handler", [lambda request: Response(503)])
+async def test_get_password_upstream_error_should_return_400_BAD_REQUEST_GET(client, mock_http_client):
+    response = await client.get(base_password_url)
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Error while fetching the API"}
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("upstream_handler", [lambda request: Response(503)])
+async def test_get_password_fallback_engine_generates_locally_GET(client, mock_http_client, monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_ENGINE", "fallback")
+
+    response = await client.get(base_password_url)
+
+    assert response.status_code == 200
+    assert len(response.json()["password"]) == settings.PASSWORD_LENGTH
+
+
+@pytest.mark.anyio
+async def test_get_password_local_engine_skips_upstream_GET(client, monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_ENGINE", "local")
+
+    response = await client.get(base_password_url)
+
+    assert response.status_code == 200
+    assert len(response.json()["password"]) == settings.PASSWORD_LENGTH
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("upstream_handler", [lambda request: Response(503)])
+async def test_get_password_open_breaker_should_return_503_SERVICE_UNAVAILABLE_GET(client, mock_http_client):
+    for _ in range(settings.PASSWORD_API_BREAKER_FAILURE_THRESHOLD):
+        response = await client.get(base_password_url)
+        assert response.status_code == 400
+
+    response = await client.get(base_password_url)
+
+    assert response.status_code == 503
+    assert response.json() == {"detail": "Password API unavailable, try again later"}
@@ -72,6 +72,22 @@ async def test_get_all_users_should_return_200_OK_GET(
     assert all([validate_datetime(user["updated_at"]) for user in users_json])
 
 
+@pytest.mark.anyio
+async def test_get_all_users_returns_only_the_schema_columns_GET(client, moderator_user_token):
+    response = await client.get(base_users_url, headers=moderator_user_token)
+
+    assert response.status_code == 200
+    assert set(response.json()["data"][0]) == {
+        "id",
+        "created_at",
+        "updated_at",
+        "email",
+        "username",
+        "is_active",
+        "role",
+    }
+
+
 # # hard test
 @pytest.mark.anyio
 async def test_get_all_users_with_page_size_should_return_200_OK_GET(
@@ -432,6 +448,37 @@ async def test_get_user_by_id_cache_headers_present(client: AsyncClient, normal_
     assert "x-api-cache" in response.headers
 
 
+@pytest.mark.anyio
+async def test_get_user_by_id_with_matching_etag_should_return_304_NOT_MODIFIED(
+    client: AsyncClient, normal_user, admin_user_token
+):
+    url = f"{base_users_url}/{normal_user.id}"
+    etag = (await client.get(url, headers=admin_user_token)).headers["etag"]
+
+    response = await client.get(url, headers=admin_user_token | {"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.headers.get("x-api-cache") == "HIT"
+    assert response.content == b""
+
+
+@pytest.mark.anyio
+async def test_get_user_by_id_with_etag_of_another_user_should_return_403_FORBIDDEN(
+    client: AsyncClient, normal_user, moderator_user, admin_user_token
+):
+    url = f"{base_users_url}/{moderator_user.id}"
+    # cached and tagged by a caller allowed to read the user
+    etag = (await client.get(url, headers=admin_user_token)).headers["etag"]
+    unauthorized_token = await get_user_token(client, normal_user)
+
+    response = await client.get(url, headers=unauthorized_token | {"If-None-Match": etag})
+
+    assert response.status_code == 403
+    assert "etag" not in response.headers
+    assert (await client.get(url, headers=unauthorized_token)).status_code == 403
+
+
 @pytest.mark.anyio
 async def test_get_user_by_id_cache_different_users_different_cache(
     client: AsyncClient, normal_user, moderator_user, admin_user_token